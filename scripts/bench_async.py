@@ -0,0 +1,92 @@
+# scripts/bench_async.py
+# SPDX-License-Identifier: Apache-2.0
+"""
+Throughput of AsyncAiviaEngine vs the sync AiviaEngine against a local stand-in
+for Neo4j that only simulates Bolt round-trip latency.
+
+Every question gets a distinct amount threshold, so dedupe does not help either side.
+
+    python scripts/bench_async.py [n_questions] [concurrency] [latency_ms]
+"""
+import asyncio
+import contextlib
+import sys
+import time
+
+from aivia import AiviaEngine, AsyncAiviaEngine
+from bench_run_many import FakeDriver, FakeResult
+
+
+class FakeAsyncResult(FakeResult):
+    async def values(self):
+        return list(self)
+
+    async def consume(self):
+        return FakeResult.consume(self)
+
+
+class FakeAsyncSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def run(self, cypher, parameters=None, **kwargs):
+        await asyncio.sleep(self.driver.query_s)
+        self.driver.queries += 1
+        return FakeAsyncResult(self.driver.rows)
+
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class FakeAsyncDriver(FakeDriver):
+    """Async stand-in for neo4j.AsyncDriver with the same latency model as FakeDriver."""
+
+    def session(self, **kwargs):
+        self.sessions += 1
+        return FakeAsyncSession(self)
+
+    async def close(self):
+        pass
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    latency_s = (float(sys.argv[3]) if len(sys.argv) > 3 else 20.0) / 1000
+    questions = [f"open deals > {i + 1}k last 60 days no next meeting 14 days" for i in range(n)]
+
+    with contextlib.redirect_stdout(None):  # silence matcher tracing
+        engine = AiviaEngine(FakeDriver(query_s=latency_s, handshake_s=0))
+        t0 = time.perf_counter()
+        for q in questions:
+            engine.run(q)
+        loop_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        engine.run_many(questions, concurrency=concurrency)
+        threads_s = time.perf_counter() - t0
+
+        async_engine = AsyncAiviaEngine(FakeAsyncDriver(query_s=latency_s, handshake_s=0),
+                                        max_concurrency=concurrency)
+
+        async def timed_run_many():  # time inside the loop: asyncio.run startup is not throughput
+            t0 = time.perf_counter()
+            await async_engine.run_many(questions)
+            return time.perf_counter() - t0
+
+        async_s = asyncio.run(timed_run_many())
+
+    print(f"[BENCH] questions={n} concurrency={concurrency} latency={latency_s * 1000:.0f}ms")
+    print(f"[BENCH] sync run loop     : {n / loop_s:8.1f} q/s")
+    print(f"[BENCH] sync run_many     : {n / threads_s:8.1f} q/s  ({concurrency} threads)")
+    print(f"[BENCH] async run_many    : {n / async_s:8.1f} q/s  (1 thread)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# scripts/bench_frames.py
+# SPDX-License-Identifier: Apache-2.0
+"""
+Compare DataFrame construction for query results: the old list-of-dicts path
+(`pd.DataFrame(result.data())`) vs the columnar builder used by AiviaEngine.
+
+    python scripts/bench_frames.py [n_rows]
+"""
+import random
+import sys
+import time
+
+import pandas as pd
+
+from aivia.run_query import _columnar_frame
+
+COLUMNS = ["account", "deal_id", "deal", "amount", "stage", "created", "owner"]
+STAGES = ["Prospecting", "Evaluate", "Proposal", "Legal", "Negotiate"]
+
+
+def synthetic_records(n: int, seed: int = 11):
+    rng = random.Random(seed)
+    return [
+        (f"Account {rng.randint(1, 5000)}", f"DL-{i}", "Platform Subscription",
+         float(rng.randint(1, 200) * 500), rng.choice(STAGES),
+         f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", f"Owner {rng.randint(1, 40)}")
+        for i in range(n)
+    ]
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    records = synthetic_records(n)
+
+    # The dict path pays for one dict per row (what .data() returns) before pandas sees it
+    dict_df, dict_s = _timed(lambda: pd.DataFrame([dict(zip(COLUMNS, r)) for r in records]))
+    col_df, col_s = _timed(lambda: _columnar_frame(COLUMNS, records))
+
+    mb = lambda df: df.memory_usage(index=True, deep=True).sum() / 1e6
+    print(f"[BENCH] rows={n}")
+    print(f"[BENCH] dict rows : {dict_s:6.3f}s  {mb(dict_df):8.1f} MB")
+    print(f"[BENCH] columnar  : {col_s:6.3f}s  {mb(col_df):8.1f} MB  ({dict_s / col_s:.1f}x)")
+    print(f"[BENCH] dtypes    : {dict(col_df.dtypes.astype(str))}")
+
+
+if __name__ == "__main__":
+    main()
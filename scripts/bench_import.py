@@ -0,0 +1,85 @@
+# scripts/bench_import.py
+# SPDX-License-Identifier: Apache-2.0
+"""
+Import-time benchmark for the CLI entry point and friends, via `python -X importtime`.
+
+Each scenario runs in a fresh interpreter (src/ on PYTHONPATH). It reports:
+- the import time attributable to the scenario: top-level imports that a bare
+  `python -c pass` doesn't do
+- best-of-N wall time
+- which heavy dependencies ended up loaded
+- the slowest modules by cumulative import time
+
+    python scripts/bench_import.py [repeats] [--top N]
+"""
+from pathlib import Path
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+HEAVY = ("neo4j", "pandas", "numpy", "faiss", "sentence_transformers", "torch", "yaml")
+QUESTION = "open deals >10k last 60 days no next meeting 14 days"
+
+SCENARIOS = {
+    "import aivia": "import aivia",
+    "CLI entry (aivia.__main__)": "import aivia.__main__",
+    # what the CLI does before it needs the driver: match, resolve path, build Cypher
+    "CLI planning": f"import aivia.__main__\nfrom aivia.run_query import AiviaEngine\n"
+                    f"AiviaEngine(None)._plan({QUESTION!r}, 8)",
+    "import label/filter matcher": "import aivia.matching._real_label_and_filter_matcher",
+    "first DataFrame": "from aivia.run_query import _columnar_frame\n_columnar_frame(['amount'], [(1.0,)])",
+}
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def importtime(code: str):
+    """(µs imported by `code`, {module: cumulative µs}, heavy modules loaded, wall seconds)."""
+    probe = f"{code}\nimport sys, json\nprint(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+    env = {**os.environ, "PYTHONPATH": str(SRC), "PYTHONDONTWRITEBYTECODE": "1"}
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", probe], env=env,
+                          capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - t0
+    cumulative, top_level = {}, {}
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            cumulative[m.group(4)] = int(m.group(2))
+            if not m.group(3):
+                top_level[m.group(4)] = int(m.group(2))
+    return top_level, cumulative, json.loads(proc.stdout.strip().splitlines()[-1]), wall
+
+
+def main():
+    args = sys.argv[1:]
+    top = int(args[args.index("--top") + 1]) if "--top" in args else 5
+    if "--top" in args:
+        del args[args.index("--top"):args.index("--top") + 2]
+    repeats = int(args[0]) if args else 5
+
+    baseline, _, _, _ = importtime("pass")
+    startup = min(importtime("pass")[3] for _ in range(repeats))
+    print(f"[BENCH] python {sys.version.split()[0]}  interpreter startup {startup * 1e3:.0f} ms  (best of {repeats})")
+    for name, code in SCENARIOS.items():
+        try:
+            runs = [importtime(code) for _ in range(repeats)]
+        except subprocess.CalledProcessError as e:
+            print(f"[BENCH] {name:<28} failed: {e.stderr.strip().splitlines()[-1]}")
+            continue
+        top_level, cumulative, heavy, _ = min(runs, key=lambda r: r[3])
+        own = sum(us for module, us in top_level.items() if module not in baseline)
+        wall = min(r[3] for r in runs)
+        print(f"[BENCH] {name:<28} imports {own / 1e3:7.1f} ms  wall {wall * 1e3:6.0f} ms  "
+              f"heavy: {', '.join(heavy) or '-'}")
+        shown = {m for m in top_level if m not in baseline} | {m for m in cumulative if m.startswith("aivia")}
+        slowest = sorted(((us, m) for m, us in cumulative.items() if m in shown or m in HEAVY), reverse=True)[:top]
+        for us, module in slowest:
+            print(f"[BENCH]     {us / 1e3:7.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
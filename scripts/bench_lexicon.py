@@ -0,0 +1,157 @@
+# scripts/bench_lexicon.py
+# SPDX-License-Identifier: Apache-2.0
+"""
+Micro-benchmark for aivia.matching.lexicon.ConceptLexicon.
+
+Generates a synthetic terminology (200k synonyms by default), checks that the lexicon
+returns the same concept as the original linear-scan `_find_medical_concept_with_variations`
+(kept below as the reference) for tokens hitting each strategy and for misses, and reports
+per-token timings. The reference is slow at this size, so it runs on a sample.
+
+    python scripts/bench_lexicon.py [n_synonyms] [n_sample]
+"""
+import random
+import sys
+import time
+
+from aivia.matching.lexicon import ConceptLexicon
+
+SYLLABLES = ["car", "di", "o", "my", "pa", "thy", "neu", "ro", "gas", "tri", "hep", "at", "io",
+             "pul", "mon", "ar", "re", "nal", "derm", "col", "lip", "id", "ost", "eo", "sten", "ure",
+             "ven", "bron", "chi", "leuk", "an", "gi", "cyst", "ne", "phr", "mel", "ton", "ky", "ph"]
+ENDINGS = ["itis", "osis", "emia", "uria", "ism", "al", "ic", "", "", ""]
+
+
+class Concept:
+    def __init__(self, preferred_term, synonyms):
+        self.preferred_term = preferred_term
+        self.synonyms = synonyms
+
+
+def _word(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(3, 5))) + rng.choice(ENDINGS)
+
+
+def generate_concepts(n_synonyms: int, per_concept: int = 10, seed: int = 3):
+    rng = random.Random(seed)
+    concepts = {}
+    for i in range(n_synonyms // per_concept):
+        words = [_word(rng) for _ in range(per_concept + 1)]
+        synonyms = [w.title() if rng.random() < 0.5 else w + " " + _word(rng) for w in words[1:]]
+        concepts[f"C{i:06d}"] = Concept(words[0].title(), synonyms)
+    return concepts
+
+
+def generate_tokens(concepts, n: int, seed: int = 9):
+    """Tokens hitting strategy 1 (substring), 2 (stem), 3 (suffix added) and misses."""
+    rng = random.Random(seed)
+    terms = [t for c in concepts.values() for t in [c.preferred_term] + c.synonyms]
+    tokens = []
+    for _ in range(n):
+        term = rng.choice(terms).lower().split()[0]
+        kind = rng.randrange(4)
+        if kind == 0:
+            tokens.append(term[:max(4, len(term) - 2)].upper())
+        elif kind == 1:
+            tokens.append(term + "qz" + rng.choice(["osis", "itis", "emia"]))
+        elif kind == 2:
+            tokens.append("zq" + term[-6:])
+        else:
+            tokens.append("qx" + "".join(rng.choice("wvxz") for _ in range(6)))
+    return tokens
+
+
+class Registry:
+    def __init__(self, concepts):
+        self._medical_concepts = concepts
+
+
+def reference_find(registry, token):
+    """The original `_find_medical_concept_with_variations`, kept verbatim as the baseline."""
+    token_lower = token.lower()
+
+    # Get all available medical concepts to search through
+    all_concepts = getattr(registry, '_medical_concepts', {})
+
+    # Strategy 1: Fuzzy matching - check if token is contained in any concept terms
+    for concept in all_concepts.values():
+        # Check if token is a substring of preferred term or synonyms
+        preferred_lower = concept.preferred_term.lower()
+        if token_lower in preferred_lower or preferred_lower in token_lower:
+            return concept
+
+        for synonym in concept.synonyms:
+            synonym_lower = synonym.lower()
+            if token_lower in synonym_lower or synonym_lower in token_lower:
+                return concept
+
+    # Strategy 2: Morphological variations - try removing/adding common medical suffixes
+    medical_suffixes = ['ic', 'tic', 'al', 'ous', 'ive', 'ism', 'osis', 'itis', 'emia', 'uria']
+
+    # Try removing suffixes from token
+    for suffix in medical_suffixes:
+        if token_lower.endswith(suffix) and len(token_lower) > len(suffix) + 2:
+            stem = token_lower[:-len(suffix)]
+            # Search for concepts containing this stem
+            for concept in all_concepts.values():
+                preferred_lower = concept.preferred_term.lower()
+                if stem in preferred_lower:
+                    return concept
+                for synonym in concept.synonyms:
+                    if stem in synonym.lower():
+                        return concept
+
+    # Try adding suffixes to token
+    for suffix in medical_suffixes:
+        variant = token_lower + suffix
+        for concept in all_concepts.values():
+            preferred_lower = concept.preferred_term.lower()
+            if variant in preferred_lower or preferred_lower in variant:
+                return concept
+            for synonym in concept.synonyms:
+                synonym_lower = synonym.lower()
+                if variant in synonym_lower or synonym_lower in variant:
+                    return concept
+
+    return None
+
+
+def main():
+    n_synonyms = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    n_sample = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    concepts = generate_concepts(n_synonyms)
+    registry = Registry(concepts)
+    tokens = generate_tokens(concepts, 2000)
+
+    t0 = time.perf_counter()
+    lexicon = ConceptLexicon(concepts.values())
+    build = time.perf_counter() - t0
+
+    sample = tokens[:n_sample]
+    t0 = time.perf_counter()
+    expected = [reference_find(registry, t) for t in sample]
+    ref = (time.perf_counter() - t0) / len(sample)
+
+    mismatches = [t for t, e in zip(sample, expected) if lexicon.find(t) is not e]
+    if mismatches:
+        print(f"[BENCH] {len(mismatches)} mismatches, e.g. {mismatches[0]!r}")
+        sys.exit(1)
+
+    best = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter()
+        for t in tokens:
+            lexicon.find(t)
+        best = min(best, time.perf_counter() - t0)
+    new = best / len(tokens)
+
+    misses = sum(e is None for e in expected)
+    print(f"[BENCH] synonyms={n_synonyms} terms={len(lexicon)} concepts={len(concepts)} "
+          f"lexicon build={build:.2f} s")
+    print(f"[BENCH] sample={len(sample)} (misses={misses}) identical=yes")
+    print(f"[BENCH] linear scan : {ref * 1e3:9.2f} ms/token")
+    print(f"[BENCH] lexicon     : {new * 1e3:9.3f} ms/token  ({ref / new:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# scripts/bench_matcher.py
+# SPDX-License-Identifier: Apache-2.0
+"""
+Micro-benchmark for match_concepts_adapter.
+
+Generates a synthetic corpus of pipeline-health questions, checks that the
+precompiled extractor returns exactly the same dict as the original per-pattern
+implementation (kept below as the reference), and reports per-question timings.
+
+    python scripts/bench_matcher.py [n_questions]
+"""
+import contextlib
+import io
+import random
+import re
+import sys
+import time
+
+from aivia.adapters.matcher_adapter import match_concepts_adapter
+
+FRAGMENTS = [
+    "open deals", "> 10k", "over $25000", "more than 5000", "greater than 75000", "10,000",
+    "12 thousand", "last 60 days", "past 30 days", "2 weeks", "3 months", "90 day window",
+    "no next meeting 14 days", "no next step in 7 days", "no meeting for 10 days",
+    "21 days stale", "stale for 45 days", "no activity in 14 days", "commit deals",
+    "committed deal", "this quarter", "missing finance or security", "cfo", "ciso",
+    "infosec", "economic buyer", "decision maker", "budget holder", "treasurer",
+    "evaluate stage", "in evaluation", "prospecting", "leads", "legal review", "contract",
+    "closed won", "signed", "closed lost", "declined", "owned by enterprise team", "emea",
+    "which", "show me", "list", "with", "and", "for", "accounts", "reps",
+]
+
+
+def generate_corpus(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n):
+        words = rng.sample(FRAGMENTS, rng.randint(2, 7))
+        q = " ".join(words)
+        corpus.append(q.upper() if rng.random() < 0.1 else q)
+    return corpus
+
+
+def reference_match(question: str, top_k: int = 8):
+    """The original loop-per-pattern extractor, kept verbatim as the baseline."""
+    print(f"🔍 REAL MATCHER - Processing: '{question}'")
+    
+    q = question.lower()
+    result = {}
+    
+    # Enhanced amount extraction with multiple patterns
+    amount_patterns = [
+        r'(\d+)k',  # "10k", "25k"
+        r'(\d+),?000',  # "10,000", "10000"
+        r'(\d+)\s*thousand',  # "10 thousand"
+        r'greater than\s*\$?(\d+)',  # "greater than 10000"
+        r'more than\s*\$?(\d+)',  # "more than 10000"
+        r'over\s*\$?(\d+)',  # "over 10000"
+    ]
+    
+    for pattern in amount_patterns:
+        match = re.search(pattern, q)
+        if match:
+            amount = int(match.group(1))
+            if 'k' in pattern or 'thousand' in pattern:
+                amount *= 1000
+            result["needs_amount_gt"] = amount
+            print(f"💰 Amount extracted: ${amount:,}")
+            break
+    
+    # Enhanced time window extraction
+    time_patterns = [
+        (r'(\d+)\s*days?', lambda x: int(x)),  # "60 days", "30 day"
+        (r'(\d+)\s*weeks?', lambda x: int(x) * 7),  # "2 weeks"
+        (r'(\d+)\s*months?', lambda x: int(x) * 30),  # "1 month"
+        (r'last\s*(\d+)\s*days?', lambda x: int(x)),  # "last 60 days"
+        (r'past\s*(\d+)\s*days?', lambda x: int(x)),  # "past 30 days"
+        (r'(\d+)\s*day\s*window', lambda x: int(x)),  # "60 day window"
+    ]
+    
+    for pattern, converter in time_patterns:
+        match = re.search(pattern, q)
+        if match:
+            days = converter(match.group(1))
+            result["window_days"] = days
+            print(f"📅 Time window extracted: {days} days")
+            break
+    
+    # Enhanced next meeting/step extraction
+    next_step_patterns = [
+        (r'no next meeting.*?(\d+)\s*days?', lambda x: int(x)),
+        (r'no next step.*?(\d+)\s*days?', lambda x: int(x)),
+        (r'no meeting.*?(\d+)\s*days?', lambda x: int(x)),
+        (r'(\d+)\s*days?.*?no.*?meeting', lambda x: int(x)),
+        (r'(\d+)\s*days?.*?no.*?step', lambda x: int(x)),
+    ]
+    
+    for pattern, converter in next_step_patterns:
+        match = re.search(pattern, q)
+        if match:
+            days = converter(match.group(1))
+            result["next_meeting_days"] = days
+            print(f"📋 Next meeting window: {days} days")
+            break
+    
+    # Enhanced role extraction
+    role_keywords = {
+        "finance": ["finance", "financial", "cfo", "treasurer"],
+        "security": ["security", "ciso", "security officer", "infosec"],
+        "economic buyer": ["economic buyer", "decision maker", "budget holder", "purchasing"]
+    }
+    
+    found_roles = []
+    for role, keywords in role_keywords.items():
+        if any(keyword in q for keyword in keywords):
+            found_roles.append(role)
+    
+    if found_roles:
+        result["wants_roles"] = found_roles
+        print(f"👥 Roles extracted: {found_roles}")
+    
+    # Enhanced stage extraction
+    stage_keywords = {
+        "evaluate": ["evaluate", "evaluation", "assessing", "reviewing"],
+        "prospecting": ["prospect", "prospecting", "lead", "leads"],
+        "legal": ["legal", "contract", "agreement", "terms"],
+        "closed won": ["closed won", "won", "signed", "completed"],
+        "closed lost": ["closed lost", "lost", "declined", "rejected"]
+    }
+    
+    for stage, keywords in stage_keywords.items():
+        if any(keyword in q for keyword in keywords):
+            result["stage_eq"] = stage
+            print(f"🎯 Stage extracted: {stage}")
+            break
+    
+    # Enhanced commit detection
+    commit_keywords = ["commit", "committed", "commitment", "committed deal", "commit deal"]
+    if any(keyword in q for keyword in commit_keywords):
+        result["wants_commit"] = True
+        print("✅ Commit flag detected")
+    
+    # Enhanced stale detection
+    stale_patterns = [
+        (r'(\d+)\s*days?.*?stale', lambda x: int(x)),
+        (r'stale.*?(\d+)\s*days?', lambda x: int(x)),
+        (r'(\d+)\s*days?.*?no activity', lambda x: int(x)),
+        (r'no activity.*?(\d+)\s*days?', lambda x: int(x)),
+    ]
+    
+    for pattern, converter in stale_patterns:
+        match = re.search(pattern, q)
+        if match:
+            days = converter(match.group(1))
+            result["stale_days"] = days
+            print(f"⏰ Stale period: {days} days")
+            break
+    
+    # Default fallbacks for common patterns
+    if "10k" in q or "10000" in q:
+        result["needs_amount_gt"] = result.get("needs_amount_gt", 10000)
+    if "60" in q and "window_days" not in result:
+        result["window_days"] = 60
+    if "30" in q and "window_days" not in result:
+        result["window_days"] = 30
+    if "14" in q and "next_meeting_days" not in result:
+        result["next_meeting_days"] = 14
+    if "21" in q and "stale_days" not in result:
+        result["stale_days"] = 21
+    
+    print(f"🎯 REAL MATCHER RESULT: {result}")
+    return result
+
+
+def _time_per_question(fn, corpus, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for q in corpus:
+            fn(q)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(corpus)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    corpus = generate_corpus(n)
+
+    # The reference traces to stdout; keep that out of both the check and the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        mismatches = [q for q in corpus
+                      if list(match_concepts_adapter(q).items()) != list(reference_match(q).items())]
+    if mismatches:
+        print(f"[BENCH] {len(mismatches)} mismatches, e.g. {mismatches[0]!r}")
+        sys.exit(1)
+
+    with contextlib.redirect_stdout(None):  # reference prints; print() to None is a no-op
+        ref = _time_per_question(reference_match, corpus)
+        new = _time_per_question(match_concepts_adapter, corpus)
+
+    print(f"[BENCH] questions={n} identical=yes")
+    print(f"[BENCH] reference : {ref * 1e6:8.2f} us/question")
+    print(f"[BENCH] compiled  : {new * 1e6:8.2f} us/question  ({ref / new:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
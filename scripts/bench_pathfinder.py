@@ -0,0 +1,143 @@
+# scripts/bench_pathfinder.py
+# SPDX-License-Identifier: Apache-2.0
+"""
+Micro-benchmark for aivia.pathfinder.PathfinderEngine on a synthetic schema graph.
+
+Generates a 2,000-label schema by default (a random FK tree plus extra cross edges),
+times the all-pairs precompute, then `complete_path` cold (first sight of a target set)
+and memoized, against a per-call baseline that runs one BFS per target and unions the
+paths. The Steiner tree must reach every target with no more edges than the baseline.
+
+Then, as the matcher plans negations: one call for the positive targets plus one per
+negated table (joins concatenated) vs one batched `complete_path(..., optional=...)`,
+for 0-8 negations, without memoization (memo_size=0) and memoized.
+
+    python scripts/bench_pathfinder.py [n_labels] [extra_edges] [n_queries]
+"""
+from collections import deque
+import random
+import sys
+import time
+
+from aivia.pathfinder import PathfinderEngine
+
+
+def generate_edges(n_labels: int, extra: int, seed: int = 5):
+    rng = random.Random(seed)
+    labels = [f"L{i:05d}" for i in range(n_labels)]
+    edges = []
+    for i in range(1, n_labels):
+        parent = labels[rng.randrange(max(0, i - 50), i)]  # local-ish FKs, like real schemas
+        edges.append({"from": parent, "rel": f"HAS_{i}", "to": labels[i], "via_fk": f"{labels[i]}.parent_id"})
+    for j in range(extra):
+        a, b = rng.sample(labels, 2)
+        edges.append({"from": a, "rel": f"REF_{j}", "to": b, "via_fk": f"{a}.ref_{j}_id"})
+    return labels, edges
+
+
+def baseline_path(adjacency, root, targets):
+    """One BFS from the root per target (what a per-call resolver does); union of the paths."""
+    edges = set()
+    for target in targets:
+        parent = {root: None}
+        queue = deque([root])
+        while queue and target not in parent:
+            u = queue.popleft()
+            for v in adjacency[u]:
+                if v not in parent:
+                    parent[v] = u
+                    queue.append(v)
+        node = target
+        while parent.get(node) is not None:
+            edges.add(frozenset((parent[node], node)))
+            node = parent[node]
+    return edges
+
+
+def per_negation_joins(engine, root, targets, negated):
+    joins = engine.complete_path(root, targets).joins()
+    for table in negated:
+        joins += [dict(j, join_type="LEFT") for j in engine.complete_path(root, [table]).joins()]
+    return joins
+
+
+def timed(fn, queries, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for query in queries:
+            fn(*query)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(queries)
+
+
+def bench_negations(edges, labels, n_queries):
+    # memo_size=0 plans every call from scratch; the warm engine holds every target set seen here
+    cold, warm = PathfinderEngine(edges, memo_size=0), PathfinderEngine(edges, memo_size=100_000)
+    rng = random.Random(13)
+    print("[BENCH] negations  per-negation cold   batched cold   per-negation memo   batched memo   joins (dup)")
+    for k in (0, 1, 2, 4, 8):
+        queries = []
+        for _ in range(n_queries):
+            root, *tables = rng.sample(labels, 3 + k)
+            queries.append((root, tables[:2], tables[2:]))
+        row = []
+        for engine in (cold, warm):
+            row.append(timed(lambda r, t, n: per_negation_joins(engine, r, t, n), queries))
+            row.append(timed(lambda r, t, n: engine.complete_path(r, t, optional=n).joins(), queries))
+        old = sum(len(per_negation_joins(warm, *q)) for q in queries) / n_queries
+        new = sum(len(warm.complete_path(q[0], q[1], optional=q[2]).edges) for q in queries) / n_queries
+        print(f"[BENCH] {k:>9}  {row[0] * 1e3:14.3f} ms  {row[1] * 1e3:10.3f} ms  {row[2] * 1e3:14.3f} ms  "
+              f"{row[3] * 1e3:10.3f} ms   {new:5.1f} ({old:.1f})")
+
+
+def main():
+    n_labels = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    extra = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    n_queries = int(sys.argv[3]) if len(sys.argv) > 3 else 2_000
+    labels, edges = generate_edges(n_labels, extra)
+
+    t0 = time.perf_counter()
+    engine = PathfinderEngine(edges)
+    build = time.perf_counter() - t0
+
+    rng = random.Random(11)
+    queries = [(rng.choice(labels), rng.sample(labels, rng.randint(1, 6))) for _ in range(n_queries)]
+    adjacency = {label: [engine.labels[v] for v in engine.adjacency[engine.ids[label]]] for label in labels}
+
+    t0 = time.perf_counter()
+    base = [baseline_path(adjacency, root, targets) for root, targets in queries]
+    base_s = (time.perf_counter() - t0) / n_queries
+
+    t0 = time.perf_counter()
+    plans = [engine.complete_path(root, targets) for root, targets in queries]
+    cold = (time.perf_counter() - t0) / n_queries
+
+    best = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter()
+        for root, targets in queries:
+            engine.complete_path(root, targets)
+        best = min(best, time.perf_counter() - t0)
+    warm = best / n_queries
+
+    for (root, targets), plan, union in zip(queries, plans, base):
+        missing = set(targets) - set(plan.nodes)
+        if missing or len(plan.edges) > len(union):
+            print(f"[BENCH] bad plan from {root} to {targets}: missing={missing} "
+                  f"edges={len(plan.edges)} baseline={len(union)}")
+            sys.exit(1)
+    saved = sum(len(u) for u in base) - sum(len(p.edges) for p in plans)
+
+    matrices = sum(row.itemsize * len(row) for row in engine.dist + engine.pred) / 2 ** 20
+    print(f"[BENCH] labels={n_labels} edges={len(edges)} queries={n_queries} "
+          f"all-pairs build={build:.2f} s ({matrices:.0f} MiB)")
+    print(f"[BENCH] plans valid=yes, {saved} fewer join edges than the per-target union")
+    print(f"[BENCH] per-target BFS     : {base_s * 1e3:8.3f} ms/call")
+    print(f"[BENCH] complete_path cold : {cold * 1e3:8.3f} ms/call  ({base_s / cold:.0f}x)")
+    print(f"[BENCH] complete_path memo : {warm * 1e3:8.3f} ms/call  ({base_s / warm:.0f}x)  {engine.cache_info()}")
+    bench_negations(edges, labels, max(1, n_queries // 4))
+
+
+if __name__ == "__main__":
+    main()
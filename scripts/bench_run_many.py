@@ -0,0 +1,125 @@
+# scripts/bench_run_many.py
+# SPDX-License-Identifier: Apache-2.0
+"""
+Benchmark AiviaEngine.run_many against a plain loop over AiviaEngine.run.
+
+Uses an in-process fake driver that sleeps for a fixed per-query latency and
+per-session handshake cost, so no Neo4j server is needed.
+
+    python scripts/bench_run_many.py [n_questions] [concurrency]
+"""
+import contextlib
+import random
+import sys
+import threading
+import time
+
+from aivia.run_query import AiviaEngine
+
+PROMPTS = [
+    "open deals > 10k last 60 days no next meeting 14 days",
+    "open deals > 25k last 30 days no next meeting 7 days",
+    "commit deals this quarter missing finance or security",
+    "evaluate stage > 21 days with no activity in 14 days",
+    "evaluate stage > 45 days stale",
+    "open deals",
+]
+
+
+class FakeResult:
+    """Mimics neo4j.Result: keys(), iteration over record tuples, fetch(n), data() and consume()."""
+
+    def __init__(self, rows):
+        self._rows = rows
+        self._keys = list(rows[0]) if rows else []
+        self._pos = 0
+
+    def keys(self):
+        return self._keys
+
+    def __iter__(self):
+        while self._pos < len(self._rows):
+            yield self.fetch(1)[0]
+
+    def fetch(self, n):
+        batch = self._rows[self._pos:self._pos + n]
+        self._pos += len(batch)
+        return [tuple(row.values()) for row in batch]
+
+    def data(self):
+        return list(self._rows)
+
+    def consume(self):
+        self._pos = len(self._rows)
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+        time.sleep(driver.handshake_s)
+
+    def run(self, cypher, parameters=None, **kwargs):
+        time.sleep(self.driver.query_s)
+        with self.driver.lock:
+            self.driver.queries += 1
+        return FakeResult(self.driver.rows)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeDriver:
+    """Stand-in for neo4j.Driver: fixed latency, canned rows, counts sessions and queries."""
+
+    def __init__(self, query_s: float = 0.005, handshake_s: float = 0.001, n_rows: int = 50):
+        self.query_s = query_s
+        self.handshake_s = handshake_s
+        self.rows = [{"account": f"Acct {i}", "deal_id": f"DL-{i}", "amount": 1000.0 * i}
+                     for i in range(n_rows)]
+        self.lock = threading.Lock()
+        self.sessions = 0
+        self.queries = 0
+
+    def session(self, **kwargs):
+        with self.lock:
+            self.sessions += 1
+        return FakeSession(self)
+
+    def close(self):
+        pass
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    rng = random.Random(3)
+    questions = [rng.choice(PROMPTS) for _ in range(n)]
+
+    with contextlib.redirect_stdout(None):  # silence matcher tracing
+        loop_driver = FakeDriver()
+        engine = AiviaEngine(loop_driver)
+        t0 = time.perf_counter()
+        loop_results = [engine.run(q) for q in questions]
+        loop_s = time.perf_counter() - t0
+
+        batch_driver = FakeDriver()
+        engine = AiviaEngine(batch_driver)
+        t0 = time.perf_counter()
+        batch_results = engine.run_many(questions, concurrency=concurrency)
+        batch_s = time.perf_counter() - t0
+
+    assert [r[0] for r in loop_results] == [r[0] for r in batch_results], "Cypher differs"
+    print(f"[BENCH] questions={n} concurrency={concurrency}")
+    print(f"[BENCH] loop     : {loop_s:7.3f}s  sessions={loop_driver.sessions} queries={loop_driver.queries}")
+    print(f"[BENCH] run_many : {batch_s:7.3f}s  sessions={batch_driver.sessions} queries={batch_driver.queries}"
+          f"  ({loop_s / batch_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
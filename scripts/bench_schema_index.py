@@ -0,0 +1,194 @@
+# scripts/bench_schema_index.py
+# SPDX-License-Identifier: Apache-2.0
+"""
+Micro-benchmark for aivia.matching.schema_index.SchemaIndex.
+
+Builds a synthetic Clarity-style schema (thousands of tables with aliases, columns and
+descriptions), checks that the index gives exactly the answers of the original per-token
+scans (kept below as the reference) and reports per-lookup timings.
+
+    python scripts/bench_schema_index.py [n_tables] [n_tokens]
+"""
+import random
+import sys
+import time
+
+from aivia.matching.schema_index import SchemaIndex
+
+WORDS = ["patient", "referral", "encounter", "appointment", "provider", "department", "order",
+         "result", "medication", "diagnosis", "procedure", "claim", "coverage", "account",
+         "visit", "note", "lab", "imaging", "allergy", "problem", "immunization", "vital",
+         "schedule", "status", "charge", "payment", "location", "service", "specialty", "plan"]
+SUFFIXES = ["", "s", "_hx", "_info", "_detail", "_line", "_map", "_audit"]
+
+
+class FakeRegistry:
+    """Pattern-registry stand-in: entity type per table prefix, a few indicators each."""
+
+    def __init__(self):
+        self.indicators = {w.upper(): [w, w[:4]] for w in WORDS[:12]}
+
+    def discover_entities_from_schema(self, schema):
+        return list(self.indicators)
+
+    def find_entity_type_from_schema(self, table_name, column_names):
+        head = table_name.split("_")[0]
+        return head if head in self.indicators else None
+
+    def get_semantic_indicators(self, entity_type):
+        return self.indicators[entity_type]
+
+
+def generate_schema(n_tables: int, seed: int = 11):
+    rng = random.Random(seed)
+    tables = {}
+    while len(tables) < n_tables:
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        name = "_".join(w.upper() for w in words) + rng.choice(SUFFIXES).upper() + str(rng.randint(0, 99))
+        aliases = [" ".join(rng.sample(WORDS, rng.randint(1, 2))) + rng.choice(SUFFIXES)
+                   for _ in range(rng.randint(0, 3))]
+        columns = [{"name": f"{rng.choice(WORDS).upper()}_{rng.choice(['ID', 'NAME', 'DESC', 'DATE', 'C'])}",
+                    "description": rng.choice(["", "display name", "free text", "code"])}
+                   for _ in range(rng.randint(1, 6))]
+        info = {"aliases": aliases, "columns_priority": columns,
+                "description": " ".join(rng.sample(WORDS, 3))}
+        if rng.random() < 0.1:
+            info["primary_key"] = columns[0]["name"]
+        tables[name] = info
+    return {"tables": tables}
+
+
+def generate_tokens(n: int, seed: int = 5):
+    rng = random.Random(seed)
+    tokens = []
+    for _ in range(n):
+        word = rng.choice(WORDS)
+        tokens.append(rng.choice([word, word + "s", word[:rng.randint(1, len(word))], "the " + word + " list",
+                                  word.upper(), "zzz" + word, rng.choice(WORDS) + " " + word]))
+    return tokens
+
+
+# --- reference: the original scans from _real_label_and_filter_matcher ------------------
+
+def _token_matches_table(token, table_name, table_info):
+    token_lower = token.lower()
+    table_lower = table_name.lower()
+    if isinstance(table_info, dict) and 'aliases' in table_info:
+        for alias in table_info['aliases']:
+            if token_lower in alias.lower() or alias.lower() in token_lower:
+                return True
+    if token_lower in table_lower or table_lower in token_lower:
+        return True
+    return False
+
+
+def reference_match_table(token, schema):
+    for table_name, table_info in schema['tables'].items():
+        if _token_matches_table(token, table_name, table_info):
+            return table_name
+    return None
+
+
+def reference_table_for_concept(concept, schema, registry):
+    concept_lower = concept.lower()
+    registry.discover_entities_from_schema(schema)
+    concept_table_map = {}
+    for table_name, table_info in schema['tables'].items():
+        column_names = []
+        if 'columns_priority' in table_info:
+            column_names = [col.get('name', '') for col in table_info['columns_priority']]
+        entity_type = registry.find_entity_type_from_schema(table_name, column_names)
+        if entity_type:
+            for indicator in registry.get_semantic_indicators(entity_type):
+                concept_table_map[indicator] = table_name
+                concept_table_map[indicator + 's'] = table_name
+    if concept_lower in concept_table_map:
+        return concept_table_map[concept_lower]
+    for table_name, table_info in schema['tables'].items():
+        if 'aliases' in table_info:
+            for alias in table_info['aliases']:
+                if concept_lower in alias.lower() or alias.lower() in concept_lower:
+                    return table_name
+    return None
+
+
+def reference_diagnosis(schema):
+    diagnosis_keywords = ['diagnosis', 'diagnostic', 'condition', 'disease', 'medical', 'clinical']
+    text_column_indicators = ['name', 'desc', 'description', 'text', 'title', 'label']
+    candidates = []
+    for table_name, table_info in schema['tables'].items():
+        description = table_info.get('description', '').lower()
+        aliases = [alias.lower() for alias in table_info.get('aliases', [])]
+        diagnosis_score = 0
+        for keyword in diagnosis_keywords:
+            if keyword in description:
+                diagnosis_score += 2
+            for alias in aliases:
+                if keyword in alias:
+                    diagnosis_score += 1
+        for col in table_info.get('columns_priority', []):
+            col_name = col.get('name', '').lower()
+            col_desc = col.get('description', '').lower()
+            text_score = 0
+            for indicator in text_column_indicators:
+                if indicator in col_name:
+                    text_score += 2
+                if indicator in col_desc:
+                    text_score += 1
+            total_score = diagnosis_score + text_score
+            if total_score > 0:
+                candidates.append({'table': table_name, 'column': col['name'], 'score': total_score})
+    if candidates:
+        best = max(candidates, key=lambda x: x['score'])
+        return best['table'], best['column']
+    return None, None
+
+
+def _per_call(fn, items, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(items)
+
+
+def main():
+    n_tables = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    n_tokens = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    schema = generate_schema(n_tables)
+    tokens = generate_tokens(n_tokens)
+    registry = FakeRegistry()
+
+    t0 = time.perf_counter()
+    index = SchemaIndex(schema)
+    index.concept_tables(registry)
+    build = time.perf_counter() - t0
+
+    mismatches = [t for t in tokens if index.match_table(t) != reference_match_table(t, schema)]
+    mismatches += [t for t in tokens[:100]
+                   if index.table_for_concept(t, registry) != reference_table_for_concept(t, schema, registry)]
+    best = index.diagnosis
+    if (best["table"], best["column"]) != reference_diagnosis(schema):
+        mismatches.append("<diagnosis>")
+    if mismatches:
+        print(f"[BENCH] {len(mismatches)} mismatches, e.g. {mismatches[0]!r}")
+        sys.exit(1)
+
+    ref_match = _per_call(lambda t: reference_match_table(t, schema), tokens)
+    new_match = _per_call(index.match_table, tokens)
+    ref_concept = _per_call(lambda t: reference_table_for_concept(t, schema, registry), tokens[:50], repeat=1)
+    new_concept = _per_call(lambda t: index.table_for_concept(t, registry), tokens)
+    ref_diag = _per_call(lambda _: reference_diagnosis(schema), [None] * 5, repeat=1)
+
+    print(f"[BENCH] tables={n_tables} tokens={n_tokens} identical=yes index build={build * 1e3:.1f} ms")
+    print(f"[BENCH] match_table       : scan {ref_match * 1e6:9.1f} us  index {new_match * 1e6:7.2f} us  "
+          f"({ref_match / new_match:.0f}x)")
+    print(f"[BENCH] table_for_concept : scan {ref_concept * 1e6:9.1f} us  index {new_concept * 1e6:7.2f} us  "
+          f"({ref_concept / new_concept:.0f}x)")
+    print(f"[BENCH] diagnosis column  : scan {ref_diag * 1e6:9.1f} us  index (precomputed attribute)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# scripts/bench_serve.py
+# SPDX-License-Identifier: Apache-2.0
+"""
+Shell-level latency of `python -m aivia "<question>"` with and without `aivia serve`.
+
+Uses the fake driver from bench_run_many.py (fixed query latency plus a simulated Bolt
+connection setup per cold process), so no Neo4j server is needed:
+
+- cold: every run is a fresh interpreter that imports, connects and plans in-process
+  (`AIVIA_NO_SERVER=1`)
+- forwarded: the same CLI forwards to a server started here on a temp Unix socket (or
+  `--http PORT`)
+- round trip: `aivia.client.forward()` from an already-running process
+
+Both CLI modes must print identical output.
+
+    python scripts/bench_serve.py [runs] [--connect-ms 30] [--http PORT]
+"""
+from pathlib import Path
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from bench_run_many import FakeDriver
+
+from aivia.cache import PlanCache
+from aivia.client import forward
+from aivia.run_query import AiviaEngine
+from aivia.server import QueryServer, make_server
+
+SCRIPTS = Path(__file__).resolve().parent
+SRC = SCRIPTS.parent / "src"
+QUESTION = "open deals >10k last 60 days no next meeting 14 days"
+
+# A cold CLI process: the real `aivia.__main__.main`, with the pooled engine swapped for the
+# fake driver (the connect cost is paid once per process, like the driver warm-up)
+COLD = """
+import sys, time
+sys.path.insert(0, {scripts!r})
+from bench_run_many import FakeDriver
+import aivia.connection, aivia.__main__
+from aivia.run_query import AiviaEngine
+def get_engine(**kwargs):
+    time.sleep({connect_s})
+    return AiviaEngine(FakeDriver(), **kwargs)
+aivia.connection.get_engine = get_engine
+aivia.__main__.main([{question!r}])
+"""
+
+
+def _cli(args, env):
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, check=True).stdout
+    return time.perf_counter() - t0, out
+
+
+def main():
+    args = sys.argv[1:]
+    options = {}
+    for flag in ("--connect-ms", "--http"):
+        if flag in args:
+            i = args.index(flag)
+            options[flag] = args[i + 1]
+            del args[i:i + 2]
+    runs = int(args[0]) if args else 10
+    connect_s = float(options.get("--connect-ms", 30)) / 1e3
+
+    tmp = tempfile.mkdtemp()
+    address = f"http://127.0.0.1:{options['--http']}" if "--http" in options else os.path.join(tmp, "aivia.sock")
+    app = QueryServer(AiviaEngine(FakeDriver(), plan_cache=PlanCache()), address=address)
+    app.warm_up(QUESTION)
+    server = make_server(app)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    env = {**os.environ, "PYTHONPATH": str(SRC), "AIVIA_SERVER": address}
+    cold = [_cli(["-c", COLD.format(scripts=str(SCRIPTS), connect_s=connect_s, question=QUESTION)],
+                 {**env, "AIVIA_NO_SERVER": "1"}) for _ in range(runs)]
+    warm = [_cli(["-m", "aivia", QUESTION], env) for _ in range(runs)]
+    if cold[0][1] != warm[0][1]:
+        print("[BENCH] forwarded output differs from the in-process CLI:")
+        print(cold[0][1], warm[0][1], sep="\n----\n")
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    for _ in range(runs * 10):
+        forward(QUESTION, address=address)
+    round_trip = (time.perf_counter() - t0) / (runs * 10)
+    server.shutdown()
+    server.server_close()
+
+    best_cold, best_warm = min(t for t, _ in cold), min(t for t, _ in warm)
+    print(f"[BENCH] server={address} runs={runs} simulated connect={connect_s * 1e3:.0f} ms "
+          f"query={FakeDriver().query_s * 1e3:.0f} ms  output identical=yes")
+    print(f"[BENCH] cold CLI      : {best_cold * 1e3:8.1f} ms  (best of {runs})")
+    print(f"[BENCH] forwarded CLI : {best_warm * 1e3:8.1f} ms  ({best_cold / best_warm:.1f}x)")
+    print(f"[BENCH] round trip    : {round_trip * 1e3:8.2f} ms  (forward() from a warm process)")
+    print(f"[BENCH] {app.health()}")
+
+
+if __name__ == "__main__":
+    main()
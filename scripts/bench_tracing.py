@@ -0,0 +1,50 @@
+# scripts/bench_tracing.py
+# SPDX-License-Identifier: Apache-2.0
+"""
+Overhead of matcher tracing on vs off.
+
+Times match_concepts_adapter over the bench_matcher corpus with:
+- off:     no trace collected, logger above DEBUG (the production default)
+- collect: a per-request Trace collected around every question (no formatting)
+- debug:   DEBUG logging enabled into a NullHandler (records built, then dropped)
+
+    python scripts/bench_tracing.py [n_questions]
+"""
+import logging
+import sys
+
+from aivia.adapters.matcher_adapter import match_concepts_adapter
+from aivia.tracing import collect_trace
+from bench_matcher import _time_per_question, generate_corpus
+
+
+def _collected(q):
+    with collect_trace(q) as t:
+        match_concepts_adapter(q)
+    return t
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    corpus = generate_corpus(n)
+    log = logging.getLogger("aivia.adapters.matcher_adapter")
+    log.propagate = False
+
+    log.setLevel(logging.WARNING)
+    off = _time_per_question(match_concepts_adapter, corpus)
+    collect = _time_per_question(_collected, corpus)
+    events = sum(len(_collected(q)) for q in corpus) / n
+
+    log.addHandler(logging.NullHandler())
+    log.setLevel(logging.DEBUG)
+    debug = _time_per_question(match_concepts_adapter, corpus)
+    log.setLevel(logging.WARNING)
+
+    print(f"[BENCH] questions={n} events/question={events:.1f}")
+    print(f"[BENCH] off     : {off * 1e6:8.2f} us/question")
+    print(f"[BENCH] collect : {collect * 1e6:8.2f} us/question  (+{(collect - off) * 1e6:.2f} us)")
+    print(f"[BENCH] debug   : {debug * 1e6:8.2f} us/question  (+{(debug - off) * 1e6:.2f} us)")
+
+
+if __name__ == "__main__":
+    main()
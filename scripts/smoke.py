@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 import os, sys
 import pandas as pd
-from neo4j import GraphDatabase
+from aivia.connection import get_driver, close_all
 from aivia.run_query import run_query
 
 PROMPTS = [
@@ -12,10 +12,7 @@ PROMPTS = [
 ]
 
 def main():
-    uri  = os.getenv("AIVIA_NEO4J_URI", "bolt://localhost:7687")
-    user = os.getenv("AIVIA_NEO4J_USER", "neo4j")
-    pwd  = os.getenv("AIVIA_NEO4J_PASS", "password")
-    driver = GraphDatabase.driver(uri, auth=(user, pwd))
+    driver = get_driver()  # AIVIA_NEO4J_* env, pooled and warmed
 
     ok = True
     for q in PROMPTS:
@@ -25,7 +22,8 @@ def main():
         if cypher.strip() == "" or df is None:
             ok = False
 
-    driver.close()
+    print(f"[SMOKE] pool: {driver.metrics()}")
+    close_all()
     sys.exit(0 if ok else 1)
 
 if __name__ == "__main__":
@@ -12,9 +12,14 @@ setup(
     install_requires=[
         "neo4j>=5.0.0",
         "pandas>=1.5.0",
-        "faiss-cpu>=1.7.0",
-        "sentence-transformers>=2.2.0",
+        "pyyaml>=6.0",
     ],
+    extras_require={
+        # vector matching (aivia.matching.faiss_search) and `aivia index build`
+        "vector": ["faiss-cpu>=1.7.0", "sentence-transformers>=2.2.0"],
+        # python -m pytest (tests/)
+        "test": ["pytest>=7.0"],
+    },
     entry_points={
         "console_scripts": [
             "aivia=aivia.__main__:main",
@@ -1,4 +1,41 @@
 # SPDX-License-Identifier: Apache-2.0
-from .run_query import run_query, AiviaEngine
+# Public names resolve on first attribute access (PEP 562), so `import aivia` and the
+# submodules the CLI needs don't pull in neo4j / pandas until something actually uses them.
+import importlib
+import sys
+import types
 
-__all__ = ["run_query", "AiviaEngine"]
+_EXPORTS = {
+    "run_query": ".run_query",
+    "AiviaEngine": ".run_query",
+    "AsyncAiviaEngine": ".async_engine",
+    "get_driver": ".connection",
+    "get_engine": ".connection",
+}
+
+__all__ = ["run_query", "AiviaEngine", "AsyncAiviaEngine", "get_driver", "get_engine"]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Loading the `aivia.run_query` submodule binds it on the package; keep
+        # `aivia.run_query` the function, as the eager `from .run_query import run_query` did
+        if name in _EXPORTS and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
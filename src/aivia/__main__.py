@@ -1,16 +1,65 @@
-# Minimal CLI to test locally
-from neo4j import GraphDatabase
-from .run_query import run_query
-import os, sys
+# Minimal CLI to test locally:
+#   aivia "<question>"              aivia ask <question ...>      aivia -- <question ...>
+#   aivia index build <use_case>    aivia serve [--http PORT | --socket PATH | --status]
+# Unquoted questions that start with "index", "serve" or "ask" need `ask` or `--` in front.
+import json, logging, os, sys
 
-if __name__ == "__main__":
-    q = " ".join(sys.argv[1:]) or "open deals >10k last 60 days no next meeting 14 days"
-    driver = GraphDatabase.driver(
-        os.getenv("AIVIA_NEO4J_URI","bolt://localhost:7687"),
-        auth=(os.getenv("AIVIA_NEO4J_USER","neo4j"), os.getenv("AIVIA_NEO4J_PASS","password"))
-    )
-    cypher, df, dbg = run_query(driver, q)
+DEFAULT_QUESTION = "open deals >10k last 60 days no next meeting 14 days"
+
+
+def format_rows(columns, rows, limit=10):
+    """Right-aligned text table of the first `limit` rows (like `DataFrame.to_string(index=False)`)."""
+    cells = [[str(c) for c in columns]] + [["NaN" if v != v else str(v) for v in row] for row in rows[:limit]]
+    widths = [max(len(line[i]) for line in cells) for i in range(len(columns))]
+    return "\n".join(" ".join(cell.rjust(w) for cell, w in zip(line, widths)) for line in cells)
+
+
+def _as_forwarded(value):
+    """`value` as it arrives from `aivia serve` (JSON, unknown types as text), so both paths print alike."""
+    return json.loads(json.dumps(value, default=str))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["ask"]:
+        argv = argv[1:]
+    elif argv[:1] == ["index"]:
+        from .index_builder import main as index_main
+        return index_main(argv[1:])
+    elif argv[:1] == ["serve"]:
+        from .server import main as serve_main
+        return serve_main(argv[1:])
+    if argv[:1] == ["--"]:
+        argv = argv[1:]
+    q = " ".join(argv) or DEFAULT_QUESTION
+    # Matcher tracing is DEBUG-level logging: AIVIA_LOG_LEVEL=DEBUG shows it
+    logging.basicConfig(level=os.getenv("AIVIA_LOG_LEVEL", "WARNING").upper(), format="%(message)s")
+    want_pool = os.getenv("AIVIA_POOL_METRICS") == "1"
+    # A running `aivia serve` answers with its warm engine (see aivia.server)
+    from .client import ServerError, forward
+    try:
+        reply = forward(q, pool=want_pool)
+    except ServerError as e:
+        sys.exit(f"aivia server: {e}")
+    if reply is not None:
+        cypher, params, columns, rows, pool = (reply["cypher"], reply["params"], reply["columns"], reply["rows"],
+                                               reply.get("pool"))
+    else:
+        from .connection import get_engine, pool_metrics
+        # Pooled, pre-warmed driver from AIVIA_NEO4J_* (see aivia.connection)
+        engine = get_engine(native_dates=os.getenv("AIVIA_NATIVE_DATES") == "1")
+        cypher, columns, rows, dbg = engine.run_rows(q)  # no DataFrame, so pandas is never imported
+        params, rows, pool = _as_forwarded([dbg["params"], rows[:10], pool_metrics() if want_pool else None])
     print("== Generated Cypher ==")
     print(cypher)
+    print("\n== Parameters ==")
+    print(params)
     print("\n== Results (top 10) ==")
-    print(df.head(10).to_string(index=False))
+    print(format_rows(columns, rows))
+    if want_pool:
+        print("\n== Pool ==")
+        print(pool)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,126 +1,223 @@
 # SPDX-License-Identifier: Apache-2.0
 # Thin wrapper so AiviaEngine can call your existing matcher unchanged elsewhere.
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+import logging
 import re
+from ..tracing import trace, tracing
+
+_log = logging.getLogger(__name__)
+
+# ----------------- pattern tables (compiled once at import) -----------------
+# (pattern, multiplier, required literal): each pattern has exactly one capture group and
+# the literal must occur in the question for the pattern to possibly match.
+# Within a table the FIRST pattern (in list order) that matches anywhere wins.
+
+# Enhanced amount extraction with multiple patterns
+_AMOUNT_PATTERNS = [
+    (r'(\d+)k', 1000, 'k'),  # "10k", "25k"
+    (r'(\d+),?000', 1, '000'),  # "10,000", "10000"
+    (r'(\d+)\s*thousand', 1000, 'thousand'),  # "10 thousand"
+    (r'greater than\s*\$?(\d+)', 1, 'greater than'),  # "greater than 10000"
+    (r'more than\s*\$?(\d+)', 1, 'more than'),  # "more than 10000"
+    (r'over\s*\$?(\d+)', 1, 'over'),  # "over 10000"
+]
+
+# Enhanced time window extraction
+_TIME_PATTERNS = [
+    (r'(\d+)\s*days?', 1, 'day'),  # "60 days", "30 day"
+    (r'(\d+)\s*weeks?', 7, 'week'),  # "2 weeks"
+    (r'(\d+)\s*months?', 30, 'month'),  # "1 month"
+    (r'last\s*(\d+)\s*days?', 1, 'last'),  # "last 60 days"
+    (r'past\s*(\d+)\s*days?', 1, 'past'),  # "past 30 days"
+    (r'(\d+)\s*day\s*window', 1, 'window'),  # "60 day window"
+]
+
+# Enhanced next meeting/step extraction
+_NEXT_STEP_PATTERNS = [
+    (r'no next meeting.*?(\d+)\s*days?', 1, 'no next meeting'),
+    (r'no next step.*?(\d+)\s*days?', 1, 'no next step'),
+    (r'no meeting.*?(\d+)\s*days?', 1, 'no meeting'),
+    (r'(\d+)\s*days?.*?no.*?meeting', 1, 'meeting'),
+    (r'(\d+)\s*days?.*?no.*?step', 1, 'step'),
+]
+
+# Enhanced stale detection
+_STALE_PATTERNS = [
+    (r'(\d+)\s*days?.*?stale', 1, 'stale'),
+    (r'stale.*?(\d+)\s*days?', 1, 'stale'),
+    (r'(\d+)\s*days?.*?no activity', 1, 'no activity'),
+    (r'no activity.*?(\d+)\s*days?', 1, 'no activity'),
+]
+
+# Enhanced role extraction (every matching role is reported, in this order)
+_ROLE_KEYWORDS = {
+    "finance": ["finance", "financial", "cfo", "treasurer"],
+    "security": ["security", "ciso", "security officer", "infosec"],
+    "economic buyer": ["economic buyer", "decision maker", "budget holder", "purchasing"]
+}
+
+# Enhanced stage extraction (first matching stage, in this order, wins)
+_STAGE_KEYWORDS = {
+    "evaluate": ["evaluate", "evaluation", "assessing", "reviewing"],
+    "prospecting": ["prospect", "prospecting", "lead", "leads"],
+    "legal": ["legal", "contract", "agreement", "terms"],
+    "closed won": ["closed won", "won", "signed", "completed"],
+    "closed lost": ["closed lost", "lost", "declined", "rejected"]
+}
+
+# Enhanced commit detection
+_COMMIT_KEYWORDS = ["commit", "committed", "commitment", "committed deal", "commit deal"]
+
+
+class _FirstMatchExtractor:
+    """
+    Ordered pattern table compiled once.
+
+    A pattern's regex only runs when its required literal is in the text (a plain
+    substring check), so most patterns are rejected without entering the regex engine.
+    The first pattern that matches wins, exactly like the original search loop.
+    """
+
+    def __init__(self, patterns: Sequence[Tuple[str, int, str]]):
+        self.patterns = [(literal, re.compile(p), mult) for p, mult, literal in patterns]
+
+    def extract(self, text: str) -> Optional[int]:
+        for literal, regex, mult in self.patterns:
+            if literal in text:
+                m = regex.search(text)
+                if m:
+                    return int(m.group(1)) * mult
+        return None
+
+
+class _KeywordAutomaton:
+    """
+    Aho-Corasick style multi-keyword scanner.
+
+    All keywords are folded into one longest-first alternation and found in a single
+    non-overlapping ``findall`` pass. As in Aho-Corasick, each keyword's output set
+    also carries the tags of every keyword it contains, so hits hidden inside a longer
+    match are not lost. The only hits a non-overlapping scan can miss are keywords
+    that start inside another match and run past its end; for each keyword those
+    candidates are precomputed at build time and checked only when it was matched.
+    """
+
+    def __init__(self, tagged_keywords: Iterable[Tuple[Any, str]]):
+        tags_by_keyword: Dict[str, set] = {}
+        for tag, keyword in tagged_keywords:
+            tags_by_keyword.setdefault(keyword, set()).add(tag)
+
+        self.outputs: Dict[str, frozenset] = {}
+        for keyword in tags_by_keyword:
+            tags = set()
+            for other, other_tags in tags_by_keyword.items():
+                if other in keyword:
+                    tags |= other_tags
+            self.outputs[keyword] = frozenset(tags)
+
+        # spill[k]: keywords that can start inside a match of k and run past its end
+        self.spill: Dict[str, List[Tuple[str, frozenset]]] = {}
+        for keyword in self.outputs:
+            self.spill[keyword] = [
+                (other, other_tags) for other, other_tags in self.outputs.items()
+                if not other_tags <= self.outputs[keyword]
+                and any(keyword.endswith(other[:i]) for i in range(1, min(len(other), len(keyword))))
+            ]
+
+        alternation = "|".join(re.escape(k) for k in sorted(tags_by_keyword, key=len, reverse=True))
+        self.regex = re.compile(alternation)
+
+    def scan(self, text: str) -> set:
+        hits = set()
+        found = self.regex.findall(text)
+        for keyword in found:
+            hits |= self.outputs[keyword]
+        for keyword in found:
+            for other, tags in self.spill[keyword]:
+                if not tags <= hits and other in text:
+                    hits |= tags
+        return hits
+
+
+def _tagged(kind: str, keywords_by_name: Dict[str, List[str]]):
+    return [((kind, name), kw) for name, kws in keywords_by_name.items() for kw in kws]
+
+
+_DIGIT = re.compile(r"\d")
+_AMOUNT = _FirstMatchExtractor(_AMOUNT_PATTERNS)
+_TIME = _FirstMatchExtractor(_TIME_PATTERNS)
+_NEXT_STEP = _FirstMatchExtractor(_NEXT_STEP_PATTERNS)
+_STALE = _FirstMatchExtractor(_STALE_PATTERNS)
+_KEYWORDS = _KeywordAutomaton(
+    _tagged("role", _ROLE_KEYWORDS)
+    + _tagged("stage", _STAGE_KEYWORDS)
+    + _tagged("commit", {"commit": _COMMIT_KEYWORDS})
+)
+
 
 def match_concepts_adapter(question: str, top_k: int = 8) -> Dict[str, Any]:
     """
     Real matcher adapter for Sales CRM demo.
     Uses enhanced pattern matching to extract business concepts from natural language.
+    All patterns are precompiled at import; numeric patterns are skipped outright
+    when the question has no digits, and keywords are found in one scan.
     """
-    print(f"🔍 REAL MATCHER - Processing: '{question}'")
-    
+    traced = tracing(_log)  # checked once: no per-event cost when nobody listens
+    if traced:
+        trace(_log, "🔍 REAL MATCHER - Processing: %r", question)
+
     q = question.lower()
     result = {}
-    
-    # Enhanced amount extraction with multiple patterns
-    amount_patterns = [
-        r'(\d+)k',  # "10k", "25k"
-        r'(\d+),?000',  # "10,000", "10000"
-        r'(\d+)\s*thousand',  # "10 thousand"
-        r'greater than\s*\$?(\d+)',  # "greater than 10000"
-        r'more than\s*\$?(\d+)',  # "more than 10000"
-        r'over\s*\$?(\d+)',  # "over 10000"
-    ]
-    
-    for pattern in amount_patterns:
-        match = re.search(pattern, q)
-        if match:
-            amount = int(match.group(1))
-            if 'k' in pattern or 'thousand' in pattern:
-                amount *= 1000
+
+    # Every amount/time/next-step/stale pattern needs a digit to match
+    has_digit = _DIGIT.search(q) is not None
+
+    if has_digit:
+        amount = _AMOUNT.extract(q)
+        if amount is not None:
             result["needs_amount_gt"] = amount
-            print(f"💰 Amount extracted: ${amount:,}")
-            break
-    
-    # Enhanced time window extraction
-    time_patterns = [
-        (r'(\d+)\s*days?', lambda x: int(x)),  # "60 days", "30 day"
-        (r'(\d+)\s*weeks?', lambda x: int(x) * 7),  # "2 weeks"
-        (r'(\d+)\s*months?', lambda x: int(x) * 30),  # "1 month"
-        (r'last\s*(\d+)\s*days?', lambda x: int(x)),  # "last 60 days"
-        (r'past\s*(\d+)\s*days?', lambda x: int(x)),  # "past 30 days"
-        (r'(\d+)\s*day\s*window', lambda x: int(x)),  # "60 day window"
-    ]
-    
-    for pattern, converter in time_patterns:
-        match = re.search(pattern, q)
-        if match:
-            days = converter(match.group(1))
+            if traced:
+                trace(_log, "💰 Amount extracted: $%s", f"{amount:,}")
+
+        days = _TIME.extract(q)
+        if days is not None:
             result["window_days"] = days
-            print(f"📅 Time window extracted: {days} days")
-            break
-    
-    # Enhanced next meeting/step extraction
-    next_step_patterns = [
-        (r'no next meeting.*?(\d+)\s*days?', lambda x: int(x)),
-        (r'no next step.*?(\d+)\s*days?', lambda x: int(x)),
-        (r'no meeting.*?(\d+)\s*days?', lambda x: int(x)),
-        (r'(\d+)\s*days?.*?no.*?meeting', lambda x: int(x)),
-        (r'(\d+)\s*days?.*?no.*?step', lambda x: int(x)),
-    ]
-    
-    for pattern, converter in next_step_patterns:
-        match = re.search(pattern, q)
-        if match:
-            days = converter(match.group(1))
+            if traced:
+                trace(_log, "📅 Time window extracted: %d days", days)
+
+        days = _NEXT_STEP.extract(q)
+        if days is not None:
             result["next_meeting_days"] = days
-            print(f"📋 Next meeting window: {days} days")
-            break
-    
-    # Enhanced role extraction
-    role_keywords = {
-        "finance": ["finance", "financial", "cfo", "treasurer"],
-        "security": ["security", "ciso", "security officer", "infosec"],
-        "economic buyer": ["economic buyer", "decision maker", "budget holder", "purchasing"]
-    }
-    
-    found_roles = []
-    for role, keywords in role_keywords.items():
-        if any(keyword in q for keyword in keywords):
-            found_roles.append(role)
-    
+            if traced:
+                trace(_log, "📋 Next meeting window: %d days", days)
+
+    hits = _KEYWORDS.scan(q)
+
+    found_roles = [role for role in _ROLE_KEYWORDS if ("role", role) in hits]
     if found_roles:
         result["wants_roles"] = found_roles
-        print(f"👥 Roles extracted: {found_roles}")
-    
-    # Enhanced stage extraction
-    stage_keywords = {
-        "evaluate": ["evaluate", "evaluation", "assessing", "reviewing"],
-        "prospecting": ["prospect", "prospecting", "lead", "leads"],
-        "legal": ["legal", "contract", "agreement", "terms"],
-        "closed won": ["closed won", "won", "signed", "completed"],
-        "closed lost": ["closed lost", "lost", "declined", "rejected"]
-    }
-    
-    for stage, keywords in stage_keywords.items():
-        if any(keyword in q for keyword in keywords):
+        if traced:
+            trace(_log, "👥 Roles extracted: %s", found_roles)
+
+    for stage in _STAGE_KEYWORDS:
+        if ("stage", stage) in hits:
             result["stage_eq"] = stage
-            print(f"🎯 Stage extracted: {stage}")
+            if traced:
+                trace(_log, "🎯 Stage extracted: %s", stage)
             break
-    
-    # Enhanced commit detection
-    commit_keywords = ["commit", "committed", "commitment", "committed deal", "commit deal"]
-    if any(keyword in q for keyword in commit_keywords):
+
+    if ("commit", "commit") in hits:
         result["wants_commit"] = True
-        print("✅ Commit flag detected")
-    
-    # Enhanced stale detection
-    stale_patterns = [
-        (r'(\d+)\s*days?.*?stale', lambda x: int(x)),
-        (r'stale.*?(\d+)\s*days?', lambda x: int(x)),
-        (r'(\d+)\s*days?.*?no activity', lambda x: int(x)),
-        (r'no activity.*?(\d+)\s*days?', lambda x: int(x)),
-    ]
-    
-    for pattern, converter in stale_patterns:
-        match = re.search(pattern, q)
-        if match:
-            days = converter(match.group(1))
+        if traced:
+            trace(_log, "✅ Commit flag detected")
+
+    if has_digit:
+        days = _STALE.extract(q)
+        if days is not None:
             result["stale_days"] = days
-            print(f"⏰ Stale period: {days} days")
-            break
-    
+            if traced:
+                trace(_log, "⏰ Stale period: %d days", days)
+
     # Default fallbacks for common patterns
     if "10k" in q or "10000" in q:
         result["needs_amount_gt"] = result.get("needs_amount_gt", 10000)
@@ -132,6 +229,7 @@ def match_concepts_adapter(question: str, top_k: int = 8) -> Dict[str, Any]:
         result["next_meeting_days"] = 14
     if "21" in q and "stale_days" not in result:
         result["stale_days"] = 21
-    
-    print(f"🎯 REAL MATCHER RESULT: {result}")
+
+    if traced:
+        trace(_log, "🎯 REAL MATCHER RESULT: %s", dict(result))
     return result
@@ -0,0 +1,136 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Asyncio variant of AiviaEngine for async web tiers.
+
+Planning (match → path → Cypher) is delegated to a regular AiviaEngine, so both engines
+produce identical Cypher and share the same caches; only execution is async, on a
+`neo4j.AsyncDriver` (`neo4j.AsyncGraphDatabase.driver(...)`). Planning is CPU-bound, so it
+runs in the loop's default executor and never blocks the event loop.
+"""
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import contextvars
+import functools
+import time
+import weakref
+from .cache import PlanCache, ResultCache, query_key
+from .run_query import AiviaEngine, _columnar_frame
+from .telemetry import StageTimer, server_timings
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+async def _in_thread(func, *args, **kwargs):
+    """`asyncio.to_thread` for Python 3.8: the default executor, with the caller's context (traces, spans)."""
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(None, call)
+
+
+class AsyncAiviaEngine:
+    """
+    Async NL→Cypher→Results engine.
+
+    Args:
+        driver: a `neo4j.AsyncDriver`.
+        max_concurrency: max queries this engine has in flight against Neo4j at once
+            (across all callers on one event loop), enforced with an asyncio semaphore
+            per loop.
+        native_dates, metrics, tracer: see `AiviaEngine` (same `debug["timing"]` keys).
+    """
+
+    def __init__(self, driver, schema_index=None, value_index=None, plan_cache: PlanCache = None,
+                 result_cache: ResultCache = None, max_concurrency: int = 16, native_dates: bool = False,
+                 metrics=None, tracer=None):
+        self.driver = driver
+        self.max_concurrency = max_concurrency
+        self.result_cache = result_cache
+        self._planner = AiviaEngine(None, schema_index=schema_index, value_index=value_index,
+                                    plan_cache=plan_cache, result_cache=result_cache,
+                                    native_dates=native_dates, metrics=metrics, tracer=tracer)
+        # One semaphore per event loop: an asyncio.Semaphore is bound to the loop it first waits on
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+
+    def _timer(self) -> StageTimer:
+        return StageTimer(self._planner.metrics, self._planner.tracer)
+
+    async def run(self, question: str, top_k: int = 8) -> Tuple[str, "pd.DataFrame", Dict[str, Any]]:
+        timer = self._timer()
+        t0 = time.perf_counter()
+        match, path, cypher, params = await _in_thread(self._planner._plan, question, top_k=top_k, timer=timer)
+        df = await self._exec_cypher(cypher, params, timer)
+        timer.record("total", time.perf_counter() - t0)
+        debug = {"question": question, "match": match, "path": path, "cypher": cypher, "params": params,
+                 "timing": timer.timings}
+        return cypher, df, debug
+
+    async def run_many(self, questions: Sequence[str], concurrency: Optional[int] = None, top_k: int = 8
+                       ) -> List[Tuple[str, "pd.DataFrame", Dict[str, Any]]]:
+        """
+        Async counterpart of ``AiviaEngine.run_many``: same ordering, dedupe and debug keys.
+        ``concurrency`` further limits this batch below the engine-wide ``max_concurrency``.
+        """
+        planned = await _in_thread(self._plan_batch, questions, top_k)
+        unique = {query_key(p[3], p[4]): (p[3], p[4]) for p in planned}
+        batch_limit = asyncio.Semaphore(concurrency or self.max_concurrency)
+
+        async def execute(cypher: str, params: Dict[str, Any]):
+            async with batch_limit:
+                t0 = time.perf_counter()
+                timer = self._timer()
+                df = await self._exec_cypher(cypher, params, timer)
+                return df, time.perf_counter() - t0, timer.timings
+
+        done = await asyncio.gather(*(execute(c, p) for c, p in unique.values()))
+        executed = dict(zip(unique, done))
+
+        results, seen = [], set()
+        for question, match, path, cypher, params, plan_s, plan_timings in planned:
+            key = query_key(cypher, params)
+            df, exec_s, exec_timings = executed[key]
+            deduped = key in seen
+            seen.add(key)
+            timing = {"plan_s": plan_s, "exec_s": exec_s, **plan_timings, **exec_timings}
+            debug = {"question": question, "match": match, "path": path, "cypher": cypher, "params": params,
+                     "timing": timing, "deduped": deduped}
+            results.append((cypher, df.copy() if deduped else df, debug))
+        return results
+
+    def _plan_batch(self, questions: Sequence[str], top_k: int) -> List[Tuple]:
+        planned = []
+        for question in questions:
+            t0 = time.perf_counter()
+            timer = self._timer()
+            match, path, cypher, params = self._planner._plan(question, top_k=top_k, timer=timer)
+            planned.append((question, match, path, cypher, params, time.perf_counter() - t0, timer.timings))
+        return planned
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def _exec_cypher(self, cypher: str, params: Dict[str, Any] = None, timer: StageTimer = None
+                           ) -> "pd.DataFrame":
+        timer = timer or StageTimer()
+        df = self._planner._cached_result(cypher, params, timer)
+        if df is not None:
+            return df
+        async with self._semaphore():
+            # Sessions are cheap: the driver pool keeps Bolt connections open between them
+            with timer.stage("execute"):
+                async with self.driver.session() as s:
+                    result = await s.run(cypher, params or {})
+                    columns = result.keys()
+                    records = await result.values()  # one await instead of one per record
+                    summary = await result.consume()
+        for name, seconds in server_timings(summary).items():
+            timer.record(name, seconds)
+        with timer.stage("frame", rows=len(records)):
+            df = _columnar_frame(columns, records)
+        if self.result_cache is not None:
+            self.result_cache.put(cypher, df, params)
+        return df
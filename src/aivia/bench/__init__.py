@@ -0,0 +1,22 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Benchmark suite for the NL→Cypher→Results pipeline.
+
+    python -m aivia.bench run [--suite micro|e2e|all] [--scales 10k,1m,10m]
+                              [--executor inprocess|neo4j|module:Class] [--json out.json]
+                              [--baseline previous.json [--tolerance 0.25]]
+    python -m aivia.bench generate 1m /tmp/crm_1m      # synthetic CSVs for aivia.loader
+    python -m aivia.bench compare old.json new.json
+
+- `micro`: the matcher adapter, `_build_cypher`, the schema matcher and full planning
+- `e2e`: synthetic Sales CRM graphs (`datagen`) queried through a pluggable executor
+  (`executors`): a real Neo4j server or the in-process numpy stand-in
+- `report`: JSON reports and baseline comparison for release-over-release tracking
+"""
+from .datagen import CrmDataset, generate_crm, parse_scale, write_csv
+from .executors import EXECUTORS, Executor, InProcessExecutor, Neo4jExecutor, get_executor
+from .report import compare, load_report, new_report, write_report
+
+__all__ = ["CrmDataset", "generate_crm", "parse_scale", "write_csv", "EXECUTORS", "Executor",
+           "InProcessExecutor", "Neo4jExecutor", "get_executor", "compare", "load_report", "new_report",
+           "write_report"]
@@ -0,0 +1,118 @@
+# SPDX-License-Identifier: Apache-2.0
+"""`python -m aivia.bench run | generate | compare` (see `aivia.bench`)."""
+from typing import Optional, Sequence
+import functools
+import logging
+import sys
+import time
+
+
+def _names(value: str):
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def run(args) -> int:
+    from .e2e import run_e2e
+    from .executors import get_executor
+    from .micro import run_micro
+    from .report import compare, load_report, new_report, print_comparison, write_report
+
+    # With the report on stdout, progress lines go to stderr
+    log = functools.partial(print, file=sys.stderr if args.json == "-" else sys.stdout, flush=True)
+    report = new_report({k: v for k, v in vars(args).items() if k != "func"})
+    t0 = time.perf_counter()
+    if args.suite in ("micro", "all"):
+        report["micro"] = run_micro(args.micro_questions, repeat=args.repeat, seed=args.seed,
+                                    only=_names(args.micro) if args.micro else None, log=log)
+    if args.suite in ("e2e", "all"):
+        from ..indexes import TEMPLATE_QUESTIONS
+
+        questions = dict(TEMPLATE_QUESTIONS)
+        if args.questions:
+            unknown = set(_names(args.questions)) - set(questions)
+            if unknown:
+                sys.exit(f"unknown question(s) {sorted(unknown)}; choose from {sorted(questions)}")
+            questions = {name: questions[name] for name in _names(args.questions)}
+        kwargs = {"native_dates": args.native_dates}
+        if args.executor == "neo4j":
+            kwargs.update(load=not args.no_load, data_dir=args.data_dir, batch_size=args.batch_size)
+        try:
+            executor = get_executor(args.executor, **kwargs)
+        except (ValueError, ImportError, AttributeError) as e:
+            sys.exit(f"aivia.bench: {e}")
+        report["e2e"] = run_e2e(executor, _names(args.scales), questions, repeat=args.repeat, seed=args.seed, log=log)
+    report["elapsed_s"] = round(time.perf_counter() - t0, 3)
+
+    if args.json:
+        write_report(report, args.json)
+        if args.json != "-":
+            log(f"[BENCH] report written to {args.json}")
+    if args.baseline:
+        rows, regressions = compare(load_report(args.baseline), report, args.tolerance)
+        print_comparison(rows, regressions, args.tolerance, out=sys.stderr if args.json == "-" else sys.stdout)
+        return 1 if regressions else 0
+    return 0
+
+
+def generate(args) -> int:
+    from .datagen import generate_crm, parse_scale, write_csv
+
+    t0 = time.perf_counter()
+    dataset = generate_crm(parse_scale(args.scale), seed=args.seed)
+    written = write_csv(dataset, args.out_dir)
+    print(f"[BENCH] wrote {written} to {args.out_dir} in {time.perf_counter() - t0:.1f} s")
+    return 0
+
+
+def compare_reports(args) -> int:
+    from .report import compare, load_report, print_comparison
+
+    rows, regressions = compare(load_report(args.baseline), load_report(args.current), args.tolerance)
+    print_comparison(rows, regressions, args.tolerance)
+    return 1 if regressions else 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m aivia.bench",
+                                     description="Benchmarks for the NL→Cypher→Results pipeline")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("run", help="run benchmarks and report")
+    p.add_argument("--suite", choices=["micro", "e2e", "all"], default="all")
+    p.add_argument("--scales", default="10k", help="comma-separated deal counts: 10k, 1m, 10m, 250000 (default 10k)")
+    p.add_argument("--executor", default="inprocess", help="inprocess | neo4j | package.module:Class")
+    p.add_argument("--questions", help="comma-separated template names (default: all of indexes.TEMPLATE_QUESTIONS)")
+    p.add_argument("--micro", help="comma-separated micro-benchmark names (default: all)")
+    p.add_argument("--micro-questions", type=int, default=200, help="corpus size for micro-benchmarks")
+    p.add_argument("--repeat", type=int, default=5, help="timed runs per question / passes per micro corpus")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--native-dates", action="store_true", help="load and query dates as Neo4j DATE values")
+    p.add_argument("--no-load", action="store_true", help="neo4j: benchmark the graph already in the database")
+    p.add_argument("--data-dir", help="neo4j: keep the generated CSVs here (default: a temp dir, removed)")
+    p.add_argument("--batch-size", type=int, default=20_000, help="neo4j: loader batch size")
+    p.add_argument("--json", metavar="PATH", help="write the JSON report here ('-' for stdout)")
+    p.add_argument("--baseline", metavar="PATH", help="compare against an earlier report; exit 1 on regressions")
+    p.add_argument("--tolerance", type=float, default=0.25, help="allowed median slowdown vs the baseline")
+    p.set_defaults(func=run)
+
+    p = commands.add_parser("generate", help="write synthetic Sales CRM CSVs")
+    p.add_argument("scale", help="number of deals: 10k, 1m, 10m, ...")
+    p.add_argument("out_dir")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=generate)
+
+    p = commands.add_parser("compare", help="compare two JSON reports")
+    p.add_argument("baseline")
+    p.add_argument("current")
+    p.add_argument("--tolerance", type=float, default=0.25)
+    p.set_defaults(func=compare_reports)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,212 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Synthetic Sales CRM data at any scale.
+
+`generate_crm(n_deals)` grows the demo dataset (`examples/sales_crm_demo`) to `n_deals`
+deals while keeping its shape: about 8 deals and 3 contacts per account, 2.5 activities
+per deal, the demo's stage / role / activity-type mix, and dates spread over the 18 months
+before `today`, so every query template returns a realistic slice of the graph.
+
+Tables are held column-wise in numpy arrays (integer foreign keys, `datetime64[D]` dates
+with NaT for blanks); id and name strings are only built when rows are returned or
+written. `write_csv()` writes the demo's CSV layout, so `aivia.loader` loads the result:
+
+    python -m aivia.bench generate 1m /tmp/crm_1m
+    python -m aivia.loader /tmp/crm_1m --batch-size 20000
+"""
+from typing import Dict, List, Optional, Union
+from dataclasses import dataclass, field
+from pathlib import Path
+import datetime as dt
+import re
+import numpy as np
+
+SCALES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+
+STAGES = ["Prospecting", "Evaluate", "Proposal", "Legal", "Closed Won", "Closed Lost"]
+STAGE_WEIGHTS = [0.25, 0.20, 0.15, 0.15, 0.15, 0.10]
+OPEN_STAGES = np.array([True, True, True, True, False, False])
+ROLES = ["Champion", "Economic Buyer", "Finance", "Procurement", "Security", "User"]
+ROLE_WEIGHTS = [0.22, 0.14, 0.11, 0.14, 0.22, 0.17]
+ACTIVITY_TYPES = ["Call", "Email", "Meeting"]
+ACTIVITY_WEIGHTS = [0.46, 0.27, 0.27]
+DEAL_NAMES = ["Platform Subscription", "Enterprise Suite", "Data Integration", "Team Plan",
+              "Analytics Add-on", "Security Bundle", "Renewal", "Pilot"]
+SOURCES = ["Inbound", "Partner", "Referral", "Outbound"]
+INDUSTRIES = ["SaaS", "FinTech", "EdTech", "Healthcare", "Cybersecurity", "Retail"]
+REGIONS = ["NAMER", "EMEA", "APAC"]
+TEAMS = ["Enterprise", "Mid-Market", "SMB"]
+TITLES = {"Champion": "Director", "Economic Buyer": "VP", "Finance": "Finance Manager",
+          "Procurement": "Procurement Lead", "Security": "Security Analyst", "User": "Analyst"}
+_ACCOUNT_WORDS = (["Blue", "Nimbus", "Quasar", "Metro", "Echo", "Aurora", "Pioneer", "Vista",
+                   "Harbor", "Citrus", "Nova", "Atlas"],
+                  ["Analytics", "Labs", "Health", "Soft", "Finance", "Retail", "Robotics", "Pay",
+                   "Systems", "Cloud", "Secure", "Learning"])
+_PEOPLE = (["Avery", "Jordan", "Taylor", "Sam", "Morgan", "Casey", "Indy", "Devin", "Riley", "Quinn"],
+           ["Shaw", "Lee", "Kim", "Patel", "Liu", "Rivera", "Morgan", "Rossi", "Okafor", "Berg"])
+
+HISTORY_DAYS = 540  # deals are created up to this many days before `today`
+
+
+def parse_scale(scale: Union[str, int]) -> int:
+    """'10k' / '1m' / '2.5M' / '250000' → number of deals."""
+    if isinstance(scale, int):
+        return scale
+    m = re.fullmatch(r"\s*([\d.]+)\s*([km]?)\s*", str(scale).lower().replace("_", ""))
+    if not m:
+        raise ValueError(f"bad scale {scale!r} (expected e.g. 10k, 1m, 250000)")
+    return int(float(m.group(1)) * {"": 1, "k": 1_000, "m": 1_000_000}[m.group(2)])
+
+
+def scale_name(n_deals: int) -> str:
+    for name, n in SCALES.items():
+        if n == n_deals:
+            return name
+    return str(n_deals)
+
+
+@dataclass
+class CrmDataset:
+    """Column arrays per table; foreign keys are row positions in the referenced table."""
+    n_deals: int
+    today: dt.date
+    seed: int
+    accounts: Dict[str, np.ndarray]
+    users: Dict[str, np.ndarray]
+    contacts: Dict[str, np.ndarray]
+    deals: Dict[str, np.ndarray]
+    activities: Dict[str, np.ndarray]
+    _names: Dict[str, List[str]] = field(default_factory=dict, repr=False)
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        return {table: len(next(iter(getattr(self, table).values())))
+                for table in ("accounts", "users", "contacts", "deals", "activities")}
+
+    def account_names(self) -> List[str]:
+        """One string per account (built once and shared by every row that returns it)."""
+        if "account" not in self._names:
+            first, second = _ACCOUNT_WORDS
+            self._names["account"] = [f"{first[i % 12]} {second[i // 12 % 12]} {i}"
+                                      for i in range(len(self.accounts["industry"]))]
+        return self._names["account"]
+
+    def user_names(self) -> List[str]:
+        if "user" not in self._names:
+            first, last = _PEOPLE
+            self._names["user"] = [f"{first[i % 10]} {last[i // 10 % 10]} {i}"
+                                   for i in range(len(self.users["team"]))]
+        return self._names["user"]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for table in (self.accounts, self.users, self.contacts, self.deals, self.activities)
+                   for a in table.values())
+
+
+def generate_crm(n_deals: int, seed: int = 0, today: Optional[dt.date] = None) -> CrmDataset:
+    """A CRM with `n_deals` deals, deterministic for a given `seed` and `today`."""
+    rng = np.random.default_rng(seed)
+    today = today or dt.date.today()
+    n_accounts = max(12, n_deals // 8)
+    n_users = max(6, n_deals // 2_000)
+    n_contacts = 3 * n_accounts
+    day0 = np.datetime64(today, "D")
+
+    accounts = {"industry": rng.integers(0, len(INDUSTRIES), n_accounts, dtype=np.int8),
+                "region": rng.integers(0, len(REGIONS), n_accounts, dtype=np.int8)}
+    users = {"team": rng.integers(0, len(TEAMS), n_users, dtype=np.int8),
+             "region": rng.integers(0, len(REGIONS), n_users, dtype=np.int8)}
+    contacts = {"account": rng.integers(0, n_accounts, n_contacts, dtype=np.int32),
+                "role": rng.choice(len(ROLES), n_contacts, p=ROLE_WEIGHTS).astype(np.int8)}
+
+    stage = rng.choice(len(STAGES), n_deals, p=STAGE_WEIGHTS).astype(np.int8)
+    created = day0 - rng.integers(0, HISTORY_DAYS, n_deals).astype("timedelta64[D]")
+    close = created + rng.integers(14, 180, n_deals).astype("timedelta64[D]")
+    close[OPEN_STAGES[stage]] = np.datetime64("NaT")
+    deals = {"account": rng.integers(0, n_accounts, n_deals, dtype=np.int32),
+             "owner": rng.integers(0, n_users, n_deals, dtype=np.int32),
+             "name": rng.integers(0, len(DEAL_NAMES), n_deals, dtype=np.int8),
+             "amount": np.round(rng.lognormal(np.log(15_000), 0.8, n_deals), -2),
+             "stage": stage,
+             "created_date": created,
+             "close_date": close,
+             "source": rng.integers(0, len(SOURCES), n_deals, dtype=np.int8),
+             "is_commit": rng.random(n_deals) < 0.2}
+
+    # Activities fall between the deal's creation and today; 40% carry a next step
+    deal = np.repeat(np.arange(n_deals, dtype=np.int32), rng.poisson(2.5, n_deals))
+    age = (day0 - created[deal]).astype(np.int64)
+    date = created[deal] + (rng.random(len(deal)) * (age + 1)).astype("timedelta64[D]")
+    next_step = date + rng.integers(1, 30, len(deal)).astype("timedelta64[D]")
+    next_step[rng.random(len(deal)) >= 0.4] = np.datetime64("NaT")
+    activities = {"deal": deal,
+                  "type": rng.choice(len(ACTIVITY_TYPES), len(deal), p=ACTIVITY_WEIGHTS).astype(np.int8),
+                  "date": date,
+                  "next_step_date": next_step}
+    return CrmDataset(n_deals, today, seed, accounts, users, contacts, deals, activities)
+
+
+def _dates(values: np.ndarray) -> np.ndarray:
+    text = np.datetime_as_string(values, unit="D")
+    return np.where(np.isnat(values), "", text)
+
+
+def _ids(prefix: str, start: int, stop: int) -> List[str]:
+    return [f"{prefix}{i}" for i in range(start, stop)]
+
+
+def _lookup(values: List[str], codes: np.ndarray) -> np.ndarray:
+    return np.asarray(values, dtype=object)[codes]
+
+
+def write_csv(ds: CrmDataset, out_dir, chunk_rows: int = 1_000_000) -> Dict[str, int]:
+    """Write accounts/users/contacts/deals/activities.csv in the demo layout; returns rows per file."""
+    import pandas as pd
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    account_names, user_names = np.asarray(ds.account_names(), dtype=object), np.asarray(ds.user_names(), dtype=object)
+    first, last = _PEOPLE
+
+    def accounts(lo, hi):
+        return {"account_id": _ids("AC-", lo, hi), "name": account_names[lo:hi],
+                "industry": _lookup(INDUSTRIES, ds.accounts["industry"][lo:hi]),
+                "region": _lookup(REGIONS, ds.accounts["region"][lo:hi])}
+
+    def users(lo, hi):
+        return {"user_id": _ids("U-", lo, hi), "name": user_names[lo:hi],
+                "team": _lookup(TEAMS, ds.users["team"][lo:hi]),
+                "region": _lookup(REGIONS, ds.users["region"][lo:hi])}
+
+    def contacts(lo, hi):
+        roles = _lookup(ROLES, ds.contacts["role"][lo:hi])
+        names = [f"{first[i % 10]} {last[i // 7 % 10]}" for i in range(lo, hi)]
+        return {"contact_id": _ids("CT-", lo, hi), "account_id": [f"AC-{a}" for a in ds.contacts["account"][lo:hi]],
+                "name": names, "title": [TITLES[r] for r in roles],
+                "email": [f"contact{i}@example.com" for i in range(lo, hi)], "role": roles}
+
+    def deals(lo, hi):
+        d = ds.deals
+        return {"deal_id": _ids("DL-", lo, hi), "account_id": [f"AC-{a}" for a in d["account"][lo:hi]],
+                "name": _lookup(DEAL_NAMES, d["name"][lo:hi]), "amount": d["amount"][lo:hi].astype(np.int64),
+                "stage": _lookup(STAGES, d["stage"][lo:hi]), "created_date": _dates(d["created_date"][lo:hi]),
+                "close_date": _dates(d["close_date"][lo:hi]), "owner_user_id": [f"U-{u}" for u in d["owner"][lo:hi]],
+                "source": _lookup(SOURCES, d["source"][lo:hi]),
+                "is_commit": np.where(d["is_commit"][lo:hi], "true", "false")}
+
+    def activities(lo, hi):
+        a = ds.activities
+        return {"activity_id": _ids("AT-", lo, hi), "deal_id": [f"DL-{d}" for d in a["deal"][lo:hi]],
+                "type": _lookup(ACTIVITY_TYPES, a["type"][lo:hi]), "date": _dates(a["date"][lo:hi]),
+                "next_step_date": _dates(a["next_step_date"][lo:hi])}
+
+    written = {}
+    for name, columns in (("accounts", accounts), ("users", users), ("contacts", contacts),
+                          ("deals", deals), ("activities", activities)):
+        rows = ds.counts[name]
+        with open(out / f"{name}.csv", "w", newline="") as f:
+            for lo in range(0, max(rows, 1), chunk_rows):
+                pd.DataFrame(columns(lo, min(rows, lo + chunk_rows))).to_csv(f, header=lo == 0, index=False)
+        written[f"{name}.csv"] = rows
+    return written
@@ -0,0 +1,72 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+End-to-end benchmarks: question → Cypher → executor → DataFrame at a given data scale.
+
+For each scale a synthetic CRM is generated (`datagen.generate_crm`) and handed to the
+executor, then every template question runs through `AiviaEngine.run()` once to warm up
+(its total is reported as `cold_ms`) and `repeat` more times. Per question the report
+holds the row count, the template parameters and percentiles (ms) of every stage in
+`debug["timing"]` (`match`, `build`, `execute`, `frame`, `total` and the executor's
+`server_available`).
+"""
+from typing import Any, Dict, List, Optional, Sequence
+import gc
+import time
+from ..indexes import TEMPLATE_QUESTIONS
+from ..run_query import AiviaEngine
+from .datagen import generate_crm, parse_scale, scale_name
+from .executors import Executor
+from .report import summarize
+
+STAGES = ("match_s", "build_s", "execute_s", "frame_s", "server_available_s", "total_s")
+
+
+def run_question(engine: AiviaEngine, question: str, repeat: int) -> Dict[str, Any]:
+    cypher, df, debug = engine.run(question)
+    result = {"question": question, "rows": len(df), "params": debug["params"],
+              "cold_ms": round(debug["timing"]["total_s"] * 1e3, 3)}
+    del df
+    timings = []
+    for _ in range(repeat):
+        _, df, debug = engine.run(question)
+        timings.append(debug["timing"])
+        del df
+    result["stages"] = {stage[:-2]: summarize((t[stage] for t in timings if stage in t), scale=1e3)
+                        for stage in STAGES}
+    return result
+
+
+def run_scale(executor: Executor, n_deals: int, questions: Dict[str, str], repeat: int = 5, seed: int = 0,
+              log=print) -> Dict[str, Any]:
+    label = scale_name(n_deals)
+    run: Dict[str, Any] = {"executor": executor.name, "scale": label, "deals": n_deals,
+                           "native_dates": executor.native_dates}
+    dataset = None
+    if executor.needs_dataset:
+        t0 = time.perf_counter()
+        dataset = generate_crm(n_deals, seed=seed)
+        run["generate_s"] = round(time.perf_counter() - t0, 3)
+        run["rows"] = dataset.counts
+        log(f"[BENCH] e2e {executor.name} {label}: generated {dataset.counts} in {run['generate_s']:.2f} s")
+    run["prepare"] = executor.prepare(dataset)
+    del dataset  # the executor keeps what it needs
+
+    engine = AiviaEngine(executor.driver, native_dates=executor.native_dates)
+    run["questions"] = {}
+    for name, question in questions.items():
+        result = run["questions"][name] = run_question(engine, question, repeat)
+        total, execute = result["stages"]["total"], result["stages"]["execute"]
+        log(f"[BENCH] e2e {executor.name} {label} {name:<22} rows={result['rows']:<9,} "
+            f"total p50 {total['p50']:10.2f} ms  p95 {total['p95']:10.2f} ms  "
+            f"(execute p50 {execute['p50']:.2f} ms, cold {result['cold_ms']:.1f} ms)")
+    executor.close()
+    gc.collect()
+    return run
+
+
+def run_e2e(executor: Executor, scales: Sequence, questions: Optional[Dict[str, str]] = None, repeat: int = 5,
+            seed: int = 0, log=print) -> List[Dict[str, Any]]:
+    """One report entry per scale ('10k', '1m', '10m' or a deal count), smallest first."""
+    questions = questions or dict(TEMPLATE_QUESTIONS)
+    return [run_scale(executor, n, questions, repeat=repeat, seed=seed, log=log)
+            for n in sorted(parse_scale(s) for s in scales)]
@@ -0,0 +1,316 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Where end-to-end benchmarks send their Cypher.
+
+An executor prepares a graph for a `CrmDataset` and exposes a driver that `AiviaEngine`
+runs against:
+
+- `neo4j`: a real server (`AIVIA_NEO4J_*`). The dataset is written as CSVs, bulk-loaded
+  with `aivia.loader` and the template indexes from `aivia.indexes` are applied, so load
+  time and query latency are measured on the real storage engine.
+- `inprocess`: no server. A stand-in driver evaluates each `_build_cypher` template with
+  numpy over the dataset's arrays and returns the same columns, row multiplicity and
+  order as the Cypher would, so matching, planning, record transfer and frame building
+  run at full scale on a laptop or in CI.
+
+Other executors plug in as `module:Class` (`python -m aivia.bench run --executor
+mypkg.bench:DuckExecutor`); subclass `Executor` and implement `prepare()` / `driver`.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import datetime as dt
+import importlib
+import shutil
+import tempfile
+import time
+from types import SimpleNamespace
+import numpy as np
+from .datagen import CrmDataset, DEAL_NAMES, OPEN_STAGES, ROLES, STAGES, write_csv
+
+
+class Executor:
+    """Base class: `prepare(dataset)` builds the graph, `driver` serves `session()` to the engine."""
+
+    name = "executor"
+    needs_dataset = True  # False: prepare() is called with None and benchmarks an existing graph
+
+    def __init__(self, native_dates: bool = False):
+        self.native_dates = native_dates
+
+    @property
+    def driver(self):
+        raise NotImplementedError
+
+    def prepare(self, dataset: Optional[CrmDataset]) -> Dict[str, Any]:
+        """Make `dataset` queryable; returns load statistics for the report."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+# ----------------- in-process stand-in -----------------
+
+# Template name (as in aivia.indexes.TEMPLATE_QUESTIONS) → a line only that template emits
+TEMPLATE_MARKERS: Tuple[Tuple[str, str], ...] = (
+    ("no_next_meeting", "act2.next_step_date"),
+    ("commit_missing_roles", "c_fin IS NULL OR c_sec IS NULL"),
+    ("stale_evaluate", 'd.stage = "Evaluate"'),
+    ("open_deals", "d.amount AS amount, d.stage AS stage\nORDER BY amount DESC"),
+)
+
+
+def template_name(cypher: str) -> Optional[str]:
+    for name, marker in TEMPLATE_MARKERS:
+        if marker in cypher:
+            return name
+    return None
+
+
+class CrmStandIn:
+    """The query templates over a `CrmDataset`, with Cypher semantics (NULLs, multiplicity, order)."""
+
+    def __init__(self, ds: CrmDataset):
+        self.ds = ds
+        self.today = np.datetime64(ds.today, "D")
+        self.open = OPEN_STAGES[ds.deals["stage"]]
+        roles = ds.contacts["role"]
+        n_accounts = ds.counts["accounts"]
+        self.n_finance = np.bincount(ds.contacts["account"][roles == ROLES.index("Finance")], minlength=n_accounts)
+        self.n_security = np.bincount(ds.contacts["account"][roles == ROLES.index("Security")], minlength=n_accounts)
+        self.evaluators: Dict[str, Callable[[Dict[str, Any]], Tuple[List[str], List[tuple]]]] = {
+            "no_next_meeting": self.no_next_meeting,
+            "commit_missing_roles": self.commit_missing_roles,
+            "stale_evaluate": self.stale_evaluate,
+            "open_deals": self.open_deals,
+        }
+
+    def run(self, cypher: str, params: Dict[str, Any]) -> Tuple[List[str], List[tuple]]:
+        name = template_name(cypher)
+        if name is None:
+            raise NotImplementedError("the in-process stand-in has no evaluator for this Cypher "
+                                      "(add one to CrmStandIn or use --executor neo4j):\n" + cypher)
+        return self.evaluators[name](params)
+
+    def _days(self, n) -> np.timedelta64:
+        return np.timedelta64(int(n), "D")
+
+    def _deal_columns(self, idx: np.ndarray, *names: str) -> List[list]:
+        d = self.ds.deals
+        account_names = self.ds.account_names()
+        columns = {
+            "account": lambda: [account_names[a] for a in d["account"][idx].tolist()],
+            "deal_id": lambda: [f"DL-{i}" for i in idx.tolist()],
+            "deal": lambda: [DEAL_NAMES[n] for n in d["name"][idx].tolist()],
+            "amount": lambda: d["amount"][idx].tolist(),
+            "stage": lambda: [STAGES[s] for s in d["stage"][idx].tolist()],
+            "created": lambda: np.datetime_as_string(d["created_date"][idx], unit="D").tolist(),
+            "owner": lambda: [self.ds.user_names()[u] for u in d["owner"][idx].tolist()],
+        }
+        return [columns[name]() for name in names]
+
+    def _rows(self, idx: np.ndarray, names: Tuple[str, ...]) -> Tuple[List[str], List[tuple]]:
+        return list(names), list(zip(*self._deal_columns(idx, *names)))
+
+    def _deals_with_activity(self, mask: np.ndarray) -> np.ndarray:
+        """Per deal: does any activity satisfy `mask` (the NOT EXISTS subqueries)."""
+        found = np.zeros(self.ds.n_deals, dtype=bool)
+        found[self.ds.activities["deal"][mask]] = True
+        return found
+
+    def no_next_meeting(self, params):
+        d, a = self.ds.deals, self.ds.activities
+        upcoming = self._deals_with_activity(a["next_step_date"] <= self.today + self._days(params["next_days"]))
+        idx = np.flatnonzero(self.open & (d["amount"] > params["amount"])
+                             & (d["created_date"] >= self.today - self._days(params["window_days"])) & ~upcoming)
+        idx = idx[np.argsort(-d["amount"][idx], kind="stable")]
+        return self._rows(idx, ("account", "deal_id", "deal", "amount", "stage", "created", "owner"))
+
+    def commit_missing_roles(self, params):
+        d = self.ds.deals
+        q_start = np.datetime64(dt.date(self.ds.today.year, (self.ds.today.month - 1) // 3 * 3 + 1, 1), "D")
+        idx = np.flatnonzero(d["is_commit"] & (d["created_date"] >= q_start) & self.open)
+        account = d["account"][idx]
+        fin, sec = self.n_finance[account], self.n_security[account]
+        keep = (fin == 0) | (sec == 0)
+        idx, account, fin, sec = idx[keep], account[keep], fin[keep], sec[keep]
+        # The two OPTIONAL MATCHes yield one row per matching contact (or one NULL row)
+        repeat = np.maximum(fin, 1) * np.maximum(sec, 1)
+        names = np.asarray(self.ds.account_names(), dtype=object)[account]
+        order = np.argsort(names.astype(str), kind="stable")
+        idx, fin, sec, repeat = idx[order], fin[order], sec[order], repeat[order]
+        gaps = np.where((fin == 0) & (sec == 0), "Missing Finance & Missing Security",
+                        np.where(fin == 0, "Missing Finance", "Missing Security"))
+        idx, gaps = np.repeat(idx, repeat), np.repeat(gaps, repeat)
+        columns = self._deal_columns(idx, "account", "deal_id", "deal") + [gaps.tolist()]
+        return ["account", "deal_id", "deal", "gap"], list(zip(*columns))
+
+    def stale_evaluate(self, params):
+        d, a = self.ds.deals, self.ds.activities
+        recent = self._deals_with_activity(a["date"] >= self.today - self._days(params["recent_days"]))
+        idx = np.flatnonzero((d["stage"] == STAGES.index("Evaluate"))
+                             & (d["created_date"] <= self.today - self._days(params["stale_days"])) & ~recent)
+        idx = idx[np.argsort(d["created_date"][idx], kind="stable")]
+        return self._rows(idx, ("account", "deal_id", "deal", "created"))
+
+    def open_deals(self, params):
+        d = self.ds.deals
+        idx = np.flatnonzero(self.open)
+        idx = idx[np.argsort(-d["amount"][idx], kind="stable")]
+        return self._rows(idx, ("account", "deal_id", "deal", "amount", "stage"))
+
+
+class _StandInResult:
+    """Enough of neo4j.Result for the engine: keys(), iteration, fetch(n), consume()."""
+
+    def __init__(self, columns, rows, seconds):
+        self._keys = columns
+        self._rows = rows
+        self._pos = 0
+        self._summary = SimpleNamespace(result_available_after=seconds * 1e3, result_consumed_after=0)
+
+    def keys(self):
+        return self._keys
+
+    def __iter__(self):
+        rows = self._rows[self._pos:] if self._pos else self._rows
+        self._pos = len(self._rows)
+        return iter(rows)
+
+    def fetch(self, n):
+        batch = self._rows[self._pos:self._pos + n]
+        self._pos += len(batch)
+        return batch
+
+    def consume(self):
+        self._pos = len(self._rows)
+        return self._summary
+
+
+class _StandInSession:
+    def __init__(self, standin: CrmStandIn):
+        self.standin = standin
+
+    def run(self, cypher, parameters=None, **kwargs):
+        t0 = time.perf_counter()
+        columns, rows = self.standin.run(cypher, parameters or {})
+        return _StandInResult(columns, rows, time.perf_counter() - t0)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _StandInDriver:
+    def __init__(self, standin: CrmStandIn):
+        self.standin = standin
+
+    def session(self, **kwargs):
+        return _StandInSession(self.standin)
+
+    def close(self):
+        pass
+
+
+class InProcessExecutor(Executor):
+    """Evaluates the templates in this process; `result_available_after` is the evaluation time."""
+
+    name = "inprocess"
+
+    def __init__(self, native_dates: bool = False):
+        super().__init__(native_dates)
+        self._driver = None
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            raise RuntimeError("call prepare(dataset) first")
+        return self._driver
+
+    def prepare(self, dataset: Optional[CrmDataset]) -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        self._driver = _StandInDriver(CrmStandIn(dataset))
+        return {"prepare_s": round(time.perf_counter() - t0, 3), "dataset_mib": round(dataset.nbytes / 2 ** 20, 1)}
+
+    def close(self) -> None:
+        self._driver = None
+
+
+# ----------------- real Neo4j -----------------
+
+class Neo4jExecutor(Executor):
+    """
+    A Neo4j server from `AIVIA_NEO4J_*` (or `driver=`). With `load=False` the graph already
+    in the database is benchmarked as is and no dataset is generated.
+    """
+
+    name = "neo4j"
+
+    def __init__(self, native_dates: bool = False, driver=None, load: bool = True, data_dir: Optional[str] = None,
+                 batch_size: int = 20_000, apply_indexes: bool = True):
+        super().__init__(native_dates)
+        self._driver = driver
+        self.load = load
+        self.needs_dataset = load
+        self.data_dir = data_dir
+        self.batch_size = batch_size
+        self.apply_indexes = apply_indexes
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            from ..connection import get_driver
+            self._driver = get_driver()
+        return self._driver
+
+    def prepare(self, dataset: Optional[CrmDataset]) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {}
+        if self.load:
+            from ..loader import load_sales_crm_graph
+
+            driver = self.driver  # fail on connection before writing gigabytes of CSV
+            data_dir = self.data_dir or tempfile.mkdtemp(prefix="aivia-bench-")
+            try:
+                t0 = time.perf_counter()
+                write_csv(dataset, data_dir)
+                stats["write_csv_s"] = time.perf_counter() - t0
+                t0 = time.perf_counter()
+                loaded = load_sales_crm_graph(driver, data_dir, batch_size=self.batch_size,
+                                              native_dates=self.native_dates)
+                stats["load_s"] = time.perf_counter() - t0
+                stats["loaded"] = {s.name: {"rows": s.rows, "seconds": s.seconds} for s in loaded}
+            finally:
+                if self.data_dir is None:
+                    shutil.rmtree(data_dir, ignore_errors=True)
+        schema_path = None
+        if self.apply_indexes:
+            from ..pathfinder import default_schema_path
+            schema_path = default_schema_path()
+        if schema_path is not None:
+            from ..indexes import advise, apply, template_cyphers
+            from ..schema_loader import load_schema
+
+            t0 = time.perf_counter()
+            recs = advise(load_schema(schema_path.parent), template_cyphers(native_dates=self.native_dates))
+            created, _ = apply(self.driver, recs)
+            stats["indexes_created"] = created
+            stats["indexes_s"] = time.perf_counter() - t0
+        return stats
+
+
+EXECUTORS = {"inprocess": InProcessExecutor, "neo4j": Neo4jExecutor}
+
+
+def get_executor(name: str, **kwargs) -> Executor:
+    """An executor by registered name (`EXECUTORS`) or `package.module:Class` path."""
+    cls = EXECUTORS.get(name)
+    if cls is None:
+        if ":" not in name:
+            raise ValueError(f"unknown executor {name!r}; use one of {sorted(EXECUTORS)} or module:Class")
+        module, attr = name.split(":", 1)
+        cls = getattr(importlib.import_module(module), attr)
+    return cls(**kwargs)
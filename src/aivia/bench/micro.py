@@ -0,0 +1,139 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Micro-benchmarks for the planning stages, no database involved:
+
+- `match_concepts_adapter`: threshold / role / stage extraction from the question
+- `build_cypher`: `AiviaEngine._build_cypher` from a precomputed match and path
+- `schema_matcher`: `match_labels_and_filters` over the Sales CRM schema (entity tokens →
+  tables → pathfinder joins)
+- `plan`: the whole uncached `AiviaEngine._plan` (normalize, match, path, Cypher)
+
+Each runs over a deterministic corpus of template questions with varied thresholds; every
+call is timed on its own and reported as latency percentiles in µs.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from collections import namedtuple
+import random
+import time
+from ..adapters.matcher_adapter import match_concepts_adapter
+from ..cache import normalize_question
+from ..run_query import AiviaEngine
+from .report import summarize
+
+QUESTION_TEMPLATES = [
+    "open deals > {amount}k last {window} days no next meeting {next} days",
+    "open deals over {amount}k in the past {window} days with no next step in {next} days",
+    "commit deals this quarter missing finance or security",
+    "committed deals with no cfo or security contact",
+    "evaluate stage > {stale} days with no activity in {recent} days",
+    "evaluate stage {stale} days stale",
+    "open deals",
+    "open deals for accounts owned by enterprise reps",
+]
+
+# Entity words → Sales CRM label, for the schema matcher's `clarity_schema` aliases
+LABEL_ALIASES = {
+    "Deal": ["deal", "deals", "opportunity", "pipeline"],
+    "Account": ["account", "accounts", "customer", "company"],
+    "Activity": ["activity", "activities", "meeting", "next step", "call"],
+    "User": ["owner", "owned", "rep", "reps", "user"],
+    "Contact": ["contact", "finance", "cfo", "security", "buyer"],
+}
+
+Entity = namedtuple("Entity", "mention type")
+
+
+def question_corpus(n: int = 200, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return [rng.choice(QUESTION_TEMPLATES).format(amount=rng.choice([5, 10, 25, 50]), window=rng.choice([30, 60, 90]),
+                                                  next=rng.choice([7, 14, 30]), stale=rng.choice([21, 30, 45]),
+                                                  recent=rng.choice([7, 14]))
+            for _ in range(n)]
+
+
+def crm_clarity_schema(schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    The Sales CRM labels in the matcher's `clarity_schema` shape (tables with aliases/columns),
+    with the schema's edges so the pathfinder can join them.
+    """
+    if schema is None:
+        from ..pathfinder import default_schema_path
+        from ..schema_loader import load_schema
+        path = default_schema_path()
+        schema = load_schema(path.parent) if path else {"labels": {label: {} for label in LABEL_ALIASES}}
+    return {"tables": {label: {"aliases": LABEL_ALIASES.get(label, [label.lower()]), "primary_key": "id",
+                               "columns": [{"name": p} for p in (spec or {}).get("properties", [])]}
+                       for label, spec in schema.get("labels", {}).items()},
+            "edges": schema.get("edges", [])}
+
+
+def question_entities(question: str) -> List[Entity]:
+    """Entity mentions the way an upstream extractor would tag them: alias words in the question."""
+    q = question.lower()
+    return [Entity(alias, "entity") for aliases in LABEL_ALIASES.values() for alias in aliases
+            if f" {alias} " in f" {q} "]
+
+
+def check_reachable(schema: Dict[str, Any], inputs: Sequence[Tuple[str, List[Entity]]],
+                    root: str = "Deal") -> None:
+    """Raise if any entity label in `inputs` has no join path from `root` in `schema`."""
+    from ..pathfinder import get_pathfinder_engine
+    engine = get_pathfinder_engine(schema=schema)
+    for question, entities in inputs:
+        mentions = {e.mention for e in entities}
+        labels = [label for label, aliases in LABEL_ALIASES.items() if label != root and mentions & set(aliases)]
+        unreachable = engine.complete_path(root, labels).unreachable
+        if unreachable:
+            raise ValueError(f"No join path from {root} to {unreachable} for {question!r}")
+
+
+def measure(fn: Callable, inputs: Sequence[Tuple], repeat: int = 5, warmup: int = 1) -> Dict[str, Any]:
+    """Time `fn(*args)` per call over `inputs`, `repeat` passes after `warmup`; µs percentiles."""
+    for _ in range(warmup):
+        for args in inputs:
+            fn(*args)
+    samples = []
+    clock = time.perf_counter
+    for _ in range(repeat):
+        for args in inputs:
+            t0 = clock()
+            fn(*args)
+            samples.append(clock() - t0)
+    stats = summarize(samples, scale=1e6)
+    stats["ops_per_s"] = round(len(samples) / sum(samples)) if samples else 0
+    return stats
+
+
+def micro_cases(corpus: Sequence[str]) -> Dict[str, Tuple[Callable, List[Tuple]]]:
+    """name → (function, argument tuples), prepared outside the timed region."""
+    from ..matching._real_label_and_filter_matcher import match_labels_and_filters
+
+    engine = AiviaEngine(None)
+    normalized = [normalize_question(q) for q in corpus]
+    planned = [(q, m, engine._resolve_path(m)) for q, m in ((q, engine._match_concepts(q, 8)) for q in normalized)]
+    schema = crm_clarity_schema()
+
+    def schema_matcher(question, entities):
+        return match_labels_and_filters(question=question, target_row_grain="Deal", entities=entities,
+                                        filters=[], faiss_config=None, clarity_schema=schema)
+
+    with_entities = [(q, ents) for q, ents in ((q, question_entities(q)) for q in normalized) if ents]
+    check_reachable(schema, with_entities)
+    return {
+        "match_concepts_adapter": (match_concepts_adapter, [(q,) for q in normalized]),
+        "build_cypher": (engine._build_cypher, planned),
+        "schema_matcher": (schema_matcher, with_entities),
+        "plan": (lambda q: engine._plan(q, 8), [(q,) for q in corpus]),
+    }
+
+
+def run_micro(n_questions: int = 200, repeat: int = 5, seed: int = 0, only: Optional[Sequence[str]] = None,
+              log=print) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for name, (fn, inputs) in micro_cases(question_corpus(n_questions, seed)).items():
+        if only and name not in only:
+            continue
+        results[name] = stats = measure(fn, inputs, repeat=repeat)
+        log(f"[BENCH] micro {name:<24} p50 {stats['p50']:9.2f} µs  p95 {stats['p95']:9.2f} µs  "
+            f"({stats['ops_per_s']:,} ops/s, {stats['n']} calls)")
+    return results
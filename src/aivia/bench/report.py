@@ -0,0 +1,124 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Benchmark report: summary statistics, run environment, JSON output and regression checks.
+
+A report is one JSON document (`SCHEMA_VERSION`) with the environment, the run settings,
+`micro` (per benchmark: calls and latency percentiles in µs) and `e2e` (per executor and
+scale: generation/load statistics and per question the row count plus per-stage latency
+percentiles in ms). `compare()` lines two reports up on their median latencies, so a CI
+job can keep the last release's report and fail on regressions:
+
+    python -m aivia.bench run --json bench.json --baseline bench-0.1.0.json --tolerance 0.25
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import datetime as dt
+import importlib.metadata
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+from pathlib import Path
+
+SCHEMA_VERSION = 1
+
+
+def summarize(samples: Iterable[float], scale: float = 1.0, digits: int = 3) -> Dict[str, float]:
+    """n, min, mean, p50, p95, max of `samples` × `scale` (nearest-rank percentiles)."""
+    values = sorted(s * scale for s in samples)
+    if not values:
+        return {"n": 0}
+
+    def rank(p):
+        return values[max(0, math.ceil(p * len(values)) - 1)]
+
+    return {"n": len(values), "min": round(values[0], digits), "mean": round(sum(values) / len(values), digits),
+            "p50": round(rank(0.50), digits), "p95": round(rank(0.95), digits), "max": round(values[-1], digits)}
+
+
+def _version(package: str) -> Optional[str]:
+    try:
+        return importlib.metadata.version(package)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).resolve().parent,
+                             capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "aivia": _version("aivia"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "packages": {name: _version(name) for name in ("neo4j", "numpy", "pandas", "faiss-cpu")},
+    }
+
+
+def new_report(settings: Dict[str, Any]) -> Dict[str, Any]:
+    return {"schema_version": SCHEMA_VERSION,
+            "created": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+            "environment": environment(), "settings": settings, "micro": {}, "e2e": []}
+
+
+def write_report(report: Dict[str, Any], path: str) -> None:
+    """Write to `path`, or to stdout for "-"."""
+    text = json.dumps(report, indent=2, default=str)
+    if path == "-":
+        sys.stdout.write(text + "\n")
+    else:
+        Path(path).write_text(text + "\n", encoding="utf-8")
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    report = json.loads(Path(path).read_text(encoding="utf-8"))
+    if report.get("schema_version") != SCHEMA_VERSION:
+        raise ValueError(f"{path}: report schema {report.get('schema_version')!r}, expected {SCHEMA_VERSION}")
+    return report
+
+
+def medians(report: Dict[str, Any]) -> Dict[str, float]:
+    """Comparable metric → median latency: `micro/<name>` in µs, `e2e/<executor>/<scale>/<question>` (total) in ms."""
+    out = {f"micro/{name}": stats["p50"] for name, stats in report.get("micro", {}).items() if stats.get("n")}
+    for run in report.get("e2e", []):
+        for question, result in run.get("questions", {}).items():
+            total = result.get("stages", {}).get("total", {})
+            if total.get("n"):
+                executor = run["executor"] + ("+native-dates" if run.get("native_dates") else "")
+                out[f"e2e/{executor}/{run['scale']}/{question}"] = total["p50"]
+    return out
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.25
+            ) -> Tuple[List[Tuple[str, float, float, float]], List[str]]:
+    """
+    (rows, regressions): a row (metric, baseline, current, ratio) for every metric in both
+    reports, and the metrics whose median grew by more than `tolerance` (0.25 = 25%).
+    """
+    old, new = medians(baseline), medians(current)
+    rows, regressions = [], []
+    for metric in sorted(old.keys() & new.keys()):
+        ratio = new[metric] / old[metric] if old[metric] else math.inf
+        rows.append((metric, old[metric], new[metric], ratio))
+        if ratio > 1 + tolerance:
+            regressions.append(metric)
+    return rows, regressions
+
+
+def print_comparison(rows, regressions, tolerance: float, out=sys.stdout) -> None:
+    for metric, old, new, ratio in rows:
+        flag = "  REGRESSION" if metric in regressions else ""
+        print(f"[BENCH] {metric:<58} {old:11.3f} → {new:11.3f}  {ratio:5.2f}x{flag}", file=out)
+    print(f"[BENCH] {len(rows)} metrics compared, {len(regressions)} slower than baseline by more than "
+          f"{tolerance:.0%}", file=out)
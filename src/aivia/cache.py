@@ -0,0 +1,225 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Caches for the NL→Cypher pipeline.
+
+- `normalize_question` canonicalizes wording and amounts so trivially different questions share a plan.
+- `PlanCache` memoizes (match, path, cypher) per normalized question, LRU + optional TTL,
+  and drops everything when the watched schema YAML changes.
+- `ResultCache` memoizes query results per (cypher, params, date bucket) within a byte budget;
+  graph writers call `notify_graph_write()` to invalidate it.
+"""
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+from collections import OrderedDict
+import copy
+import datetime as dt
+import os
+import re
+import threading
+import time
+import weakref
+
+_WS = re.compile(r"\s+")
+# A number with what makes it an amount: a "$" or comparison cue before it ("over $10,000"),
+# a k/thousand suffix ("10K", "10 thousand") or digit grouping ("10,000"). A time unit after
+# it ("2000 days") makes it a duration instead.
+_NUMBER = re.compile(
+    r"(?P<cue>\$\s*|\b(?:over|above|under|below|exceeding|(?:greater|more|less) than|at (?:least|most))\s+\$?\s*)?"
+    r"(?<![\d.,])(?P<digits>\d{1,3}(?:,\d{3})+|\d+)(?![\d.])"
+    r"(?P<suffix>\s*(?:k|thousand)\b)?(?P<unit>\s*(?:days?|weeks?|months?|years?)\b)?")
+
+
+def _canonical_number(m: "re.Match") -> str:
+    cue, digits, suffix = m.group("cue") or "", m.group("digits"), m.group("suffix")
+    if m.group("unit") or not (cue or suffix or "," in digits):
+        return m.group(0)  # a duration or a bare number (e.g. "07" in a date): keep as written
+    n = int(digits.replace(",", "")) * (1000 if suffix else 1)
+    return cue + (f"{n // 1000}k" if n >= 1000 and n % 1000 == 0 else str(n))
+
+
+def normalize_question(question: str) -> str:
+    """
+    Canonical form of a question: lowercased, whitespace collapsed, and amounts rewritten
+    so "10k", "10K", "10,000", "over 10000" and "10 thousand" all read "10k". Only amounts
+    are folded: durations ("2000 days") and bare numbers are kept as written, because the
+    matcher reads them as they are.
+    """
+    q = _WS.sub(" ", question.lower()).strip()
+    return _NUMBER.sub(_canonical_number, q)
+
+
+def query_key(cypher: str, params: Optional[Dict[str, Any]] = None) -> Hashable:
+    """Hashable identity of a parameterized query (Cypher text + parameter values)."""
+    return cypher, tuple(sorted((params or {}).items()))
+
+
+def _file_fingerprint(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class PlanCache:
+    """
+    Thread-safe LRU cache of query plans with optional TTL.
+
+    Args:
+        maxsize: max number of plans kept (least recently used are evicted).
+        ttl: seconds a plan stays valid, or None for no expiry.
+        schema_path: schema YAML to watch; any change to it clears the cache.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None, schema_path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.schema_path = schema_path
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._schema_fp = _file_fingerprint(schema_path) if schema_path else None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            self._check_schema()
+            entry = self._data.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._data[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def put(self, key: Hashable, plan: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic(), copy.deepcopy(plan))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Drop every cached plan (call after editing the schema or matcher config)."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+    def _check_schema(self) -> None:
+        if self.schema_path is None:
+            return
+        fp = _file_fingerprint(self.schema_path)
+        if fp != self._schema_fp:
+            self._schema_fp = fp
+            self._data.clear()
+
+
+# Every live ResultCache, so graph writers can invalidate them without holding references
+_RESULT_CACHES: "weakref.WeakSet[ResultCache]" = weakref.WeakSet()
+
+
+def notify_graph_write(labels: Optional[Iterable[str]] = None) -> None:
+    """
+    Invalidate cached results after the graph changed.
+
+    Loaders call this once their write transactions commit. With `labels`, only results
+    whose Cypher touches one of those labels are dropped; otherwise everything is.
+    """
+    labels = list(labels) if labels is not None else None
+    for cache in list(_RESULT_CACHES):
+        cache.invalidate(labels)
+
+
+def _frame_nbytes(df) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of query results (DataFrames) bounded by memory, keyed by
+    Cypher text plus parameter values.
+
+    Generated Cypher anchors on `date(localdatetime())`, so a result is only reused within
+    the same date bucket; when the bucket rolls over the cache empties itself.
+
+    Args:
+        max_bytes: memory budget for cached frames (estimated with `memory_usage(deep=True)`).
+        ttl: seconds a result stays valid, or None to keep it for the whole bucket.
+        bucket: callable returning the current date bucket (defaults to today's date).
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, ttl: Optional[float] = None,
+                 bucket: Callable[[], Hashable] = dt.date.today):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bucket = bucket
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._bucket = None
+        self._lock = threading.Lock()
+        _RESULT_CACHES.add(self)
+
+    def get(self, cypher: str, params: Optional[Dict[str, Any]] = None):
+        key = query_key(cypher, params)
+        with self._lock:
+            self._roll_bucket()
+            entry = self._data.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[2].copy()
+
+    def put(self, cypher: str, df, params: Optional[Dict[str, Any]] = None) -> None:
+        nbytes = _frame_nbytes(df)
+        if nbytes > self.max_bytes:
+            return  # never evict everything for one oversized result
+        key = query_key(cypher, params)
+        with self._lock:
+            self._roll_bucket()
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (time.monotonic(), nbytes, df.copy())
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                self._drop(next(iter(self._data)))
+
+    def invalidate(self, labels: Optional[Iterable[str]] = None) -> None:
+        """Drop all results, or only those whose Cypher mentions one of `labels`."""
+        with self._lock:
+            if labels is None:
+                self._data.clear()
+                self.nbytes = 0
+                return
+            needles = [f":{label}" for label in labels]
+            for key in [k for k in self._data if any(n in k[0] for n in needles)]:
+                self._drop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data),
+                    "nbytes": self.nbytes, "max_bytes": self.max_bytes}
+
+    def _roll_bucket(self) -> None:
+        bucket = self.bucket()
+        if bucket != self._bucket:
+            self._bucket = bucket
+            self._data.clear()
+            self.nbytes = 0
+
+    def _drop(self, key: Hashable) -> None:
+        _, nbytes, _ = self._data.pop(key)
+        self.nbytes -= nbytes
@@ -0,0 +1,101 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Client side of `aivia serve` (see `aivia.server`): finds the server and forwards questions.
+
+Only `socket` and `json` are imported here (no `http.client`/`http.server`, neo4j or
+pandas), because the CLI imports this module on every invocation.
+
+    reply = forward("open deals >10k")   # None when no server is listening
+"""
+from typing import Any, Dict, Optional, Tuple
+import json
+import os
+import socket
+import tempfile
+
+DEFAULT_PORT = 8765
+CONNECT_TIMEOUT_S = 0.5  # a missing/dead server must not slow the in-process fallback down
+
+
+class ServerError(RuntimeError):
+    """The server was reached but could not answer the question."""
+
+
+def server_address(address: Optional[str] = None) -> str:
+    """`address`, else $AIVIA_SERVER, else a per-user Unix socket in the temp dir (TCP on Windows)."""
+    address = address or os.getenv("AIVIA_SERVER")
+    if address:
+        return address
+    if hasattr(socket, "AF_UNIX"):
+        return os.path.join(tempfile.gettempdir(), f"aivia-{getattr(os, 'getuid', lambda: 'user')()}.sock")
+    return f"http://127.0.0.1:{DEFAULT_PORT}"
+
+
+def host_port(address: str) -> Tuple[str, int]:
+    host, _, port = address[len("http://"):].rstrip("/").rpartition(":")
+    return host or "127.0.0.1", int(port or DEFAULT_PORT)
+
+
+def connect(address: str) -> Optional[socket.socket]:
+    """A connected socket to the server, or None if nothing is listening at `address`."""
+    try:
+        if address.startswith("http://"):
+            sock = socket.create_connection(host_port(address), timeout=CONNECT_TIMEOUT_S)
+        else:
+            if not os.path.exists(address):
+                return None
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(CONNECT_TIMEOUT_S)
+            try:
+                sock.connect(address)
+            except OSError:
+                sock.close()
+                raise
+    except OSError:
+        return None
+    sock.settimeout(None)  # connected: queries may take as long as the graph needs
+    return sock
+
+
+def request(address: str, method: str, path: str, payload: Optional[Dict[str, Any]] = None
+            ) -> Optional[Dict[str, Any]]:
+    """
+    One JSON request/response (HTTP/1.1, `Connection: close`); None if no server is
+    listening, ServerError if it answered with an error. Written against a plain socket:
+    `http.client` alone would add ~40 ms of imports to every CLI call.
+    """
+    sock = connect(address)
+    if sock is None:
+        return None
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    head = (f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n")
+    chunks = []
+    with sock:
+        sock.sendall(head.encode("ascii") + body)
+        while True:
+            chunk = sock.recv(1 << 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    header, _, content = b"".join(chunks).partition(b"\r\n\r\n")
+    status_line = header.split(b"\r\n", 1)[0].split()
+    status = int(status_line[1]) if len(status_line) > 1 else 0
+    try:
+        reply = json.loads(content or b"{}")
+    except ValueError:
+        reply = {}
+    if status != 200:
+        raise ServerError(reply.get("error") or f"HTTP {status or 'response malformed'}")
+    return reply
+
+
+def forward(question: str, top_k: int = 8, pool: bool = False, address: Optional[str] = None
+            ) -> Optional[Dict[str, Any]]:
+    """
+    Answer `question` on a running server; None when forwarding is disabled
+    (`AIVIA_NO_SERVER=1`) or no server is listening, so the caller runs it in-process.
+    """
+    if os.getenv("AIVIA_NO_SERVER") == "1":
+        return None
+    return request(server_address(address), "POST", "/query", {"question": question, "top_k": top_k, "pool": pool})
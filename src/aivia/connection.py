@@ -0,0 +1,291 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Driver registry: one pooled, pre-warmed Neo4j driver (and one shared engine) per process.
+
+Pool settings come from the environment (optionally on top of a YAML file named by
+`AIVIA_CONFIG`, section `neo4j:`); every key below is also a `DriverConfig` field:
+
+    AIVIA_NEO4J_URI / _USER / _PASS / _DATABASE
+    AIVIA_NEO4J_MAX_POOL_SIZE            max Bolt connections (default 100)
+    AIVIA_NEO4J_ACQUISITION_TIMEOUT      seconds to wait for a free connection (default 60)
+    AIVIA_NEO4J_MAX_LIFETIME             seconds before a connection is recycled (default 3600)
+    AIVIA_NEO4J_KEEP_ALIVE               TCP keep-alive, 1/0 (default 1)
+    AIVIA_NEO4J_LIVENESS_CHECK_TIMEOUT   idle seconds before a connection is pinged on checkout
+    AIVIA_NEO4J_WARM_CONNECTIONS         connections opened eagerly by `warm_up` (default 1)
+
+    from aivia.connection import get_engine
+    cypher, df, debug = get_engine().run("open deals > 10k")
+
+`get_driver()` returns a `ManagedDriver`: the neo4j driver plus session accounting, so
+`metrics()` can report how close the pool is to saturation.
+"""
+from typing import Any, Dict, Hashable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+import atexit
+import logging
+import os
+import threading
+import time
+
+_log = logging.getLogger(__name__)
+
+
+@dataclass
+class DriverConfig:
+    uri: str = "bolt://localhost:7687"
+    user: str = "neo4j"
+    password: str = "password"
+    database: Optional[str] = None
+    max_pool_size: int = 100
+    acquisition_timeout: float = 60.0
+    max_lifetime: float = 3600.0
+    keep_alive: bool = True
+    liveness_check_timeout: Optional[float] = None
+    warm_connections: int = 1
+
+    _ENV = {
+        "uri": "URI", "user": "USER", "password": "PASS", "database": "DATABASE",
+        "max_pool_size": "MAX_POOL_SIZE", "acquisition_timeout": "ACQUISITION_TIMEOUT",
+        "max_lifetime": "MAX_LIFETIME", "keep_alive": "KEEP_ALIVE",
+        "liveness_check_timeout": "LIVENESS_CHECK_TIMEOUT", "warm_connections": "WARM_CONNECTIONS",
+    }
+
+    @classmethod
+    def from_env(cls, prefix: str = "AIVIA_NEO4J_", config_path: Optional[str] = None) -> "DriverConfig":
+        """Defaults ← YAML file (`config_path` or $AIVIA_CONFIG, section `neo4j`) ← environment."""
+        values: Dict[str, Any] = {}
+        config_path = config_path or os.getenv("AIVIA_CONFIG")
+        if config_path:
+            import yaml
+            with open(config_path, encoding="utf-8") as f:
+                values.update((yaml.safe_load(f) or {}).get("neo4j") or {})
+        for name, suffix in cls._ENV.items():
+            if os.getenv(prefix + suffix) is not None:
+                values[name] = os.environ[prefix + suffix]
+
+        config = cls()
+        for f in fields(cls):
+            if f.name not in values:
+                continue
+            raw, default = values[f.name], getattr(config, f.name)
+            if isinstance(default, bool):
+                value = raw if isinstance(raw, bool) else str(raw).strip().lower() in {"1", "true", "yes", "on"}
+            elif isinstance(default, (int, float)) and not isinstance(raw, (int, float)):
+                value = type(default)(raw)
+            elif f.name == "liveness_check_timeout" and raw is not None:
+                value = float(raw)
+            else:
+                value = raw
+            setattr(config, f.name, value)
+        return config
+
+    def driver_kwargs(self) -> Dict[str, Any]:
+        kwargs = {
+            "auth": (self.user, self.password),
+            "max_connection_pool_size": self.max_pool_size,
+            "connection_acquisition_timeout": self.acquisition_timeout,
+            "max_connection_lifetime": self.max_lifetime,
+            "keep_alive": self.keep_alive,
+        }
+        if self.liveness_check_timeout is not None:
+            kwargs["liveness_check_timeout"] = self.liveness_check_timeout
+        return kwargs
+
+
+class _TrackedSession:
+    """Session proxy that keeps the owning ManagedDriver's in-use and acquisition-timeout counts accurate."""
+
+    def __init__(self, owner: "ManagedDriver", session):
+        self._owner = owner
+        self._session = session
+        self._closed = False
+
+    def _acquiring(self, method, *args, **kwargs):
+        """Call a session method that takes a pooled connection, counting acquisition timeouts."""
+        try:
+            return method(*args, **kwargs)
+        except Exception as exc:
+            from neo4j.exceptions import ConnectionAcquisitionTimeoutError
+            if isinstance(exc, ConnectionAcquisitionTimeoutError):
+                self._owner._count("acquisition_timeouts")
+            raise
+
+    def run(self, *args, **kwargs):
+        return self._acquiring(self._session.run, *args, **kwargs)
+
+    def execute_read(self, *args, **kwargs):
+        return self._acquiring(self._session.execute_read, *args, **kwargs)
+
+    def execute_write(self, *args, **kwargs):
+        return self._acquiring(self._session.execute_write, *args, **kwargs)
+
+    def begin_transaction(self, *args, **kwargs):
+        return self._acquiring(self._session.begin_transaction, *args, **kwargs)
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._owner._release()
+            self._session.close()
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ManagedDriver:
+    """
+    A neo4j driver plus pool accounting; drop-in wherever the engines expect a driver.
+
+    Each open session holds (at most) one pooled connection, so sessions in use versus
+    `max_pool_size` is the pool's saturation; sessions opened while it is full will wait
+    up to `acquisition_timeout` for a connection.
+    """
+
+    def __init__(self, driver, config: DriverConfig):
+        self.driver = driver
+        self.config = config
+        self._lock = threading.Lock()
+        self._stats = {"in_use": 0, "peak_in_use": 0, "sessions_total": 0,
+                       "saturated_opens": 0, "acquisition_timeouts": 0}
+
+    def session(self, **kwargs):
+        if self.config.database and "database" not in kwargs:
+            kwargs["database"] = self.config.database
+        with self._lock:
+            s = self._stats
+            if s["in_use"] >= self.config.max_pool_size:
+                s["saturated_opens"] += 1
+            s["in_use"] += 1
+            s["sessions_total"] += 1
+            s["peak_in_use"] = max(s["peak_in_use"], s["in_use"])
+        try:
+            return _TrackedSession(self, self.driver.session(**kwargs))
+        except Exception:
+            self._release()
+            raise
+
+    def _release(self):
+        with self._lock:
+            self._stats["in_use"] -= 1
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Pool saturation snapshot: sessions in use / peak / total, saturation ratio, waits."""
+        with self._lock:
+            m = dict(self._stats)
+        m["max_pool_size"] = self.config.max_pool_size
+        m["saturation"] = m["in_use"] / self.config.max_pool_size if self.config.max_pool_size else 0.0
+        m["peak_saturation"] = m["peak_in_use"] / self.config.max_pool_size if self.config.max_pool_size else 0.0
+        return m
+
+    def verify_connectivity(self):
+        return self.driver.verify_connectivity()
+
+    def close(self):
+        self.driver.close()
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+
+def create_driver(config: Optional[DriverConfig] = None):
+    """A new, unmanaged neo4j driver with the pool settings applied (caller closes it)."""
+    from neo4j import GraphDatabase
+    config = config or DriverConfig.from_env()
+    return GraphDatabase.driver(config.uri, **config.driver_kwargs())
+
+
+def warm_up(driver, connections: int = 1, timeout: float = 30.0) -> float:
+    """
+    Verify connectivity and open `connections` pooled connections up front, so the first
+    questions don't pay the Bolt handshake. Returns the seconds spent.
+    """
+    t0 = time.perf_counter()
+    driver.verify_connectivity()
+    if connections > 1:
+        # Hold all sessions open together so each one checks out a distinct connection
+        barrier = threading.Barrier(connections, timeout=timeout)
+
+        def hold(_):
+            with driver.session() as s:
+                s.run("RETURN 1").consume()
+                barrier.wait()
+
+        with ThreadPoolExecutor(max_workers=connections) as pool:
+            list(pool.map(hold, range(connections)))
+    elapsed = time.perf_counter() - t0
+    _log.info("Warmed %d pooled connection(s) in %.2fs", connections, elapsed)
+    return elapsed
+
+
+_LOCK = threading.Lock()
+_DRIVERS: Dict[str, ManagedDriver] = {}
+_ENGINES: Dict[Hashable, Any] = {}
+
+
+def get_driver(name: str = "default", config: Optional[DriverConfig] = None, warm: bool = True) -> ManagedDriver:
+    """
+    The process-wide managed driver registered under `name`, created (from `config` or the
+    environment) and warmed on first use. Later calls return the same pooled driver.
+
+    Warm-up runs outside the registry lock, so other names stay available meanwhile; a
+    driver whose warm-up fails is closed, not registered.
+    """
+    with _LOCK:
+        managed = _DRIVERS.get(name)
+    if managed is not None:
+        return managed
+    config = config or DriverConfig.from_env()
+    managed = ManagedDriver(create_driver(config), config)
+    try:
+        if warm:
+            warm_up(managed, config.warm_connections)
+    except BaseException:
+        managed.close()
+        raise
+    with _LOCK:
+        registered = _DRIVERS.setdefault(name, managed)
+    if registered is not managed:
+        managed.close()  # another thread registered this name first
+    return registered
+
+
+def get_engine(name: str = "default", **engine_kwargs):
+    """
+    Process-wide shared `AiviaEngine` on `get_driver(name)`; one per distinct `engine_kwargs`
+    (e.g. `plan_cache=...`, `native_dates=True`), so callers share plans and connections.
+    """
+    from .run_query import AiviaEngine
+    key = (name, tuple(sorted((k, id(v) if not isinstance(v, Hashable) else v) for k, v in engine_kwargs.items())))
+    engine = _ENGINES.get(key)
+    if engine is None:
+        driver = get_driver(name)
+        with _LOCK:
+            engine = _ENGINES.setdefault(key, AiviaEngine(driver, **engine_kwargs))
+    return engine
+
+
+def pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """`ManagedDriver.metrics()` for every registered driver."""
+    return {name: managed.metrics() for name, managed in list(_DRIVERS.items())}
+
+
+@atexit.register
+def close_all() -> None:
+    """Close every registered driver (also runs at interpreter exit)."""
+    with _LOCK:
+        drivers = list(_DRIVERS.values())
+        _DRIVERS.clear()
+        _ENGINES.clear()
+    for managed in drivers:
+        managed.close()
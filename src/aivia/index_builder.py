@@ -0,0 +1,192 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Offline builder for the vector matching indexes (see `aivia.matching.faiss_search`).
+
+Embeds every label and property from `schema.yaml`, every value in `categoricals.yaml` and
+every field/value phrase in `synonyms.yaml`, then writes one FAISS index per kind
+(`label`, `property`, `value`) with its payloads into `<use_case_dir>/.aivia_index/`.
+
+Builds are incremental: embeddings are cached per text content hash (`embeddings.npy`),
+so only new or edited texts go through the model, and a kind's index is rebuilt only when
+the hash of its entries (plus model and index type) changes. Cold start loads the
+memory-mapped result and runs no model inference for known vocabulary.
+
+    aivia index build use_cases/sales_crm [--index-type ivf] [--model ...] [--force]
+    python -m aivia.index_builder build use_cases/sales_crm
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+import yaml
+from .matching.faiss_search import (DEFAULT_MODEL, INDEX_TYPES, KINDS, EmbeddingStore, VectorIndex, get_encoder,
+                                    make_index, save_vector_index)
+from .schema_loader import _snake, load_schema
+
+INDEX_DIR = ".aivia_index"
+# synonyms.yaml `values:` entries look like  Deal.stage="Evaluate"
+_VALUE_REF = re.compile(r'^\s*(\w+)\.(\w+)\s*=\s*"?([^"]*?)"?\s*$')
+
+_log = logging.getLogger(__name__)
+
+
+@dataclass
+class KindStats:
+    kind: str
+    entries: int
+    rebuilt: bool
+    seconds: float
+
+    def __str__(self) -> str:
+        return (f"{self.kind:<8} {self.entries:>6} entries  {'rebuilt' if self.rebuilt else 'unchanged'} "
+                f"({self.seconds:.2f}s)")
+
+
+def _words(name: str) -> str:
+    return _snake(name).replace("_", " ").strip()
+
+
+def _read_yaml(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def collect_entries(use_case_dir) -> Dict[str, List[Tuple[str, Dict[str, Any]]]]:
+    """kind → [(text to embed, payload)] for the use case, deduplicated, in file order."""
+    use_case_dir = Path(use_case_dir)
+    schema = load_schema(use_case_dir)
+    categoricals = _read_yaml(use_case_dir / "categoricals.yaml")
+    synonyms = _read_yaml(use_case_dir / "synonyms.yaml")
+    labels = schema.get("labels") or {}
+
+    entries: Dict[str, Dict[Tuple[str, str], Tuple[str, Dict[str, Any]]]] = {kind: {} for kind in KINDS}
+
+    def add(kind: str, text: str, payload: Dict[str, Any]) -> None:
+        text = str(text).strip()
+        if text:
+            payload = {**payload, "text": text}
+            entries[kind].setdefault((text.lower(), json.dumps(payload, sort_keys=True)), (text, payload))
+
+    for label, spec in labels.items():
+        add("label", label, {"table": label})
+        add("label", _words(label), {"table": label})
+        for prop in spec.get("properties") or []:
+            if prop == "id" or prop.endswith("_id"):
+                continue  # keys aren't something people ask about by name
+            add("property", _words(prop), {"table": label, "column": prop})
+            add("property", f"{_words(label)} {_words(prop)}", {"table": label, "column": prop})
+
+    for field, values in categoricals.items():
+        label, _, prop = str(field).partition(".")
+        for value in values or []:
+            add("value", value, {"table": label, "column": prop, "value": str(value)})
+
+    for phrase, target in (synonyms.get("phrases_to_fields") or {}).items():
+        ref = str(target).split("__")[0]  # Deal.stage__not_in__... → Deal.stage
+        label, _, prop = ref.partition(".")
+        if label not in labels:
+            continue
+        if prop:
+            add("property", phrase, {"table": label, "column": prop})
+        else:
+            add("label", phrase, {"table": label})
+
+    for phrase, target in (synonyms.get("values") or {}).items():
+        m = _VALUE_REF.match(str(target))
+        if m and m.group(1) in labels:
+            add("value", phrase, {"table": m.group(1), "column": m.group(2), "value": m.group(3)})
+
+    return {kind: list(found.values()) for kind, found in entries.items()}
+
+
+def content_hash(kind: str, entries: Sequence[Tuple[str, Dict[str, Any]]], model: str, index_type: str) -> str:
+    blob = json.dumps({"kind": kind, "model": model, "index_type": index_type,
+                       "entries": [[t, p] for t, p in entries]}, sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def build_indexes(use_case_dir, out_dir=None, model: str = DEFAULT_MODEL, index_type: str = "flat",
+                  force: bool = False, encoder: Optional[Callable[[Sequence[str]], Any]] = None
+                  ) -> List[KindStats]:
+    """
+    (Re)build the index directory for a use case; only changed kinds are rebuilt and only
+    uncached texts are embedded. `encoder` overrides the sentence-transformers model.
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"index_type must be one of {INDEX_TYPES}, got {index_type!r}")
+    out_dir = Path(out_dir or Path(use_case_dir) / INDEX_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / "manifest.json"
+    previous = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+
+    entries = collect_entries(use_case_dir)
+    all_texts = [text for found in entries.values() for text, _ in found]
+    store = EmbeddingStore(out_dir, model)
+    encode = encoder or (lambda texts: get_encoder(model)(texts))  # model loads only if something is new
+
+    t0 = time.perf_counter()
+    _, encoded = store.embed(all_texts, encode)
+    _log.info("Embedded %d new text(s), %d from cache in %.2fs", encoded, len(set(all_texts)) - encoded,
+              time.perf_counter() - t0)
+    if encoded or len(store) != len(set(all_texts)):
+        store.save(keep=all_texts)
+
+    stats, hashes, counts, dim = [], {}, {}, int(store.vectors.shape[1]) if store.vectors.size else 0
+    for kind, found in entries.items():
+        if not found:
+            continue
+        t0 = time.perf_counter()
+        digest = content_hash(kind, found, model, index_type)
+        hashes[kind], counts[kind] = digest, len(found)
+        unchanged = (not force and previous.get("hashes", {}).get(kind) == digest
+                     and (out_dir / f"{kind}.faiss").exists() and (out_dir / f"{kind}.json").exists())
+        if not unchanged:
+            vectors, _ = store.embed([text for text, _ in found], encode)  # all cached by now
+            save_vector_index(out_dir / kind, VectorIndex(make_index(vectors, index_type),
+                                                          [payload for _, payload in found]))
+        stats.append(KindStats(kind, len(found), not unchanged, time.perf_counter() - t0))
+        _log.info("Index %s", stats[-1])
+
+    for kind in KINDS:
+        if kind not in hashes:  # kind no longer has entries
+            for suffix in (".faiss", ".json"):
+                (out_dir / f"{kind}{suffix}").unlink(missing_ok=True)
+
+    manifest = {"model": model, "dim": dim, "index_type": index_type, "kinds": list(hashes),
+                "hashes": hashes, "counts": counts}
+    if manifest != previous:
+        tmp = out_dir / "manifest.json.tmp"
+        tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp, manifest_path)  # written last: loaders pick up the new version by its mtime
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="aivia index", description="Build the vector matching indexes offline")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="embed schema, categoricals and synonyms; write FAISS indexes")
+    build.add_argument("use_case_dir", help="directory containing schema.yaml")
+    build.add_argument("--out", help=f"index directory (default: <use_case_dir>/{INDEX_DIR})")
+    build.add_argument("--model", default=DEFAULT_MODEL, help="sentence-transformers model")
+    build.add_argument("--index-type", choices=INDEX_TYPES, default="flat",
+                       help="ivf/hnsw for large value vocabularies (flat below 1,000 entries regardless)")
+    build.add_argument("--force", action="store_true", help="rebuild every index even if unchanged")
+    args = parser.parse_args(argv)
+
+    for stats in build_indexes(args.use_case_dir, args.out, model=args.model, index_type=args.index_type,
+                               force=args.force):
+        print(f"[INDEX] {stats}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
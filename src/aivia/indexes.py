@@ -0,0 +1,256 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Index and constraint advisor for the generated query templates.
+
+Walks every Cypher template `AiviaEngine._build_cypher` can emit plus `schema.yaml` and
+derives what Neo4j needs to avoid full label scans:
+
+- uniqueness constraints on `id` for every schema label (same names as `aivia.loader`)
+- token lookup indexes for labels / relationship types (label scans, traversals)
+- range indexes on every property a template filters on (WHERE or inline `{prop: ...}`)
+
+`apply()` creates them with `IF NOT EXISTS`, so it is safe to run on every deploy, and
+`explain_report()` compares `EXPLAIN` plans before/after to show which templates switched
+from label scans to index seeks.
+
+    python -m aivia.indexes use_cases/sales_crm [--apply] [--explain]
+"""
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+import logging
+import re
+import sys
+from dataclasses import dataclass
+from .loader import constraint_cypher, driver_from_env
+from .run_query import AiviaEngine
+
+_log = logging.getLogger(__name__)
+
+# One question per template branch of `_build_cypher`
+TEMPLATE_QUESTIONS = {
+    "no_next_meeting": "open deals > 10k last 60 days no next meeting 14 days",
+    "commit_missing_roles": "commit deals this quarter missing finance or security",
+    "stale_evaluate": "evaluate stage > 21 days with no activity in 14 days",
+    "open_deals": "open deals",
+}
+
+# Operators that read through a property index (Neo4j 5 names, "@neo4j" suffix stripped)
+INDEX_OPERATORS = {
+    "NodeIndexSeek", "NodeUniqueIndexSeek", "NodeIndexSeekByRange", "NodeUniqueIndexSeekByRange",
+    "NodeIndexScan", "NodeIndexContainsScan", "NodeIndexEndsWithScan", "MultiNodeIndexSeek",
+    "DirectedRelationshipIndexSeek", "UndirectedRelationshipIndexSeek", "DirectedRelationshipIndexScan",
+    "AssertingMultiNodeIndexSeek",
+}
+
+_BIND = re.compile(r"\((\w+):(\w+)(?:\s*\{([^}]*)\})?")
+_PROP = re.compile(r"\b(\w+)\.(\w+)\b")
+_WRAPPED = re.compile(r"\b\w+\(\s*(\w+)\.(\w+)\s*\)")
+_MAP_KEY = re.compile(r"(\w+)\s*:")
+_RETURN = re.compile(r"^\s*RETURN\b", re.M)
+
+
+@dataclass
+class Recommendation:
+    kind: str                 # "constraint" | "lookup" | "range"
+    name: str
+    cypher: str
+    label: Optional[str] = None
+    properties: Tuple[str, ...] = ()
+    reason: str = ""
+
+
+def template_cyphers(questions: Dict[str, str] = TEMPLATE_QUESTIONS, native_dates: bool = False
+                     ) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    """name → (cypher, params) for each template, planned exactly as the engine would."""
+    engine = AiviaEngine(None, native_dates=native_dates)
+    return {name: engine._plan(q, top_k=8)[2:] for name, q in questions.items()}
+
+
+def predicate_properties(cypher: str) -> Dict[Tuple[str, str], Set[str]]:
+    """
+    (label, property) pairs the query filters on, each with its usage flags:
+    "where" (WHERE predicate), "inline" (pattern map) and "wrapped" (inside a function
+    call such as `date(d.created_date)`, which a plain property index can't serve).
+    """
+    body = _RETURN.split(cypher)[0]  # projections and ORDER BY aren't filters
+    labels = {}
+    found: Dict[Tuple[str, str], Set[str]] = {}
+    for var, label, props in _BIND.findall(body):
+        labels[var] = label
+        for prop in _MAP_KEY.findall(props or ""):
+            found.setdefault((label, prop), set()).add("inline")
+    wrapped = {(v, p) for v, p in _WRAPPED.findall(body)}
+    for var, prop in _PROP.findall(body):
+        if var in labels:
+            flags = found.setdefault((labels[var], prop), set())
+            flags.add("where")
+            if (var, prop) in wrapped:
+                flags.add("wrapped")
+    return found
+
+
+def advise(schema: Dict[str, Any], templates: Dict[str, Tuple[str, Dict[str, Any]]]) -> List[Recommendation]:
+    """Constraints, lookup indexes and range indexes needed by `templates` over `schema`."""
+    schema_labels = schema.get("labels") or {}
+    recs = [Recommendation("lookup", "node_label_lookup_index",
+                           "CREATE LOOKUP INDEX node_label_lookup_index IF NOT EXISTS FOR (n) ON EACH labels(n)",
+                           reason="label scans / MATCH (n:Label)"),
+            Recommendation("lookup", "rel_type_lookup_index",
+                           "CREATE LOOKUP INDEX rel_type_lookup_index IF NOT EXISTS FOR ()-[r]-() ON EACH type(r)",
+                           reason="relationship type scans")]
+
+    for label, spec in schema_labels.items():
+        if "id" in (spec.get("properties") or []):
+            recs.append(Recommendation("constraint", f"{label.lower()}_id_unique", constraint_cypher(label),
+                                       label, ("id",), "primary key (loader MERGE)"))
+
+    usage: Dict[Tuple[str, str], Dict[str, Set[str]]] = {}
+    for name, (cypher, _) in templates.items():
+        for key, flags in predicate_properties(cypher).items():
+            if key[1] == "id":
+                continue  # served by the uniqueness constraint
+            usage.setdefault(key, {}).setdefault(name, set()).update(flags)
+
+    for (label, prop), by_template in sorted(usage.items()):
+        index_name = f"{label.lower()}_{prop}_range"
+        notes = [f"filtered in {', '.join(sorted(by_template))}"]
+        if all("wrapped" in flags for flags in by_template.values()):
+            notes.append("only wrapped in a function so far; usable once stored as a native type")
+        if prop not in (schema_labels.get(label, {}).get("properties") or []):
+            notes.append("not declared in schema.yaml")
+        recs.append(Recommendation("range", index_name,
+                                   f"CREATE INDEX {index_name} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})",
+                                   label, (prop,), "; ".join(notes)))
+    return recs
+
+
+# SHOW CONSTRAINTS types that make `MERGE` on (label, id) safe (Neo4j 4.4 / 5.x names)
+UNIQUENESS_TYPES = {"UNIQUENESS", "NODE_PROPERTY_UNIQUENESS"}
+# SHOW INDEXES types that serve a range recommendation (BTREE on Neo4j 4.4)
+RANGE_INDEX_TYPES = {"RANGE", "BTREE"}
+
+SchemaKey = Tuple[str, str, Tuple[str, ...]]
+
+
+def _schema_key(rec: Recommendation) -> SchemaKey:
+    if rec.kind == "lookup":
+        return "LOOKUP", "RELATIONSHIP" if "()-[r]-()" in rec.cypher else "NODE", ()
+    return ("UNIQUENESS" if rec.kind == "constraint" else "RANGE"), rec.label, rec.properties
+
+
+def existing_schema(session) -> Set[SchemaKey]:
+    """
+    Keys (see `_schema_key`) of what is already present: lookup and range indexes
+    (constraint-backed ones included), and uniqueness constraints or their backing
+    indexes. Any other index or constraint on the same properties doesn't count.
+    """
+    covered, unique_names = set(), set()
+    for name, constraint_type, labels, props in session.run(
+            "SHOW CONSTRAINTS YIELD name, type, labelsOrTypes, properties"):
+        if constraint_type in UNIQUENESS_TYPES:
+            unique_names.add(name)
+            covered.update(("UNIQUENESS", label, tuple(props or ())) for label in labels or [])
+    for index_type, entity, labels, props, owner in session.run(
+            "SHOW INDEXES YIELD type, entityType, labelsOrTypes, properties, owningConstraint"):
+        if index_type == "LOOKUP":
+            covered.add(("LOOKUP", entity, ()))
+        for label in labels or []:
+            if index_type in RANGE_INDEX_TYPES:
+                covered.add(("RANGE", label, tuple(props or ())))
+            if owner in unique_names:
+                covered.add(("UNIQUENESS", label, tuple(props or ())))
+    return covered
+
+
+def apply(driver, recs: Sequence[Recommendation]) -> Tuple[List[str], List[str]]:
+    """Create every recommendation idempotently; returns (created, already present) names."""
+    created, present = [], []
+    with driver.session() as s:
+        before = existing_schema(s)
+        for rec in recs:
+            if _schema_key(rec) in before:
+                present.append(rec.name)  # possibly under another name: IF NOT EXISTS would still skip it
+                continue
+            s.run(rec.cypher).consume()
+            created.append(rec.name)
+    _log.info("Created %d index(es)/constraint(s), %d already present", len(created), len(present))
+    return created, present
+
+
+def _plan_operators(plan: Optional[Dict[str, Any]]) -> List[str]:
+    if not plan:
+        return []
+    ops = [str(plan.get("operatorType", "")).split("@")[0]]
+    for child in plan.get("children") or []:
+        ops += _plan_operators(child)
+    return ops
+
+
+def explain_operators(session, cypher: str, params: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Operator names of the EXPLAIN plan (nothing is executed)."""
+    summary = session.run(f"EXPLAIN {cypher}", params or {}).consume()
+    return _plan_operators(summary.plan)
+
+
+def explain_report(driver, templates: Dict[str, Tuple[str, Dict[str, Any]]],
+                   recs: Optional[Sequence[Recommendation]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    EXPLAIN every template, apply `recs` (if given), EXPLAIN again and report per template
+    the index operators before/after and whether it gained index usage.
+    """
+    def snapshot():
+        with driver.session() as s:
+            return {name: explain_operators(s, c, p) for name, (c, p) in templates.items()}
+
+    before = snapshot()
+    if recs:
+        apply(driver, recs)
+    after = snapshot()
+
+    report = {}
+    for name in templates:
+        idx_before = [op for op in before[name] if op in INDEX_OPERATORS]
+        idx_after = [op for op in after[name] if op in INDEX_OPERATORS]
+        report[name] = {"before": idx_before, "after": idx_after,
+                        "gained": len(idx_after) > len(idx_before),
+                        "label_scans": [op for op in after[name] if op.endswith("LabelScan") or op == "AllNodesScan"]}
+        _log.info("%s: %s %s → %s", name, _usage(report[name]), idx_before, idx_after)
+    return report
+
+
+def _usage(entry: Dict[str, Any]) -> str:
+    return "✅ gained index usage" if entry["gained"] else "— unchanged"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+    from .schema_loader import load_schema
+
+    parser = argparse.ArgumentParser(description="Derive indexes/constraints for the query templates")
+    parser.add_argument("use_case_dir", help="directory containing schema.yaml")
+    parser.add_argument("--apply", action="store_true", help="create them (idempotent)")
+    parser.add_argument("--explain", action="store_true", help="report EXPLAIN index usage before/after")
+    parser.add_argument("--native-dates", action="store_true", help="templates for a native-date graph")
+    args = parser.parse_args(argv)
+
+    templates = template_cyphers(native_dates=args.native_dates)
+    recs = advise(load_schema(args.use_case_dir), templates)
+    for rec in recs:
+        print(f"{rec.cypher};" + (f"  // {rec.reason}" if rec.reason else ""))
+    if not (args.apply or args.explain):
+        return
+
+    driver = driver_from_env()
+    try:
+        if args.explain:
+            report = explain_report(driver, templates, recs if args.apply else None)
+            for name, entry in report.items():
+                print(f"[INDEX] {name}: {_usage(entry)} {entry['before']} → {entry['after']}")
+        else:
+            created, present = apply(driver, recs)
+            print(f"[INDEX] created {len(created)}, already present {len(present)}")
+    finally:
+        driver.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
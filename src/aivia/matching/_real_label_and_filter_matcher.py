@@ -1,7 +1,16 @@
-from aivia.matching.faiss_search import load_faiss_handles
+# FAISS (aivia.matching.faiss_search), the pattern registry and the pathfinder are imported
+# where they are first needed, so importing the matcher stays cheap
 from typing import Dict, Any
-from aivia.extras.config import get_pattern_registry
-from aivia.pathfinder.engine import get_pathfinder_engine
+import logging
+from aivia.tracing import trace, tracing
+from aivia.matching.schema_index import get_schema_index
+from aivia.matching.lexicon import get_concept_lexicon
+
+_log = logging.getLogger(__name__)
+
+def _pattern_registry():
+    from aivia.extras.config import get_pattern_registry
+    return get_pattern_registry()
 
 def _extract_needs(entities, filters=None) -> Dict[str, Any]:
     """Extract conditions and time windows from entities and filters safely."""
@@ -40,8 +49,8 @@ def _extract_needs(entities, filters=None) -> Dict[str, Any]:
         "time_windows": time_windows
     }
 
-def _schema_based_token_matching(entities, clarity_schema):
-    """Schema-driven token matching using table names and column patterns."""
+def _classify_tokens(entities):
+    """Split entity mentions into entity, value, time-window and negation tokens."""
     entity_tokens = []
     value_tokens = []
     time_windows = []
@@ -59,44 +68,51 @@ def _schema_based_token_matching(entities, clarity_schema):
             time_windows.append(mention)
         elif entity_type == 'negation':
             negation_patterns.append(mention)
-            print(f"🚫 Negation detected: '{mention}'")
     
-    print(f"🔍 SCHEMA-BASED MATCHING - Entity tokens: {entity_tokens}")
-    print(f"🔍 SCHEMA-BASED MATCHING - Value tokens: {value_tokens}")
+    return entity_tokens, value_tokens, time_windows, negation_patterns
+
+def _schema_based_token_matching(entities, clarity_schema):
+    """Schema-driven token matching using table names and column patterns."""
+    entity_tokens, value_tokens, time_windows, negation_patterns = _classify_tokens(entities)
+    
+    if negation_patterns:
+        trace(_log, "🚫 Negation detected: %s", negation_patterns)
+    trace(_log, "🔍 SCHEMA-BASED MATCHING - Entity tokens: %s", entity_tokens)
+    trace(_log, "🔍 SCHEMA-BASED MATCHING - Value tokens: %s", value_tokens)
     
     # Generic entity→table matching using schema
     entity_matches = []
     if clarity_schema and 'tables' in clarity_schema:
+        index = get_schema_index(clarity_schema)
         for token in entity_tokens:
-            for table_name, table_info in clarity_schema['tables'].items():
-                # Generic similarity matching
-                if _token_matches_table(token, table_name, table_info):
-                    entity_matches.append({
-                        'table': table_name, 
-                        'score': 0.9, 
-                        'type': 'table'
-                    })
-                    break  # Take first match
+            # First table whose aliases/name overlap the token (same rule as _token_matches_table)
+            table_name = index.match_table(token)
+            if table_name:
+                entity_matches.append({
+                    'table': table_name, 
+                    'score': 0.9, 
+                    'type': 'table'
+                })
     
     # Context-aware value→category matching using schema  
     value_matches = []
     if clarity_schema and 'tables' in clarity_schema:
         for token in value_tokens:
             # Use existing dynamic medical concept detection with flexible matching
-            registry = get_pattern_registry()
+            registry = _pattern_registry()
             medical_concept = registry.find_medical_concept(token)
             
             # If direct lookup fails, try common variations
             if not medical_concept:
                 medical_concept = _find_medical_concept_with_variations(registry, token)
             
-            print(f"🔍 Medical concept lookup for '{token}': {medical_concept}")
+            trace(_log, "🔍 Medical concept lookup for '%s': %s", token, medical_concept)
             
             # Path 1: Medical Conditions → Diagnosis Tables
             if medical_concept:
                 # Dynamically find diagnosis tables and columns from schema
                 diagnosis_table, diagnosis_column = _find_diagnosis_table_and_column(clarity_schema)
-                print(f"🔍 Diagnosis table discovery: table={diagnosis_table}, column={diagnosis_column}")
+                trace(_log, "🔍 Diagnosis table discovery: table=%s, column=%s", diagnosis_table, diagnosis_column)
                 if diagnosis_table and diagnosis_column:
                     # Use the medical concept's preferred term for search
                     search_term = medical_concept.preferred_term
@@ -107,7 +123,7 @@ def _schema_based_token_matching(entities, clarity_schema):
                         'score': 0.95,
                         'type': 'diagnosis'
                     })
-                    print(f"🏥 Medical condition match: '{token}' → {diagnosis_table}.{diagnosis_column} LIKE '%{search_term}%'")
+                    trace(_log, "🏥 Medical condition match: '%s' → %s.%s LIKE '%%%s%%'", token, diagnosis_table, diagnosis_column, search_term)
             
             # Path 2: Status Values → Category Tables (parallel, not fallback)
             else:
@@ -124,7 +140,7 @@ def _schema_based_token_matching(entities, clarity_schema):
                             'score': 0.95,
                             'type': 'category_value'
                         })
-                        print(f"📋 Status value match: '{token}' → {best_table}.NAME = '{matched_value}'")
+                        trace(_log, "📋 Status value match: '%s' → %s.NAME = '%s'", token, best_table, matched_value)
     
     # Process negation patterns
     negation_filters = []
@@ -141,7 +157,7 @@ def _schema_based_token_matching(entities, clarity_schema):
                     'pattern': negation,
                     'type': 'not_exists'
                 })
-                print(f"🚫 Negation filter: '{negation}' → NOT EXISTS {negated_table}")
+                trace(_log, "🚫 Negation filter: '%s' → NOT EXISTS %s", negation, negated_table)
     
     return entity_matches, value_matches, time_windows, negation_filters
 
@@ -193,7 +209,7 @@ def _extract_negated_concept(negation_text):
         return None
     
     # Use dynamic pattern registry to normalize concepts
-    registry = get_pattern_registry()
+    registry = _pattern_registry()
     
     # Get entity types from configuration
     entity_types = registry.get_entity_types()
@@ -213,120 +229,22 @@ def _find_table_for_concept(concept, clarity_schema):
     if not clarity_schema or 'tables' not in clarity_schema:
         return None
 
-    concept_lower = concept.lower()
-    
-    # Use dynamic pattern registry for concept-to-table mapping
-    registry = get_pattern_registry()
-    
-    # Discover entity types from schema dynamically
-    discovered_entities = registry.discover_entities_from_schema(clarity_schema)
-    
-    # Build dynamic concept-to-table mapping
-    concept_table_map = {}
-    for table_name, table_info in clarity_schema['tables'].items():
-        column_names = []
-        if 'columns_priority' in table_info:
-            column_names = [col.get('name', '') for col in table_info['columns_priority']]
-        
-        entity_type = registry.find_entity_type_from_schema(table_name, column_names)
-        if entity_type:
-            # Map semantic indicators to this table
-            indicators = registry.get_semantic_indicators(entity_type)
-            for indicator in indicators:
-                concept_table_map[indicator] = table_name
-                concept_table_map[indicator + 's'] = table_name  # Plural form
-    
-    if concept_lower in concept_table_map:
-        return concept_table_map[concept_lower]
-    
-    # Fallback: search aliases in schema
-    for table_name, table_info in clarity_schema['tables'].items():
-        if 'aliases' in table_info:
-            for alias in table_info['aliases']:
-                if concept_lower in alias.lower() or alias.lower() in concept_lower:
-                    return table_name
-    
-    return None
+    # Registry indicator → table map first, then schema aliases (both precomputed per schema)
+    return get_schema_index(clarity_schema).table_for_concept(concept, _pattern_registry())
 
 def _get_primary_key(table_name, clarity_schema):
     """Get the primary key column for a table."""
     if not clarity_schema or 'tables' not in clarity_schema:
         return 'ID'  # Default fallback
     
-    table_info = clarity_schema['tables'].get(table_name, {})
-    
-    # Check if primary_key is explicitly defined
-    if 'primary_key' in table_info:
-        return table_info['primary_key']
-    
-    # Common primary key patterns
-    pk_patterns = {
-        'PAT_ENC': 'PAT_ENC_CSN_ID',
-        'REFERRAL': 'REFERRAL_ID',
-        'PATIENT': 'PAT_ID',
-        'CLARITY_SER': 'PROV_ID'
-    }
-    
-    if table_name in pk_patterns:
-        return pk_patterns[table_name]
-    
-    # Fallback: look for ID-like columns
-    if 'columns_priority' in table_info:
-        for col in table_info['columns_priority']:
-            col_name = col.get('name', '')
-            if col_name.endswith('_ID') or col_name == 'ID':
-                return col_name
-    
-    return 'ID'  # Ultimate fallback
+    # Explicit primary_key, known patterns, first ID-like column, else 'ID'
+    return get_schema_index(clarity_schema).primary_key(table_name)
 
 def _find_medical_concept_with_variations(registry, token):
     """Find medical concept using dynamic linguistic variations."""
-    token_lower = token.lower()
-    
-    # Get all available medical concepts to search through
-    all_concepts = getattr(registry, '_medical_concepts', {})
-    
-    # Strategy 1: Fuzzy matching - check if token is contained in any concept terms
-    for concept in all_concepts.values():
-        # Check if token is a substring of preferred term or synonyms
-        preferred_lower = concept.preferred_term.lower()
-        if token_lower in preferred_lower or preferred_lower in token_lower:
-            return concept
-        
-        for synonym in concept.synonyms:
-            synonym_lower = synonym.lower()
-            if token_lower in synonym_lower or synonym_lower in token_lower:
-                return concept
-    
-    # Strategy 2: Morphological variations - try removing/adding common medical suffixes
-    medical_suffixes = ['ic', 'tic', 'al', 'ous', 'ive', 'ism', 'osis', 'itis', 'emia', 'uria']
-    
-    # Try removing suffixes from token
-    for suffix in medical_suffixes:
-        if token_lower.endswith(suffix) and len(token_lower) > len(suffix) + 2:
-            stem = token_lower[:-len(suffix)]
-            # Search for concepts containing this stem
-            for concept in all_concepts.values():
-                preferred_lower = concept.preferred_term.lower()
-                if stem in preferred_lower:
-                    return concept
-                for synonym in concept.synonyms:
-                    if stem in synonym.lower():
-                        return concept
-    
-    # Try adding suffixes to token
-    for suffix in medical_suffixes:
-        variant = token_lower + suffix
-        for concept in all_concepts.values():
-            preferred_lower = concept.preferred_term.lower()
-            if variant in preferred_lower or preferred_lower in variant:
-                return concept
-            for synonym in concept.synonyms:
-                synonym_lower = synonym.lower()
-                if variant in synonym_lower or synonym_lower in variant:
-                    return concept
-    
-    return None
+    # Substring match on any term, then suffix-stripped stems, then suffix-added variants;
+    # first concept in registry order wins (see aivia.matching.lexicon)
+    return get_concept_lexicon(registry).find(token)
 
 
 def _find_diagnosis_table_and_column(clarity_schema):
@@ -334,59 +252,14 @@ def _find_diagnosis_table_and_column(clarity_schema):
     if not clarity_schema or 'tables' not in clarity_schema:
         return None, None
     
-    # Strategy: Find tables whose descriptions mention diagnosis-related terms
-    # Then find columns in those tables that likely contain searchable text
-    
-    diagnosis_keywords = ['diagnosis', 'diagnostic', 'condition', 'disease', 'medical', 'clinical']
-    text_column_indicators = ['name', 'desc', 'description', 'text', 'title', 'label']
-    
-    candidates = []
-    
-    # Score tables based on how likely they are to contain diagnosis information
-    for table_name, table_info in clarity_schema['tables'].items():
-        description = table_info.get('description', '').lower()
-        aliases = [alias.lower() for alias in table_info.get('aliases', [])]
-        
-        # Calculate diagnosis relevance score
-        diagnosis_score = 0
-        for keyword in diagnosis_keywords:
-            if keyword in description:
-                diagnosis_score += 2
-            for alias in aliases:
-                if keyword in alias:
-                    diagnosis_score += 1
-        
-        # Look for text columns in this table
-        columns = table_info.get('columns_priority', [])
-        for col in columns:
-            col_name = col.get('name', '').lower()
-            col_desc = col.get('description', '').lower()
-            
-            # Calculate text column score
-            text_score = 0
-            for indicator in text_column_indicators:
-                if indicator in col_name:
-                    text_score += 2
-                if indicator in col_desc:
-                    text_score += 1
-            
-            # Combined score
-            total_score = diagnosis_score + text_score
-            if total_score > 0:
-                candidates.append({
-                    'table': table_name,
-                    'column': col['name'],
-                    'score': total_score,
-                    'reason': f"diagnosis_score={diagnosis_score}, text_score={text_score}"
-                })
-    
-    # Sort by score and return the best candidate
-    if candidates:
-        best = max(candidates, key=lambda x: x['score'])
-        print(f"🔍 Dynamic diagnosis discovery: {best['table']}.{best['column']} (score={best['score']}, {best['reason']})")
+    # Tables scored by diagnosis terms in description/aliases, columns by text-like names;
+    # computed once per schema by SchemaIndex
+    best = get_schema_index(clarity_schema).diagnosis
+    if best:
+        trace(_log, "🔍 Dynamic diagnosis discovery: %s.%s (score=%s, %s)", best['table'], best['column'], best['score'], best['reason'])
         return best['table'], best['column']
     
-    print("🔍 No diagnosis table/column found through dynamic discovery")
+    trace(_log, "🔍 No diagnosis table/column found through dynamic discovery")
     return None, None
 
 
@@ -410,7 +283,7 @@ def _find_best_category_table(value_token, entity_tokens, clarity_schema):
     value_lower = value_token.lower()
     
     # Use dynamic pattern registry for status matching
-    registry = get_pattern_registry()
+    registry = _pattern_registry()
     
     # Find entity types that might have status values
     entity_types = registry.get_entity_types()
@@ -425,14 +298,14 @@ def _find_best_category_table(value_token, entity_tokens, clarity_schema):
                                           for pattern in config.table_patterns)]
                 if possible_zc_tables:
                     best_table = possible_zc_tables[0]  # Take first match
-                    print(f"🎯 Dynamic semantic match: '{value_token}' → {best_table} ({entity_type})")
+                    trace(_log, "🎯 Dynamic semantic match: '%s' → %s (%s)", value_token, best_table, entity_type)
                     return best_table
     
     # Referral-specific statuses  
     referral_statuses = ['open', 'closed', 'declined', 'in progress']
     if any(status in value_lower for status in referral_statuses):
         if 'ZC_REFERRAL_STATUS' in available_zc_tables:
-            print(f"🎯 Semantic match: '{value_token}' → ZC_REFERRAL_STATUS (referral status)")
+            trace(_log, "🎯 Semantic match: '%s' → ZC_REFERRAL_STATUS (referral status)", value_token)
             return 'ZC_REFERRAL_STATUS'
     
     # Use schema relationships to find the best match
@@ -460,46 +333,63 @@ def _find_best_category_table(value_token, entity_tokens, clarity_schema):
     return available_zc_tables[0] if available_zc_tables else None
 
 def load_indexes(faiss_config):
-    """Load FAISS indexes with error handling."""
+    """Load FAISS indexes with error handling; nothing is imported without an `index_dir`."""
+    if not (faiss_config or {}).get("index_dir"):
+        return None
     try:
+        from aivia.matching.faiss_search import load_faiss_handles
         return load_faiss_handles(faiss_config)
     except Exception as e:
-        print(f"[WARNING] FAISS loading failed: {e}")
+        _log.warning("FAISS loading failed: %s", e)
     return None
 
 def match_labels_and_filters(*, question, target_row_grain, entities, filters, faiss_config, clarity_schema):
     """Main matching function with enhanced token-based approach."""
-    print(f"🔍 MATCHER DEBUG - Question: '{question}'")
-    print(f"🔍 MATCHER DEBUG - Entities received: {len(entities)}")
-    for i, entity in enumerate(entities):
-        print(f"   {i+1}. '{getattr(entity, 'mention', 'NO_MENTION')}' type='{getattr(entity, 'type', 'NO_TYPE')}'")
+    traced = tracing(_log)
+    if traced:
+        trace(_log, "🔍 MATCHER DEBUG - Question: '%s'", question)
+        trace(_log, "🔍 MATCHER DEBUG - Entities received: %s", len(entities))
+        for i, entity in enumerate(entities):
+            trace(_log, "   %s. '%s' type='%s'", i+1, getattr(entity, 'mention', 'NO_MENTION'), getattr(entity, 'type', 'NO_TYPE'))
     
     # Try to load FAISS, but continue gracefully if it fails
-        handles = load_indexes(faiss_config)
+    handles = load_indexes(faiss_config)
+    
+    entity_matches, value_matches, time_windows, negation_filters = _schema_based_token_matching(entities, clarity_schema)
     
     if handles:
-        print("✅ FAISS handles loaded successfully")
-        # TODO: Use real FAISS matching when indexes are fixed
-        entity_matches, value_matches, time_windows, negation_filters = _schema_based_token_matching(entities, clarity_schema)
+        trace(_log, "✅ FAISS handles loaded successfully")
+        try:
+            # One batched embedding for all entity/value tokens; hits above the score
+            # threshold are appended after the schema matches (which still pick the main table)
+            from aivia.matching.faiss_search import merge_matches, search_options, vector_matches
+            entity_tokens, value_tokens, _, _ = _classify_tokens(entities)
+            faiss_entities, faiss_values = vector_matches(handles, entity_tokens, value_tokens,
+                                                          **search_options(faiss_config))
+            entity_matches = merge_matches(entity_matches, faiss_entities, key=lambda m: m['table'])
+            value_matches = merge_matches(value_matches, faiss_values,
+                                          key=lambda m: (m['table'], m['column'], m['value']))
+        except Exception as e:
+            _log.warning("FAISS matching failed, using schema matches only: %s", e)
     else:
-        print("🔄 Using schema-based matching due to FAISS issues")
-        entity_matches, value_matches, time_windows, negation_filters = _schema_based_token_matching(entities, clarity_schema)
-    
-    print(f"🔍 ENHANCED MATCHING - Entity matches: {len(entity_matches)}")
-    for match in entity_matches:
-        print(f"   Entity: '{match['table']}' (score: {match['score']:.3f})")
-    
-    print(f"🔍 ENHANCED MATCHING - Value matches: {len(value_matches)}")  
-    for match in value_matches:
-        print(f"   Value: {match['table']}.{match['column']} = '{match['value']}' (score: {match['score']:.3f})")
+        trace(_log, "🔄 Using schema-based matching (no FAISS index)")
     
-    print(f"🔍 ENHANCED MATCHING - Time windows: {len(time_windows)}")
-    for tw in time_windows:
-        print(f"   Time window: '{tw}'")
-    
-    print(f"🔍 ENHANCED MATCHING - Negation filters: {len(negation_filters)}")
-    for nf in negation_filters:
-        print(f"   Negation: '{nf['pattern']}' → NOT EXISTS {nf['table']}")
+    if traced:
+        trace(_log, "🔍 ENHANCED MATCHING - Entity matches: %s", len(entity_matches))
+        for match in entity_matches:
+            trace(_log, "   Entity: '%s' (score: %.3f)", match['table'], match['score'])
+        
+        trace(_log, "🔍 ENHANCED MATCHING - Value matches: %s", len(value_matches))
+        for match in value_matches:
+            trace(_log, "   Value: %s.%s = '%s' (score: %.3f)", match['table'], match['column'], match['value'], match['score'])
+        
+        trace(_log, "🔍 ENHANCED MATCHING - Time windows: %s", len(time_windows))
+        for tw in time_windows:
+            trace(_log, "   Time window: '%s'", tw)
+        
+        trace(_log, "🔍 ENHANCED MATCHING - Negation filters: %s", len(negation_filters))
+        for nf in negation_filters:
+            trace(_log, "   Negation: '%s' → NOT EXISTS %s", nf['pattern'], nf['table'])
     
     # Process time windows into temporal filters
     temporal_filters = []
@@ -533,9 +423,9 @@ def match_labels_and_filters(*, question, target_row_grain, entities, filters, f
                         temporal_filter['end'] = "NOW"
                     
                     temporal_filters.append(temporal_filter)
-                    print(f"   → Parsed temporal filter: {parsed_window}")
+                    trace(_log, "   → Parsed temporal filter: %s", parsed_window)
         except Exception as e:
-            print(f"   [WARNING] Temporal parsing failed: {e}")
+            _log.warning("Temporal parsing failed: %s", e)
     
     if entity_matches or value_matches or negation_filters:
         # Determine main table intelligently - prioritize target grain
@@ -544,31 +434,31 @@ def match_labels_and_filters(*, question, target_row_grain, entities, filters, f
             target_table = target_row_grain.upper() if target_row_grain else None
             if target_table and any(match['table'] == target_table for match in entity_matches):
                 from_table = target_table
-                print(f"🎯 Main table: {from_table} (matches target grain {target_row_grain})")
+                trace(_log, "🎯 Main table: %s (matches target grain %s)", from_table, target_row_grain)
                 # Plan joins for all other entity matches
                 other_entity_tables = [match['table'] for match in entity_matches if match['table'] != from_table]
             else:
                 # Fallback to first entity match
                 from_table = entity_matches[0]['table']
-                print(f"🎯 Main table: {from_table} (from {len(entity_matches)} entity matches)")
+                trace(_log, "🎯 Main table: %s (from %s entity matches)", from_table, len(entity_matches))
                 # Plan joins for other entity matches
                 other_entity_tables = [match['table'] for match in entity_matches[1:]]
             
             if other_entity_tables:
-                print(f"🔗 Additional entity tables to join: {other_entity_tables}")
+                trace(_log, "🔗 Additional entity tables to join: %s", other_entity_tables)
         elif value_matches:
             # Use LLM's target_row_grain instead of hardcoded fallbacks
             if target_row_grain and target_row_grain.upper() in ['REFERRAL', 'PATIENT', 'ENCOUNTER', 'APPOINTMENT', 'PROVIDER', 'DEPARTMENT']:
                 from_table = target_row_grain.upper()
-                print(f"🎯 Main table: {from_table} (from LLM target_row_grain)")
+                trace(_log, "🎯 Main table: %s (from LLM target_row_grain)", from_table)
             else:
                 # Only if target_row_grain is invalid, use PATIENT as last resort
                 from_table = "PATIENT"
-                print(f"🎯 Main table: {from_table} (default - invalid target_row_grain: {target_row_grain})")
+                trace(_log, "🎯 Main table: %s (default - invalid target_row_grain: %s)", from_table, target_row_grain)
         elif negation_filters:
             # For pure negation queries, use the most appropriate main table
             from_table = target_row_grain.upper() if target_row_grain.upper() in ['REFERRAL', 'PATIENT', 'ENCOUNTER'] else "PATIENT"
-            print(f"🎯 Main table for negation: {from_table}")
+            trace(_log, "🎯 Main table for negation: %s", from_table)
         else:
             from_table = "PATIENT"
         
@@ -590,71 +480,37 @@ def match_labels_and_filters(*, question, target_row_grain, entities, filters, f
                 if value_match['table'] != from_table:
                     tables_to_join.add(value_match['table'])
         
-        # Plan joins using unified PathfinderEngine (Phase B: 3-layer architecture)
-        if tables_to_join:
+        # Plan every join in one PathfinderEngine call: positive targets are INNER-joined,
+        # negated tables LEFT-joined, and prefix edges they share appear once
+        negation_tables = list(dict.fromkeys(nf['table'] for nf in negation_filters if nf['table'] != from_table))
+        if tables_to_join or negation_tables:
             try:
-                print(f"🔍 TABLES TO JOIN: {from_table} -> {list(tables_to_join)}")
-                
-                # Convert tables to PathfinderEngine target format
-                targets = []
-                for table in tables_to_join:
-                    # Find columns needed for this table from value_matches
-                    columns = []
-                    for value_match in value_matches:
-                        if value_match.get('table') == table:
-                            column = value_match.get('column')
-                            if column and column not in columns:
-                                columns.append(column)
-                    
-                    targets.append({
-                        "table": table,
-                        "columns": columns or ["*"]  # Default to all columns if none specified
-                    })
-                
-                # Use unified PathfinderEngine - single source of truth
-                engine = get_pathfinder_engine()
-                path_plan = engine.complete_path(row_grain=from_table, targets=targets)
-                
-                # Convert PathPlan to legacy format for SQL generation compatibility
-                neo4j_plan = {
-                    "nodes": path_plan.nodes,
-                    "edges": [[edge[0], edge[1]] for edge in path_plan.edges],
-                    "edges_on": path_plan.edges_on,
-                    "metadata": {
-                        "resolver": path_plan.resolver,
-                        "explanation": path_plan.explanation or [],
-                        "cost": path_plan.cost
-                    }
-                }
-                
-                # Convert Neo4j plan to join format expected by matcher
-                path_joins = []
-                for edge in neo4j_plan.get("edges", []):
-                    if len(edge) == 2:
-                        source_table, target_table = edge
-                        edge_key = f"{source_table}->{target_table}"
-                        join_clause = neo4j_plan.get("edges_on", {}).get(edge_key)
-                        if not join_clause:
-                            print(f"⚠️  WARNING: No join condition found for {edge_key}")
-                            print(f"    Available keys: {list(neo4j_plan.get('edges_on', {}).keys())}")
-                            join_clause = f"{target_table}.ID = {source_table}.ID"
-                            print(f"    Using fallback: {join_clause}")
-                        else:
-                            print(f"✅ Found join condition for {edge_key}: {join_clause}")
-                        path_joins.append({
-                            "source_table": source_table,
-                            "target_table": target_table,
-                            "join_clause": join_clause,
-                            "join_type": "INNER"
-                        })
-                
+                trace(_log, "🔍 TABLES TO JOIN: %s -> %s (negated: %s)", from_table, tables_to_join, negation_tables)
+
+                # Columns needed per table, from value_matches
+                columns_by_table = {}
+                for value_match in value_matches:
+                    column = value_match.get('column')
+                    if column:
+                        columns_by_table.setdefault(value_match.get('table'), {})[column] = None
+                targets = [{"table": table, "columns": list(columns_by_table.get(table, ())) or ["*"]}
+                           for table in tables_to_join]
+                negated = [{"table": table, "columns": ["*"]} for table in negation_tables]
+
+                from aivia.pathfinder import get_pathfinder_engine
+                path_plan = get_pathfinder_engine(schema=clarity_schema).complete_path(
+                    from_table, targets, optional=negated)
+                path_joins = path_plan.joins()
                 joins.extend(path_joins)
-                resolver_type = neo4j_plan.get("metadata", {}).get("resolver", "neo4j")
-                print(f"🔗 Neo4j planned joins for tables {list(tables_to_join)}: {len(path_joins)} joins (resolver: {resolver_type})")
+                trace(_log, "🔗 Planned %s joins (%s LEFT) for tables %s, negated %s (resolver: %s)",
+                      len(path_joins), sum(j['join_type'] == 'LEFT' for j in path_joins),
+                      tables_to_join, negation_tables, path_plan.resolver)
+                if path_plan.unreachable:
+                    _log.warning("No join path from %s to %s", from_table, path_plan.unreachable)
             except Exception as e:
-                print(f"[WARNING] Neo4j join planning failed: {e}")
+                _log.warning("Join planning failed: %s", e)
                 # No fallback - force proper path finding
-        
+
         # Create filters in the format expected by SQL builder
         matched_filters = []
         for match in value_matches:
@@ -683,50 +539,6 @@ def match_labels_and_filters(*, question, target_row_grain, entities, filters, f
         for nf in negation_filters:
             negation_table = nf['table']
             
-            # Plan LEFT JOIN for negation using Neo4j-based path finding
-            if negation_table != from_table:
-                try:
-                    # Build full plan structure for Neo4j resolver
-                    all_tables = [from_table, negation_table]
-                    full_plan = {
-                        "nodes": all_tables,
-                        "edges": [],  # Neo4j will discover optimal edges
-                        "edges_on": {}
-                    }
-                    
-                    # Use PathfinderEngine for negation path planning
-                    engine = get_pathfinder_engine()
-                    targets = [{"table": negation_table, "columns": ["*"]}]
-                    path_plan = engine.complete_path(from_table, targets)
-                    
-                    # Convert PathPlan to legacy format for compatibility
-                    neo4j_plan = {
-                        "nodes": path_plan.nodes,
-                        "edges": [[edge[0], edge[1]] for edge in path_plan.edges],
-                        "edges_on": path_plan.edges_on
-                    }
-                    
-                    # Convert Neo4j plan to LEFT JOIN format for negation
-                    negation_joins = []
-                    for edge in neo4j_plan.get("edges", []):
-                        if len(edge) == 2:
-                            source_table, target_table = edge
-                            join_clause = neo4j_plan.get("edges_on", {}).get(f"{source_table}->{target_table}", 
-                                                                            f"{target_table}.ID = {source_table}.ID")
-                            negation_joins.append({
-                                "source_table": source_table,
-                                "target_table": target_table,
-                                "join_clause": join_clause,
-                                "join_type": "LEFT"  # LEFT JOIN for negation logic
-                            })
-                    
-                    joins.extend(negation_joins)
-                    resolver_type = neo4j_plan.get("metadata", {}).get("resolver", "neo4j")
-                    print(f"🔗 Neo4j planned LEFT JOINs for negation {negation_table}: {len(negation_joins)} joins (resolver: {resolver_type})")
-                except Exception as e:
-                    print(f"[WARNING] Neo4j negation join planning failed: {e}")
-                    # No fallback - force proper path finding
-            
             # Create negation filter (IS NULL check)
             negation_filter = {
                 'kind': 'negation_filter',
@@ -736,7 +548,7 @@ def match_labels_and_filters(*, question, target_row_grain, entities, filters, f
                 'pattern': nf['pattern']
             }
             matched_filters.append(negation_filter)
-            print(f"🚫 Added negation filter: {negation_filter['applies_to'][0]} IS NULL")
+            trace(_log, "🚫 Added negation filter: %s IS NULL", negation_filter['applies_to'][0])
         
         # Use from_table as row_grain (no hardcoded overrides)
         row_grain = from_table
@@ -766,7 +578,7 @@ def match_labels_and_filters(*, question, target_row_grain, entities, filters, f
             "source": "schema-based"
         }
         
-        print(f"🎯 ENHANCED RESULT: {from_table} with {len(joins)} joins, {len(matched_filters)} filters")
+        trace(_log, "🎯 ENHANCED RESULT: %s with %s joins, %s filters", from_table, len(joins), len(matched_filters))
         return result
     
     # NO FALLBACKS - Fail transparently if we reach this point
@@ -840,16 +652,16 @@ def _find_best_category_table(token, entity_tokens, clarity_schema):
                 any('appointment' in token for token in entity_tokens_lower) and
                 any('referral' in token for token in entity_tokens_lower)):
                 score += 15  # Boost appointment table when both contexts are present
-                print(f"🎯 Appointment priority boost applied to {table_name}")
+                trace(_log, "🎯 Appointment priority boost applied to %s", table_name)
             
             if score > 0:
                 table_scores[table_name] = score
-                print(f"🎯 Category table scoring: {table_name} = {score} (entities: {entity_tokens})")
+                trace(_log, "🎯 Category table scoring: %s = %s (entities: %s)", table_name, score, entity_tokens)
     
     # Return the highest scoring table
     if table_scores:
         best_table = max(table_scores.keys(), key=lambda k: table_scores[k])
-        print(f"🏆 Best category table for '{token}': {best_table} (score: {table_scores[best_table]})")
+        trace(_log, "🏆 Best category table for '%s': %s (score: %s)", token, best_table, table_scores[best_table])
         return best_table
     
     # Fallback: if no context match, try to infer from token itself
@@ -871,15 +683,15 @@ def _find_best_category_table(token, entity_tokens, clarity_schema):
     if token_lower in token_hints:
         suggested_table = token_hints[token_lower]
         if clarity_schema.get('tables', {}).get(suggested_table):
-            print(f"💡 Token hint mapping: '{token}' → {suggested_table}")
+            trace(_log, "💡 Token hint mapping: '%s' → %s", token, suggested_table)
             return suggested_table
     
     # Final fallback: return first available status table
     available_status_tables = ['ZC_APPT_STATUS', 'ZC_RFL_STATUS', 'ZC_ENC_STATUS']
     for table in available_status_tables:
         if clarity_schema.get('tables', {}).get(table):
-            print(f"🔄 Fallback category table: {table}")
+            trace(_log, "🔄 Fallback category table: %s", table)
             return table
     
-    print(f"❌ No suitable category table found for '{token}' with entities {entity_tokens}")
+    trace(_log, "❌ No suitable category table found for '%s' with entities %s", token, entity_tokens)
     return None
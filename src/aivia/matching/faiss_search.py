@@ -0,0 +1,382 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+FAISS vector matching for entity and value tokens.
+
+An index directory holds one vector index per kind, each with its payloads:
+
+    <index_dir>/manifest.json           {"model": ..., "dim": ..., "kinds": [...]}
+    <index_dir>/label.faiss    + .json  payloads {"table": "Deal"}
+    <index_dir>/property.faiss + .json  payloads {"table": "Deal", "column": "amount"}
+    <index_dir>/value.faiss    + .json  payloads {"table": "Deal", "column": "stage", "value": "Evaluate"}
+    <index_dir>/embeddings.npy + .json  embedding cache: one row per text, keyed by content hash
+
+`aivia index build <use_case_dir>` (`aivia.index_builder`) writes it. Indexes
+and cached embeddings are memory-mapped on load, and query tokens already in the cache
+(schema terms, synonyms, categorical values) are served without running the model.
+
+Vectors are L2-normalised and searched by inner product, so scores are cosine similarities.
+`make_index()` builds a flat (exact) index, or for large vocabularies a CPU IVF or HNSW
+index that keeps lookups sub-millisecond.
+
+`faiss_config` (as passed to `match_labels_and_filters`):
+
+    index_dir      directory above (required for the vector path)
+    model          sentence-transformers model (default: manifest model, then DEFAULT_MODEL)
+    top_k          neighbours per token and index (default 5)
+    threshold      minimum cosine score kept (default 0.6)
+    nprobe / ef_search   IVF / HNSW search breadth
+    mmap           memory-map the index files (default True)
+    encoder        optional callable texts → float32 array, instead of loading a model
+
+Loaded handles are shared between callers and never changed by a search: `top_k`,
+`threshold`, `nprobe` and `ef_search` are read per call (`search_options()`) and reach
+FAISS as per-call `SearchParameters`.
+
+    handles = load_faiss_handles(faiss_config)
+    entity_matches, value_matches = vector_matches(handles, ["deal size"], ["evaluating"],
+                                                   **search_options(faiss_config))
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+import threading
+import numpy as np
+from aivia.tracing import trace, tracing
+
+_log = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+KINDS = ("label", "property", "value")
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+# Below this many vectors an exact flat scan is already sub-millisecond (and IVF can't train)
+MIN_APPROX_VECTORS = 1_000
+
+
+def normalize(vectors) -> np.ndarray:
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def make_index(vectors: np.ndarray, index_type: str = "flat", nlist: Optional[int] = None,
+               hnsw_m: int = 32, ef_construction: int = 80):
+    """
+    Inner-product index over normalised `vectors`: "flat" (exact), "ivf" (IVF-Flat, `nlist`
+    cells, default ~4·sqrt(n)) or "hnsw" (HNSW-Flat, `hnsw_m` links). Small inputs always get
+    a flat index.
+    """
+    import faiss
+
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"index_type must be one of {INDEX_TYPES}, got {index_type!r}")
+    n, dim = vectors.shape
+    if index_type == "flat" or n < MIN_APPROX_VECTORS:
+        index = faiss.IndexFlatIP(dim)
+    elif index_type == "ivf":
+        nlist = nlist or max(1, min(int(4 * np.sqrt(n)), n // 39))
+        index = faiss.IndexIVFFlat(faiss.IndexFlatIP(dim), dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+    else:
+        index = faiss.IndexHNSWFlat(dim, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = ef_construction
+    index.add(vectors)
+    return index
+
+
+def _search_params(index, nprobe: Optional[int], ef_search: Optional[int]):
+    """Per-call FAISS SearchParameters for `index` (None when nothing applies)."""
+    if not (nprobe or ef_search):
+        return None
+    import faiss
+
+    index = faiss.downcast_index(index)
+    if nprobe and isinstance(index, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(nprobe=int(nprobe))
+    if ef_search and isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(efSearch=int(ef_search))
+    return None
+
+
+@dataclass
+class VectorIndex:
+    """A FAISS index plus the payload dict of each vector id."""
+    index: Any
+    payloads: List[Dict[str, Any]]
+
+    def search(self, vectors: np.ndarray, top_k: int, threshold: float,
+               nprobe: Optional[int] = None, ef_search: Optional[int] = None
+               ) -> List[List[Tuple[float, Dict[str, Any]]]]:
+        """
+        Per query row: (score, payload) pairs with score >= threshold, best first.
+        `nprobe` / `ef_search` apply to this call only; the index itself is not modified.
+        """
+        if not self.payloads or len(vectors) == 0:
+            return [[] for _ in range(len(vectors))]
+        params = _search_params(self.index, nprobe, ef_search)
+        k = min(top_k, len(self.payloads))
+        scores, ids = self.index.search(vectors, k) if params is None else self.index.search(vectors, k, params=params)
+        return [[(float(s), self.payloads[i]) for s, i in zip(row_s, row_i) if i >= 0 and s >= threshold]
+                for row_s, row_i in zip(scores, ids)]
+
+
+def save_vector_index(path_prefix, vindex: VectorIndex) -> None:
+    import faiss
+
+    path_prefix = Path(path_prefix)
+    faiss.write_index(vindex.index, str(path_prefix.with_suffix(".faiss")))
+    path_prefix.with_suffix(".json").write_text(json.dumps(vindex.payloads), encoding="utf-8")
+
+
+def load_vector_index(path_prefix, mmap: bool = False) -> VectorIndex:
+    import faiss
+
+    path_prefix = Path(path_prefix)
+    flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if mmap else 0
+    index = faiss.read_index(str(path_prefix.with_suffix(".faiss")), flags)
+    payloads = json.loads(path_prefix.with_suffix(".json").read_text(encoding="utf-8"))
+    return VectorIndex(index, payloads)
+
+
+def embedding_key(model: str, text: str) -> str:
+    """Content hash identifying one text's embedding under one model."""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Persistent embedding cache: `<dir>/embeddings.npy` (one normalised row per text, loaded
+    memory-mapped) and `<dir>/embeddings.json` (model and the content key of each row).
+    """
+
+    def __init__(self, directory, model: str, mmap: bool = True):
+        self.directory = Path(directory)
+        self.model = model
+        self.rows: Dict[str, int] = {}
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        meta_path = self.directory / "embeddings.json"
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if meta.get("model") == model:
+                self.vectors = np.load(self.directory / "embeddings.npy", mmap_mode="r" if mmap else None)
+                self.rows = {key: i for i, key in enumerate(meta["keys"])}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def lookup(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Cached vector per text, None where the text has never been embedded."""
+        rows = [self.rows.get(embedding_key(self.model, t)) for t in texts]
+        return [self.vectors[i] if i is not None else None for i in rows]
+
+    def embed(self, texts: Sequence[str], encoder: Callable[[Sequence[str]], np.ndarray]) -> Tuple[np.ndarray, int]:
+        """
+        Vectors for `texts`, encoding (in one batch) only texts not cached yet; returns
+        (matrix, number encoded). New rows are kept in memory until `save()`.
+        """
+        keys = [embedding_key(self.model, t) for t in texts]
+        missing = list(dict.fromkeys(t for t, k in zip(texts, keys) if k not in self.rows))
+        if missing:
+            new = normalize(encoder(missing))
+            start = len(self.rows)
+            self.vectors = new if start == 0 else np.vstack([self.vectors, new])
+            for offset, text in enumerate(missing):
+                self.rows[embedding_key(self.model, text)] = start + offset
+        if not keys:
+            return np.zeros((0, self.vectors.shape[1] if self.vectors.size else 0), dtype=np.float32), 0
+        return np.ascontiguousarray(self.vectors[[self.rows[k] for k in keys]], dtype=np.float32), len(missing)
+
+    def save(self, keep: Optional[Sequence[str]] = None) -> None:
+        """Write the cache atomically, keeping only rows for `keep` texts if given."""
+        keys = sorted(self.rows, key=self.rows.get)
+        vectors = np.asarray(self.vectors, dtype=np.float32)
+        if keep is not None:
+            wanted = {embedding_key(self.model, t) for t in keep}
+            keys = [k for k in keys if k in wanted]
+            vectors = vectors[[self.rows[k] for k in keys]] if keys else vectors[:0]
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / "embeddings.tmp.npy"
+        np.save(tmp, vectors)
+        os.replace(tmp, self.directory / "embeddings.npy")
+        meta_tmp = self.directory / "embeddings.json.tmp"
+        meta_tmp.write_text(json.dumps({"model": self.model, "keys": keys}), encoding="utf-8")
+        os.replace(meta_tmp, self.directory / "embeddings.json")
+        self.rows = {k: i for i, k in enumerate(keys)}
+        self.vectors = vectors
+
+
+class CachedEncoder:
+    """Serves texts found in an EmbeddingStore; the model is loaded only for the first miss."""
+
+    def __init__(self, store: EmbeddingStore, load_encoder: Callable[[], Callable[[Sequence[str]], np.ndarray]]):
+        self.store = store
+        self.load_encoder = load_encoder
+        self._encoder = None
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        cached = self.store.lookup(texts)
+        missing = [t for t, v in zip(texts, cached) if v is None]
+        if missing:
+            if self._encoder is None:
+                self._encoder = self.load_encoder()
+            fresh = iter(normalize(self._encoder(missing)))
+            cached = [v if v is not None else next(fresh) for v in cached]
+        return np.asarray(cached, dtype=np.float32).reshape(len(texts), -1)
+
+
+_ENCODERS: Dict[str, Callable[[Sequence[str]], np.ndarray]] = {}
+_ENCODER_LOCK = threading.Lock()
+
+
+def get_encoder(model: str = DEFAULT_MODEL, batch_size: int = 64) -> Callable[[Sequence[str]], np.ndarray]:
+    """Batched sentence-transformers encoder (loaded once per model) returning normalised float32."""
+    with _ENCODER_LOCK:
+        encoder = _ENCODERS.get(model)
+        if encoder is None:
+            from sentence_transformers import SentenceTransformer
+            st = SentenceTransformer(model)
+
+            def encoder(texts: Sequence[str]) -> np.ndarray:
+                return normalize(st.encode(list(texts), batch_size=batch_size, convert_to_numpy=True,
+                                           normalize_embeddings=True, show_progress_bar=False))
+
+            _ENCODERS[model] = encoder
+    return encoder
+
+
+@dataclass
+class FaissHandles:
+    """Loaded indexes by kind, the query encoder and the default search settings (shared, read-only)."""
+    indexes: Dict[str, VectorIndex]
+    encoder: Callable[[Sequence[str]], np.ndarray]
+    model: str = DEFAULT_MODEL
+    top_k: int = 5
+    threshold: float = 0.6
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        return normalize(self.encoder(texts))
+
+
+_HANDLES: Dict[Tuple, FaissHandles] = {}
+_HANDLES_LOCK = threading.Lock()
+
+
+def load_faiss_handles(faiss_config: Optional[Dict[str, Any]]) -> Optional[FaissHandles]:
+    """
+    Handles for `faiss_config['index_dir']` (None without an index dir). Cached per
+    directory, manifest version and model name/path, so a rebuilt index is picked up on
+    the next call. A custom `encoder` is attached to a per-call copy that shares the
+    cached indexes, so it never leaks into another caller's handles.
+    """
+    if not faiss_config or not faiss_config.get("index_dir"):
+        return None
+    index_dir = Path(faiss_config["index_dir"])
+    manifest_path = index_dir / "manifest.json"
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"No FAISS index in {index_dir} (missing manifest.json)")
+
+    key = (str(index_dir.resolve()), manifest_path.stat().st_mtime_ns, faiss_config.get("model"))
+    with _HANDLES_LOCK:
+        handles = _HANDLES.get(key)
+    if handles is None:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        model = faiss_config.get("model") or manifest.get("model") or DEFAULT_MODEL
+        mmap = faiss_config.get("mmap", True)
+        indexes = {kind: load_vector_index(index_dir / kind, mmap=mmap)
+                   for kind in manifest.get("kinds", KINDS) if (index_dir / f"{kind}.faiss").exists()}
+        # Vocabulary embeddings come from the cache; the model loads lazily for unseen tokens
+        encoder = CachedEncoder(EmbeddingStore(index_dir, manifest.get("model") or model, mmap=mmap),
+                                lambda: get_encoder(model))
+        handles = FaissHandles(indexes, encoder, model, meta=manifest)
+        with _HANDLES_LOCK:
+            handles = _HANDLES.setdefault(key, handles)
+
+    if faiss_config.get("encoder") is not None:
+        return replace(handles, encoder=faiss_config["encoder"])
+    return handles
+
+
+def search_options(faiss_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The per-call search settings in `faiss_config`, as keyword arguments for `vector_matches`."""
+    faiss_config = faiss_config or {}
+    options = {}
+    if faiss_config.get("top_k") is not None:
+        options["top_k"] = int(faiss_config["top_k"])
+    if faiss_config.get("threshold") is not None:
+        options["threshold"] = float(faiss_config["threshold"])
+    for name in ("nprobe", "ef_search"):
+        if faiss_config.get(name):
+            options[name] = int(faiss_config[name])
+    return options
+
+
+def vector_matches(handles: FaissHandles, entity_tokens: Sequence[str], value_tokens: Sequence[str],
+                   top_k: Optional[int] = None, threshold: Optional[float] = None,
+                   nprobe: Optional[int] = None, ef_search: Optional[int] = None
+                   ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Embed all tokens in one batch and search: entity tokens against the label and property
+    indexes, value tokens against the categorical-value index. Returns (entity_matches,
+    value_matches) in the matcher's dict format, best score first, one entry per table /
+    (table, column, value). Search settings default to the handles' and apply to this call only.
+    """
+    tokens = list(entity_tokens) + list(value_tokens)
+    if not tokens:
+        return [], []
+    top_k = handles.top_k if top_k is None else top_k
+    threshold = handles.threshold if threshold is None else threshold
+    vectors = handles.encode(tokens)
+    entity_vecs, value_vecs = vectors[:len(entity_tokens)], vectors[len(entity_tokens):]
+    traced = tracing(_log)
+
+    entities: Dict[str, Dict[str, Any]] = {}
+    for kind in ("label", "property"):
+        vindex = handles.indexes.get(kind)
+        if vindex is None:
+            continue
+        for token, hits in zip(entity_tokens, vindex.search(entity_vecs, top_k, threshold, nprobe, ef_search)):
+            for score, payload in hits:
+                table = payload["table"]
+                if table not in entities or score > entities[table]["score"]:
+                    entities[table] = {"table": table, "score": score, "type": "table", "source": "faiss",
+                                       "token": token, **({"column": payload["column"]} if kind == "property" else {})}
+                if traced:
+                    trace(_log, "🧭 FAISS %s match: '%s' → %s (%.3f)", kind, token, payload, score)
+
+    values: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    vindex = handles.indexes.get("value")
+    if vindex is not None:
+        for token, hits in zip(value_tokens, vindex.search(value_vecs, top_k, threshold, nprobe, ef_search)):
+            for score, payload in hits:
+                key = (payload["table"], payload["column"], payload["value"])
+                if key not in values or score > values[key]["score"]:
+                    values[key] = {"table": key[0], "column": key[1], "value": key[2], "score": score,
+                                   "type": "category_value", "source": "faiss", "token": token}
+                if traced:
+                    trace(_log, "🧭 FAISS value match: '%s' → %s (%.3f)", token, payload, score)
+
+    by_score = lambda m: -m["score"]
+    return sorted(entities.values(), key=by_score), sorted(values.values(), key=by_score)
+
+
+def merge_matches(schema_matches: List[Dict[str, Any]], vector_hits: List[Dict[str, Any]],
+                  key: Callable[[Dict[str, Any]], Any]) -> List[Dict[str, Any]]:
+    """
+    Schema matches first (their order picks the main table), then vector hits not already
+    matched; a vector hit on an already-matched key raises that match's score if higher.
+    """
+    merged = [dict(m) for m in schema_matches]
+    position = {key(m): i for i, m in enumerate(merged)}
+    for hit in vector_hits:
+        k = key(hit)
+        if k in position:
+            existing = merged[position[k]]
+            existing["score"] = max(existing["score"], hit["score"])
+        else:
+            position[k] = len(merged)
+            merged.append(hit)
+    return merged
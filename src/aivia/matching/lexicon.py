@@ -0,0 +1,81 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Precomputed medical-concept lexicon for value-token lookup.
+
+`_find_medical_concept_with_variations` used to walk every concept and synonym, lower-casing
+each again, up to 21 times per token (plain token, then each stripped and each added
+suffix). `ConceptLexicon` lower-cases every term once and indexes it in a
+`SubstringIndex` (exact-term hash map + 3-gram postings), so each strategy is a lookup:
+
+1. token inside a term, or a term inside the token
+2. token minus a medical suffix (`diabetic` → `diabet`) inside a term
+3. token plus a medical suffix, either direction
+
+Each step returns the *first* concept in registry order that satisfies it, exactly as the
+scans did, and suffixes are tried in the same order.
+
+    lexicon = get_concept_lexicon(registry)   # built once, rebuilt if the concepts change
+    concept = lexicon.find("diabetic")
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import threading
+from aivia.matching.schema_index import SubstringIndex
+
+MEDICAL_SUFFIXES = ('ic', 'tic', 'al', 'ous', 'ive', 'ism', 'osis', 'itis', 'emia', 'uria')
+
+
+class ConceptLexicon:
+    """Concepts (objects with `preferred_term` and `synonyms`) indexed by lower-cased term."""
+
+    def __init__(self, concepts: Sequence[Any]):
+        self.concepts: List[Any] = list(concepts)
+        # No trie: at terminology scale it costs far more memory than hashing token substrings
+        self.terms = SubstringIndex(trie=False)
+        for ordinal, concept in enumerate(self.concepts):
+            self.terms.add(concept.preferred_term, ordinal)
+            for synonym in concept.synonyms:
+                self.terms.add(synonym, ordinal)
+
+    def __len__(self) -> int:
+        return len(self.terms.first)
+
+    def find(self, token: str) -> Optional[Any]:
+        """First concept matching the token directly, by stem, or with a suffix added."""
+        token_lower = token.lower()
+        ordinal = self.terms.first_match(token_lower)
+
+        if ordinal is None:
+            for suffix in MEDICAL_SUFFIXES:
+                if token_lower.endswith(suffix) and len(token_lower) > len(suffix) + 2:
+                    ordinal = self.terms.containing(token_lower[:-len(suffix)])
+                    if ordinal is not None:
+                        break
+
+        if ordinal is None:
+            for suffix in MEDICAL_SUFFIXES:
+                ordinal = self.terms.first_match(token_lower + suffix)
+                if ordinal is not None:
+                    break
+
+        return self.concepts[ordinal] if ordinal is not None else None
+
+
+_LOCK = threading.Lock()
+_LEXICONS: Dict[int, Tuple[Any, Any, int, ConceptLexicon]] = {}
+
+
+def get_concept_lexicon(registry) -> ConceptLexicon:
+    """
+    The lexicon for `registry._medical_concepts`, built on first use and rebuilt when the
+    registry's concept mapping is replaced or changes size.
+    """
+    concepts = getattr(registry, '_medical_concepts', {})
+    key = id(registry)
+    with _LOCK:
+        hit = _LEXICONS.get(key)
+    if hit is not None and hit[0] is registry and hit[1] is concepts and hit[2] == len(concepts):
+        return hit[3]
+    lexicon = ConceptLexicon(concepts.values())
+    with _LOCK:
+        _LEXICONS[key] = (registry, concepts, len(concepts), lexicon)
+    return lexicon
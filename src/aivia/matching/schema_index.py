@@ -0,0 +1,251 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Precompiled lookups over a Clarity-style schema for the label/filter matcher.
+
+The matcher used to rescan every table, alias and column of `clarity_schema['tables']`
+for every token of every question. `SchemaIndex` does that work once per schema:
+
+- alias / table-name matching ("token in alias or alias in token"): aliases contained in
+  the token come from a trie walk over the token, aliases containing the token from an
+  n-gram posting index; both return the *first* table in schema order, as the scans did
+- semantic indicator → table map from the pattern registry (built once per registry)
+- primary key per table and the diagnosis (table, column) pair
+
+    index = get_schema_index(clarity_schema)
+    index.match_table("referrals")   # first table whose aliases/name overlap the token
+    index.diagnosis                  # {"table", "column", "score", "reason"} or None
+
+Indexes are cached per schema object; call `clear_schema_indexes()` after mutating a
+schema dict in place.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+import threading
+
+_MAX_GRAM = 3
+_END = None  # trie key marking the end of an alias
+
+# Fallback primary keys for tables without an explicit `primary_key`
+PK_PATTERNS = {
+    'PAT_ENC': 'PAT_ENC_CSN_ID',
+    'REFERRAL': 'REFERRAL_ID',
+    'PATIENT': 'PAT_ID',
+    'CLARITY_SER': 'PROV_ID'
+}
+DIAGNOSIS_KEYWORDS = ['diagnosis', 'diagnostic', 'condition', 'disease', 'medical', 'clinical']
+TEXT_COLUMN_INDICATORS = ['name', 'desc', 'description', 'text', 'title', 'label']
+
+
+class SubstringIndex:
+    """
+    Lowercased keys, each tagged with the ordinal of its first owner (table, concept, ...),
+    answering "smallest ordinal whose key k satisfies `token in k or k in token`" without a scan.
+
+    Keys must be added in non-decreasing ordinal order (schema order). `trie=False` drops
+    the character trie (keys inside the token are then found by hashing the token's
+    substrings), which keeps very large vocabularies small.
+    """
+
+    def __init__(self, trie: bool = True):
+        self.first: Dict[str, int] = {}
+        self.trie: Optional[Dict[Any, Any]] = {} if trie else None
+        self.short: Dict[str, int] = {}        # 1-2-gram → first ordinal of a key containing it
+        self.grams: Dict[str, List[str]] = {}  # 3-gram → keys containing it, in ordinal order
+
+    def add(self, key: str, ordinal: int) -> None:
+        key = key.lower()
+        if key in self.first:
+            return
+        self.first[key] = ordinal
+        if self.trie is not None:
+            node = self.trie
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[_END] = ordinal
+        for n in range(1, _MAX_GRAM):
+            for i in range(len(key) - n + 1):
+                self.short.setdefault(key[i:i + n], ordinal)
+        for gram in dict.fromkeys(key[i:i + _MAX_GRAM] for i in range(len(key) - _MAX_GRAM + 1)):
+            self.grams.setdefault(gram, []).append(key)
+
+    def contained(self, token: str) -> Optional[int]:
+        """Smallest ordinal of a key that occurs inside `token` (lowercased)."""
+        best = None
+        if self.trie is None:
+            first = self.first
+            for i in range(len(token) + 1):
+                for j in range(i, len(token) + 1):
+                    ordinal = first.get(token[i:j])
+                    if ordinal is not None and (best is None or ordinal < best):
+                        best = ordinal
+            return best
+        best = self.trie.get(_END)
+        for i in range(len(token)):
+            node = self.trie
+            for ch in token[i:]:
+                node = node.get(ch)
+                if node is None:
+                    break
+                end = node.get(_END)
+                if end is not None and (best is None or end < best):
+                    best = end
+        return best
+
+    def containing(self, token: str, below: Optional[int] = None) -> Optional[int]:
+        """Smallest ordinal (< `below`, if given) of a key that contains `token` (lowercased)."""
+        if not self.first:
+            return None
+        if not token:  # "" is in every key
+            ordinal = min(self.first.values())
+        elif len(token) < _MAX_GRAM:
+            ordinal = self.short.get(token)
+        else:
+            grams = {token[i:i + _MAX_GRAM] for i in range(len(token) - _MAX_GRAM + 1)}
+            postings = [self.grams.get(g) for g in grams]
+            ordinal = None
+            if all(postings):
+                # Candidates share the token's rarest 3-gram; verified in ordinal order
+                for key in min(postings, key=len):
+                    candidate = self.first[key]
+                    if below is not None and candidate >= below:
+                        break
+                    if len(token) == _MAX_GRAM or token in key:
+                        ordinal = candidate
+                        break
+        if ordinal is not None and below is not None and ordinal >= below:
+            return None
+        return ordinal
+
+    def first_match(self, token: str) -> Optional[int]:
+        token = token.lower()
+        best = self.contained(token)
+        other = self.containing(token, below=best)
+        return other if other is not None else best
+
+
+def _primary_key(table_name: str, table_info: Dict[str, Any]) -> str:
+    if 'primary_key' in table_info:
+        return table_info['primary_key']
+    if table_name in PK_PATTERNS:
+        return PK_PATTERNS[table_name]
+    for col in table_info.get('columns_priority', []):
+        col_name = col.get('name', '')
+        if col_name.endswith('_ID') or col_name == 'ID':
+            return col_name
+    return 'ID'
+
+
+def _diagnosis_column(tables: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Highest-scoring (table, column) for diagnosis text; earliest wins ties."""
+    best = None
+    for table_name, table_info in tables.items():
+        description = table_info.get('description', '').lower()
+        aliases = [alias.lower() for alias in table_info.get('aliases', [])]
+        diagnosis_score = 0
+        for keyword in DIAGNOSIS_KEYWORDS:
+            if keyword in description:
+                diagnosis_score += 2
+            diagnosis_score += sum(1 for alias in aliases if keyword in alias)
+
+        for col in table_info.get('columns_priority', []):
+            col_name = col.get('name', '').lower()
+            col_desc = col.get('description', '').lower()
+            text_score = 0
+            for indicator in TEXT_COLUMN_INDICATORS:
+                if indicator in col_name:
+                    text_score += 2
+                if indicator in col_desc:
+                    text_score += 1
+            total_score = diagnosis_score + text_score
+            if total_score > 0 and (best is None or total_score > best['score']):
+                best = {
+                    'table': table_name,
+                    'column': col['name'],
+                    'score': total_score,
+                    'reason': f"diagnosis_score={diagnosis_score}, text_score={text_score}"
+                }
+    return best
+
+
+class SchemaIndex:
+    """Everything the matcher looks up in a schema, computed once."""
+
+    def __init__(self, clarity_schema: Dict[str, Any]):
+        self.schema = clarity_schema
+        tables = (clarity_schema or {}).get('tables') or {}
+        self.tables: List[str] = list(tables)
+        self.names = SubstringIndex()    # aliases + table name (entity token → table)
+        self.aliases = SubstringIndex()  # aliases only (negated concept → table fallback)
+        self.primary_keys: Dict[str, str] = {}
+        for ordinal, (table_name, table_info) in enumerate(tables.items()):
+            if isinstance(table_info, dict) and 'aliases' in table_info:
+                for alias in table_info['aliases']:
+                    self.names.add(alias, ordinal)
+                    self.aliases.add(alias, ordinal)
+            self.names.add(table_name, ordinal)
+            self.primary_keys[table_name] = _primary_key(table_name, table_info)
+        self.diagnosis = _diagnosis_column(tables)
+        self._concepts: Optional[Tuple[Any, Dict[str, str]]] = None
+
+    def match_table(self, token: str) -> Optional[str]:
+        """First table whose aliases or name contain / are contained in the token."""
+        ordinal = self.names.first_match(token)
+        return self.tables[ordinal] if ordinal is not None else None
+
+    def primary_key(self, table_name: str) -> str:
+        if table_name in self.primary_keys:
+            return self.primary_keys[table_name]
+        return PK_PATTERNS.get(table_name, 'ID')
+
+    def concept_tables(self, registry) -> Dict[str, str]:
+        """Semantic indicator (and its plural) → table, from the registry's entity types."""
+        cached = self._concepts
+        if cached is not None and cached[0] is registry:
+            return cached[1]
+        registry.discover_entities_from_schema(self.schema)
+        mapping: Dict[str, str] = {}
+        for table_name, table_info in self.schema['tables'].items():
+            column_names = [col.get('name', '') for col in table_info.get('columns_priority', [])]
+            entity_type = registry.find_entity_type_from_schema(table_name, column_names)
+            if entity_type:
+                for indicator in registry.get_semantic_indicators(entity_type):
+                    mapping[indicator] = table_name
+                    mapping[indicator + 's'] = table_name
+        self._concepts = (registry, mapping)
+        return mapping
+
+    def table_for_concept(self, concept: str, registry) -> Optional[str]:
+        """Indicator map first, then the first table with an alias overlapping the concept."""
+        concept_lower = concept.lower()
+        mapping = self.concept_tables(registry)
+        if concept_lower in mapping:
+            return mapping[concept_lower]
+        ordinal = self.aliases.first_match(concept_lower)
+        return self.tables[ordinal] if ordinal is not None else None
+
+
+_LOCK = threading.Lock()
+_INDEXES: "OrderedDict[int, Tuple[Dict[str, Any], SchemaIndex]]" = OrderedDict()
+_MAX_INDEXES = 8
+
+
+def get_schema_index(clarity_schema: Dict[str, Any]) -> SchemaIndex:
+    """The SchemaIndex for this schema object, built on first use (small LRU by identity)."""
+    key = id(clarity_schema)
+    with _LOCK:
+        hit = _INDEXES.get(key)
+        if hit is not None and hit[0] is clarity_schema:
+            _INDEXES.move_to_end(key)
+            return hit[1]
+    index = SchemaIndex(clarity_schema)
+    with _LOCK:
+        _INDEXES[key] = (clarity_schema, index)  # holding the schema keeps its id from being reused
+        _INDEXES.move_to_end(key)
+        while len(_INDEXES) > _MAX_INDEXES:
+            _INDEXES.popitem(last=False)
+    return index
+
+
+def clear_schema_indexes() -> None:
+    with _LOCK:
+        _INDEXES.clear()
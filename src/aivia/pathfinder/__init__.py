@@ -0,0 +1,6 @@
+# SPDX-License-Identifier: Apache-2.0
+from .engine import (PathfinderEngine, PathPlan, clear_pathfinder_engines, default_schema_path, edges_from_joins,
+                     get_pathfinder_engine)
+
+__all__ = ["PathfinderEngine", "PathPlan", "clear_pathfinder_engines", "default_schema_path", "edges_from_joins",
+           "get_pathfinder_engine"]
@@ -0,0 +1,378 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Schema-graph path resolver: which edges connect a row grain to every label a question needs.
+
+Built once from the `edges` list of `schema.yaml`, or the `joins` of a Clarity-style schema
+(edges are traversable both ways):
+
+- all-pairs shortest paths over the label graph (BFS from every label), stored as dense
+  distance / predecessor tables (one `array('i')` row per label, no numpy needed), so any
+  label-to-label path is a table walk
+- `complete_path(row_grain, targets)` joins the row grain and all targets with a Steiner
+  tree approximation (Kou–Markowsky–Berman: MST of the terminals' metric closure, expanded
+  into shortest paths, re-spanned from the row grain and pruned to terminal leaves; the row
+  grain's shortest-path tree when that is smaller), read straight off those matrices;
+  results are memoized per (row grain, targets)
+
+    engine = get_pathfinder_engine()                 # AIVIA_SCHEMA, else the Sales CRM schema
+    engine = get_pathfinder_engine(schema=clarity_schema)  # in-memory schema, cached per object
+    plan = engine.complete_path("Deal", ["Contact", "Activity"])
+    plan.edges      # [("Deal", "Account"), ("Deal", "Activity"), ("Account", "Contact")]
+    plan.patterns() # ["Account-[:HAS_DEAL]->Deal", "Deal-[:HAS_ACTIVITY]->Activity", ...]
+
+Negated targets go in the same call as `optional=`: the tree spans both, edges that only
+lead to optional targets are LEFT joins, and prefixes shared with required targets stay a
+single INNER join (`plan.joins()` gives the matcher's join dicts).
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from array import array
+from pathlib import Path
+import os
+import threading
+
+# Edges of use_cases/sales_crm/schema.yaml, used when no schema file can be found
+SALES_CRM_SCHEMA_EDGES = [
+    {"from": "Account", "rel": "HAS_DEAL", "to": "Deal", "via_fk": "Deal.account_id"},
+    {"from": "Deal", "rel": "HAS_ACTIVITY", "to": "Activity", "via_fk": "Activity.deal_id"},
+    {"from": "Deal", "rel": "OWNED_BY", "to": "User", "via_fk": "Deal.owner_id"},
+    {"from": "Contact", "rel": "BELONGS_TO", "to": "Account", "via_fk": "Contact.account_id"},
+]
+_UNREACHABLE = -1
+
+Target = Union[str, Dict[str, Any]]
+
+
+@dataclass
+class PathPlan:
+    """
+    A join tree rooted at the row grain. `edges` are (parent, child) pairs in join order
+    (every parent is already joined), `edges_on` maps "parent->child" to its join condition
+    and `rels` holds the schema edge (from, rel, to) behind each tree edge. `join_types` maps
+    "parent->child" to INNER, or LEFT for edges leading only to optional targets; INNER edges
+    always come before LEFT ones.
+    """
+    row_grain: str
+    nodes: List[str]
+    edges: List[Tuple[str, str]]
+    edges_on: Dict[str, str]
+    rels: List[Tuple[str, str, str]]
+    cost: float
+    resolver: str = "apsp-steiner"
+    explanation: List[str] = field(default_factory=list)
+    unreachable: List[str] = field(default_factory=list)
+    join_types: Dict[str, str] = field(default_factory=dict)
+
+    def joins(self) -> List[Dict[str, str]]:
+        """Tree edges as `{source_table, target_table, join_clause, join_type}` dicts."""
+        return [{"source_table": src, "target_table": dst, "join_clause": self.edges_on[f"{src}->{dst}"],
+                 "join_type": self.join_types.get(f"{src}->{dst}", "INNER")} for src, dst in self.edges]
+
+    def patterns(self) -> List[str]:
+        """Each tree edge as a Cypher relationship pattern, in schema direction."""
+        return [f"{src}-[:{rel}]->{dst}" for src, rel, dst in self.rels]
+
+
+def _target_label(target: Target) -> str:
+    return target.get("table") or target.get("label") if isinstance(target, dict) else target
+
+
+class PathfinderEngine:
+    """Precomputed shortest paths and memoized Steiner join trees over one schema graph."""
+
+    def __init__(self, edges: Sequence[Dict[str, Any]], labels: Iterable[str] = (), memo_size: int = 4096):
+        self.labels: List[str] = list(dict.fromkeys(list(labels) + [e[k] for e in edges for k in ("from", "to")]))
+        self.ids = {label: i for i, label in enumerate(self.labels)}
+        self._by_lower = {label.lower(): label for label in self.labels}
+        self._edge: Dict[Tuple[int, int], Dict[str, Any]] = {}  # either direction → first schema edge
+        adjacency: List[List[int]] = [[] for _ in self.labels]
+        for e in edges:
+            a, b = self.ids[e["from"]], self.ids[e["to"]]
+            if a == b or (a, b) in self._edge:
+                continue
+            self._edge[(a, b)] = self._edge[(b, a)] = e
+            adjacency[a].append(b)
+            adjacency[b].append(a)
+        self.adjacency = adjacency
+        self.dist, self.pred = self._all_pairs(adjacency)
+        self._memo: "OrderedDict[Tuple[int, Tuple[int, ...]], PathPlan]" = OrderedDict()
+        self._memo_size = memo_size
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    @classmethod
+    def from_schema(cls, schema: Dict[str, Any], **kwargs) -> "PathfinderEngine":
+        """
+        From a `schema.yaml`-style dict (`labels` + `edges`) or a Clarity-style one
+        (`tables` + `joins` with `left_table` / `right_table`).
+        """
+        edges = schema.get("edges") or edges_from_joins(schema.get("joins") or [])
+        labels = list(schema.get("labels") or {}) + list(schema.get("tables") or {})
+        return cls(edges, labels, **kwargs)
+
+    @classmethod
+    def from_schema_file(cls, path, **kwargs) -> "PathfinderEngine":
+        import yaml
+        with open(path, encoding="utf-8") as f:
+            return cls.from_schema(yaml.safe_load(f) or {}, **kwargs)
+
+    @staticmethod
+    def _all_pairs(adjacency: List[List[int]]) -> Tuple[List[array], List[array]]:
+        """BFS from every label: hop distances and the predecessor of each label on the path."""
+        n = len(adjacency)
+        dist, pred = [], []
+        for source in range(n):
+            d = [_UNREACHABLE] * n
+            p = [_UNREACHABLE] * n
+            d[source] = 0
+            queue = deque([source])
+            while queue:
+                u = queue.popleft()
+                du = d[u] + 1
+                for v in adjacency[u]:
+                    if d[v] == _UNREACHABLE:
+                        d[v] = du
+                        p[v] = u
+                        queue.append(v)
+            dist.append(array("i", d))
+            pred.append(array("i", p))
+        return dist, pred
+
+    def label(self, name: str) -> str:
+        """Canonical label for `name` (case-insensitive); KeyError if not in the schema."""
+        label = self._by_lower.get(str(name).lower())
+        if label is None:
+            raise KeyError(f"{name!r} is not a label of the schema graph")
+        return label
+
+    def distance(self, a: str, b: str) -> Optional[int]:
+        d = self.dist[self.ids[self.label(a)]][self.ids[self.label(b)]]
+        return None if d == _UNREACHABLE else d
+
+    def _walk(self, source: int, target: int) -> List[int]:
+        """Label ids from `source` to `target` along the precomputed shortest path."""
+        if self.dist[source][target] == _UNREACHABLE:
+            return []
+        pred = self.pred[source]
+        path = [target]
+        while path[-1] != source:
+            path.append(pred[path[-1]])
+        return path[::-1]
+
+    def shortest_path(self, a: str, b: str) -> List[str]:
+        return [self.labels[i] for i in self._walk(self.ids[self.label(a)], self.ids[self.label(b)])]
+
+    def complete_path(self, row_grain: str, targets: Sequence[Target], optional: Sequence[Target] = ()
+                      ) -> PathPlan:
+        """
+        Join tree connecting `row_grain` to every target and every optional (LEFT-joined)
+        target, given as label names or {"table": ...} dicts; unknown or unreachable targets
+        are reported in `plan.unreachable`.
+        """
+        root = self.ids[self.label(row_grain)]
+        unreachable: List[str] = []
+        required = self._resolve(root, targets, unreachable)
+        key = (root, tuple(sorted(required)), tuple(sorted(self._resolve(root, optional, unreachable) - required)))
+        with self._lock:
+            plan = self._memo.get(key)
+            if plan is not None:
+                self._memo.move_to_end(key)
+                self.hits += 1
+        if plan is None:
+            plan = self._steiner(root, key[1], key[2])
+            with self._lock:
+                self.misses += 1
+                self._memo[key] = plan
+                while len(self._memo) > self._memo_size:
+                    self._memo.popitem(last=False)
+        if unreachable:
+            plan = PathPlan(plan.row_grain, plan.nodes, plan.edges, plan.edges_on, plan.rels, plan.cost,
+                            plan.resolver, plan.explanation + [f"unreachable from {plan.row_grain}: {unreachable}"],
+                            unreachable, plan.join_types)
+        return plan
+
+    def _resolve(self, root: int, targets: Sequence[Target], unreachable: List[str]) -> set:
+        ids = set()
+        for target in targets:
+            name = _target_label(target)
+            label = self._by_lower.get(str(name).lower())
+            if label is None or self.dist[root][self.ids[label]] == _UNREACHABLE:
+                unreachable.append(name)
+            elif self.ids[label] != root:
+                ids.add(self.ids[label])
+        return ids
+
+    def _steiner(self, root: int, required: Tuple[int, ...], optional: Tuple[int, ...] = ()) -> PathPlan:
+        targets = required + optional
+        terminals = set(targets) | {root}
+        # KMB: Prim's MST over the terminals' metric closure (distances from the APSP table),
+        # each closure edge expanded into its shortest path
+        kmb: Dict[int, set] = {}
+        best = {t: (self.dist[root][t], root) for t in targets}
+        while best:
+            t = min(best, key=lambda x: (best[x][0], x))
+            _, parent = best.pop(t)
+            self._add_path(kmb, parent, t)
+            for other in best:
+                d = self.dist[t][other]
+                if d < best[other][0]:
+                    best[other] = (d, t)
+        # KMB is a 2-approximation; the row grain's shortest-path tree sometimes beats it
+        spt: Dict[int, set] = {}
+        for t in targets:
+            self._add_path(spt, root, t)
+        candidates = [self._prune(root, union, terminals) for union in (kmb, spt)]
+        order, parent_of, keep = min(candidates, key=lambda c: len(c[2]))
+
+        # edges on the way to a required target are INNER; the rest only serve optional targets
+        inner = set()
+        for v in required:
+            while v != root and v not in inner:
+                inner.add(v)
+                v = parent_of[v]
+        tree = [v for v in order[1:] if v in keep]
+        tree.sort(key=lambda v: v not in inner)  # stable: parents still precede children
+
+        nodes = [self.labels[v] for v in order if v in keep]
+        edges, edges_on, rels, join_types = [], {}, [], {}
+        for v in tree:
+            p = parent_of[v]
+            e = self._edge[(p, v)]
+            parent, child = self.labels[p], self.labels[v]
+            edges.append((parent, child))
+            edges_on[f"{parent}->{child}"] = _join_condition(e)
+            join_types[f"{parent}->{child}"] = "INNER" if v in inner else "LEFT"
+            rels.append((e["from"], e["rel"], e["to"]))
+        explanation = [f"steiner tree over {len(terminals)} terminal(s): {len(edges)} edge(s), "
+                       f"{len(edges) - len(inner)} LEFT"]
+        if inner & set(optional):
+            explanation.append("optional target(s) on the way to a required one are INNER-joined: "
+                               f"{[self.labels[v] for v in sorted(inner & set(optional))]}")
+        return PathPlan(self.labels[root], nodes, edges, edges_on, rels, float(len(edges)),
+                        explanation=explanation, join_types=join_types)
+
+    def _add_path(self, union: Dict[int, set], source: int, target: int) -> None:
+        path = self._walk(source, target)
+        for a, b in zip(path, path[1:]):
+            union.setdefault(a, set()).add(b)
+            union.setdefault(b, set()).add(a)
+
+    @staticmethod
+    def _prune(root: int, union: Dict[int, set], terminals: set) -> Tuple[List[int], Dict[int, int], set]:
+        """Span `union` from the root (drops cycles), then cut leaves that aren't terminals."""
+        parent_of, order = {root: None}, [root]
+        queue = deque([root])
+        while queue:
+            u = queue.popleft()
+            for v in sorted(union.get(u, ())):
+                if v not in parent_of:
+                    parent_of[v] = u
+                    order.append(v)
+                    queue.append(v)
+        keep = set(order)
+        children: Dict[int, int] = {}
+        for v in order[1:]:
+            children[parent_of[v]] = children.get(parent_of[v], 0) + 1
+        for v in reversed(order):
+            if v not in terminals and children.get(v, 0) == 0:
+                keep.discard(v)
+                children[parent_of[v]] -= 1
+        return order, parent_of, keep
+
+    def cache_info(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._memo), "labels": len(self.labels)}
+
+
+def edges_from_joins(joins: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Clarity-style joins as schema edges. The condition comes from `on` / `join_clause` /
+    `condition`, else from `left_column` / `right_column`.
+    """
+    edges = []
+    for join in joins:
+        left, right = join.get("left_table"), join.get("right_table")
+        if not left or not right:
+            continue
+        on = join.get("on") or join.get("join_clause") or join.get("condition")
+        if not on and join.get("left_column") and join.get("right_column"):
+            on = f"{left}.{join['left_column']} = {right}.{join['right_column']}"
+        edges.append({"from": left, "rel": join.get("rel") or "JOINS", "to": right, "on": on})
+    return edges
+
+
+def _join_condition(edge: Dict[str, Any]) -> str:
+    """The edge's own `on`, else `Deal.account_id = Account.id` for an edge derived from FK `Deal.account_id`."""
+    if edge.get("on"):
+        return edge["on"]
+    via_fk = edge.get("via_fk")
+    if via_fk and "." in via_fk:
+        fk_label = via_fk.split(".", 1)[0]
+        other = edge["to"] if fk_label == edge["from"] else edge["from"]
+        return f"{via_fk} = {other}.id"
+    return f"{edge['to']}.id = {edge['from']}.id"
+
+
+def default_schema_path() -> Optional[Path]:
+    """$AIVIA_SCHEMA, else the Sales CRM schema of a source checkout (None if neither exists)."""
+    env = os.getenv("AIVIA_SCHEMA")
+    if env:
+        return Path(env)
+    candidate = Path(__file__).resolve().parents[3] / "use_cases" / "sales_crm" / "schema.yaml"
+    return candidate if candidate.exists() else None
+
+
+_ENGINES: Dict[Optional[str], Tuple[Any, PathfinderEngine]] = {}
+_SCHEMA_ENGINES: "OrderedDict[int, Tuple[Any, PathfinderEngine]]" = OrderedDict()
+_MAX_SCHEMA_ENGINES = 8
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_pathfinder_engine(schema_path=None, schema: Optional[Dict[str, Any]] = None,
+                          edges: Optional[Sequence[Dict[str, Any]]] = None) -> PathfinderEngine:
+    """
+    Shared engine for a schema given as an in-memory `schema` dict (`schema.yaml` or
+    Clarity style, see `PathfinderEngine.from_schema`), an `edges` list, or a file
+    (`schema_path`, default: `default_schema_path()`).
+
+    In-memory schemas are cached per object, like `get_schema_index`; call
+    `clear_pathfinder_engines()` after mutating one in place. Files are rebuilt when they
+    change. Without any schema, the built-in Sales CRM edges are used.
+    """
+    if schema is not None or edges is not None:
+        source = schema if schema is not None else edges
+        key = id(source)
+        with _ENGINES_LOCK:
+            hit = _SCHEMA_ENGINES.get(key)
+            if hit is not None and hit[0] is source:
+                _SCHEMA_ENGINES.move_to_end(key)
+                return hit[1]
+        engine = PathfinderEngine.from_schema(schema) if schema is not None else PathfinderEngine(edges)
+        with _ENGINES_LOCK:
+            _SCHEMA_ENGINES[key] = (source, engine)  # holding the source keeps its id from being reused
+            _SCHEMA_ENGINES.move_to_end(key)
+            while len(_SCHEMA_ENGINES) > _MAX_SCHEMA_ENGINES:
+                _SCHEMA_ENGINES.popitem(last=False)
+        return engine
+
+    path = Path(schema_path) if schema_path else default_schema_path()
+    key = str(path.resolve()) if path else None
+    fingerprint = None
+    if path is not None:
+        st = path.stat()
+        fingerprint = (st.st_mtime_ns, st.st_size)
+    with _ENGINES_LOCK:
+        hit = _ENGINES.get(key)
+        if hit is not None and hit[0] == fingerprint:
+            return hit[1]
+    engine = PathfinderEngine.from_schema_file(path) if path else PathfinderEngine(SALES_CRM_SCHEMA_EDGES)
+    with _ENGINES_LOCK:
+        _ENGINES[key] = (fingerprint, engine)
+    return engine
+
+
+def clear_pathfinder_engines() -> None:
+    with _ENGINES_LOCK:
+        _ENGINES.clear()
+        _SCHEMA_ENGINES.clear()
@@ -3,32 +3,245 @@
 Public entrypoint for AIVIA NL→Cypher→Results.
 Swap the TODOs with your existing matcher / path / builder modules.
 """
-from typing import Dict, Any, Tuple, List
-import pandas as pd
-from neo4j import GraphDatabase
+from typing import TYPE_CHECKING, Dict, Any, Iterator, Tuple, List, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from operator import itemgetter
+import re
+import threading
+import time
+import weakref
 from .adapters.matcher_adapter import match_concepts_adapter
+from .cache import PlanCache, ResultCache, normalize_question, query_key
+from .telemetry import StageTimer, get_tracer, server_timings
+from .tracing import collect_trace
+
+if TYPE_CHECKING:  # pandas/numpy load on the first DataFrame (see _columnar_frame), not at import
+    import pandas as pd
+
+# Declared dtypes for the templates' RETURN aliases (every template uses the same aliases);
+# columns not listed here stay object.
+RESULT_DTYPES: Dict[str, str] = {
+    "amount": "float64",
+    "stage": "category",
+    "created": "datetime64",
+}
+
+# `date(d.created_date)`-style casts of stored string dates; native-date graphs compare directly
+_DATE_CAST = re.compile(r"\bdate\((\w+\.\w+)\)")
+
+
+def _columnar_frame(columns: Sequence[str], records: Sequence[Sequence[Any]]) -> "pd.DataFrame":
+    """
+    Build a DataFrame from record value tuples in one step.
+
+    Records are split into per-column arrays and each array is created directly with
+    its declared dtype, instead of building a dict per row and letting pandas infer.
+    """
+    import numpy as np
+    import pandas as pd
+
+    data = {}
+    for i, name in enumerate(columns):
+        values = list(map(itemgetter(i), records))
+        dtype = RESULT_DTYPES.get(name)
+        if dtype == "category":
+            data[name] = pd.Categorical(values)
+        elif dtype == "datetime64":
+            first = next((v for v in values if v is not None), None)
+            if hasattr(first, "to_native"):  # neo4j.time.Date from native-date graphs
+                values = [v.to_native() if v is not None else None for v in values]
+            data[name] = pd.to_datetime(values, errors="coerce")
+        elif dtype is not None:
+            try:
+                data[name] = np.asarray(values, dtype=dtype)  # None -> NaN
+            except (TypeError, ValueError):
+                data[name] = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype)
+        else:
+            data[name] = values if values else np.empty(0, dtype=object)
+    return pd.DataFrame(data, columns=list(columns))
+
 
 class AiviaEngine:
-    def __init__(self, driver, schema_index=None, value_index=None):
+    """
+    NL→Cypher→Results engine.
+
+    Args:
+        native_dates: the graph stores dates as Neo4j DATE values (loaded with
+            `native_dates=True` or migrated with `aivia.loader.migrate_string_dates`), so
+            templates compare properties directly instead of casting each row with `date(...)`.
+        metrics: sink for per-stage seconds, e.g. `telemetry.HistogramRegistry()` or any
+            callable `fn(stage, seconds)`.
+        tracer: OpenTelemetry-style tracer for `aivia.run` / `aivia.<stage>` spans; defaults
+            to the OTel global tracer if installed, else a no-op.
+        pathfinder: `aivia.pathfinder.PathfinderEngine` connecting matched labels; defaults
+            to the shared engine for `$AIVIA_SCHEMA` / the Sales CRM schema.
+
+    `debug["timing"]` holds `match_s`, `build_s`, `execute_s`, `frame_s`, `total_s` and,
+    when the server reports them, `server_available_s` / `server_consumed_s`; stages served
+    from a cache are skipped and flagged with `plan_cache_hit` / `result_cache_hit`.
+    """
+
+    def __init__(self, driver, schema_index=None, value_index=None, plan_cache: PlanCache = None,
+                 result_cache: ResultCache = None, native_dates: bool = False, metrics=None, tracer=None,
+                 pathfinder=None):
         self.driver = driver
         self.schema_index = schema_index
         self.value_index = value_index
+        self.plan_cache = plan_cache
+        self.result_cache = result_cache
+        self.native_dates = native_dates
+        self.metrics = metrics
+        self.tracer = tracer or get_tracer()
+        self.pathfinder = pathfinder
 
-    def run(self, question: str, top_k: int = 8) -> Tuple[str, pd.DataFrame, Dict[str, Any]]:
-        # 1) Match (labels/properties/values)
-        match = self._match_concepts(question, top_k=top_k)        # TODO: wire your matcher
+    def run(self, question: str, top_k: int = 8, trace: bool = False) -> Tuple[str, "pd.DataFrame", Dict[str, Any]]:
+        """
+        Answer one question. With ``trace=True`` the matcher's debug events for this request
+        are collected into ``debug["trace"]`` (an ``aivia.tracing.Trace``; empty on a plan-cache hit).
+        """
+        return self._run(question, top_k, trace, self._exec_cypher)
+
+    def run_rows(self, question: str, top_k: int = 8, trace: bool = False
+                 ) -> Tuple[str, List[str], List[tuple], Dict[str, Any]]:
+        """
+        ``run()`` without pandas: returns ``(cypher, columns, rows, debug)`` with rows as plain
+        value tuples (the CLI prints these). Rows are not added to the result cache.
+        """
+        cypher, (columns, rows), debug = self._run(question, top_k, trace, self._exec_rows)
+        return cypher, columns, rows, debug
+
+    def _run(self, question: str, top_k: int, trace: bool, execute):
+        timer = StageTimer(self.metrics, self.tracer)
+        t0 = time.perf_counter()
+        with self.tracer.start_as_current_span("aivia.run"), \
+                (collect_trace(question) if trace else nullcontext()) as collected:
+            # 1-3) Match, resolve path, build Cypher (served from the plan cache when warm)
+            match, path, cypher, params = self._plan(question, top_k=top_k, timer=timer)
+
+            # 4) Execute
+            result = execute(cypher, params, timer=timer)
+        timer.record("total", time.perf_counter() - t0)
+
+        debug = {"question": question, "match": match, "path": path, "cypher": cypher, "params": params,
+                 "timing": timer.timings}
+        if collected is not None:
+            debug["trace"] = collected
+        return cypher, result, debug
+
+    def run_many(self, questions: Sequence[str], concurrency: int = 4, top_k: int = 8
+                 ) -> List[Tuple[str, "pd.DataFrame", Dict[str, Any]]]:
+        """
+        Run a batch of questions; results come back in input order as ``run()`` triples.
+
+        Questions are planned up front, identical Cypher + parameters are executed once,
+        and the unique queries run on at most ``concurrency`` worker threads, each reusing
+        one session (opened only on a result-cache miss). ``debug["timing"]`` holds
+        per-question plan/exec seconds plus the ``run()`` stage keys (a deduped question
+        reports its shared query's execute/frame times); ``debug["deduped"]`` marks questions
+        that shared another's query.
+        """
+        planned = []
+        for question in questions:
+            t0 = time.perf_counter()
+            timer = StageTimer(self.metrics, self.tracer)
+            match, path, cypher, params = self._plan(question, top_k=top_k, timer=timer)
+            planned.append((question, match, path, cypher, params, time.perf_counter() - t0, timer.timings))
+
+        unique = {query_key(p[3], p[4]): (p[3], p[4]) for p in planned}
+
+        local = threading.local()
+        sessions = []
+        lock = threading.Lock()
 
-        # 2) Resolve path (connect matched nodes)
-        path  = self._resolve_path(match)                          # TODO: wire your path resolver
+        def execute(query: Tuple[str, Dict[str, Any]]):
+            cypher, params = query
+            t0 = time.perf_counter()
+            timer = StageTimer(self.metrics, self.tracer)
+            df = self._cached_result(cypher, params, timer)
+            if df is None:
+                if not hasattr(local, "session"):
+                    local.session = self.driver.session()
+                    with lock:
+                        sessions.append(local.session)
+                df = self._fetch(cypher, params, local.session, timer)
+            return df, time.perf_counter() - t0, timer.timings
 
-        # 3) Build Cypher from path + filters
-        cypher = self._build_cypher(question, match, path)         # TODO: wire your cypher builder
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+                executed = dict(zip(unique, pool.map(execute, unique.values())))
+        finally:
+            for session in sessions:
+                session.close()
 
-        # 4) Execute
-        df = self._exec_cypher(cypher)
+        results, seen = [], set()
+        for question, match, path, cypher, params, plan_s, plan_timings in planned:
+            key = query_key(cypher, params)
+            df, exec_s, exec_timings = executed[key]
+            deduped = key in seen
+            seen.add(key)
+            timing = {"plan_s": plan_s, "exec_s": exec_s, **plan_timings, **exec_timings}
+            debug = {"question": question, "match": match, "path": path, "cypher": cypher, "params": params,
+                     "timing": timing, "deduped": deduped}
+            results.append((cypher, df.copy() if deduped else df, debug))
+        return results
 
-        debug = {"question": question, "match": match, "path": path, "cypher": cypher}
-        return cypher, df, debug
+    def stream(self, question: str, chunk_size: int = 10_000, top_k: int = 8) -> Iterator["pd.DataFrame"]:
+        """
+        Run a question and yield its results as DataFrames of at most ``chunk_size`` rows.
+
+        Records are pulled from the driver's cursor one chunk at a time (``chunk_size`` is
+        also the session fetch size) and built column-wise rather than from ``.data()``
+        dicts, so memory stays bounded by a single chunk however large the result is.
+        Callers can write each chunk to disk or aggregate incrementally.
+        """
+        _, _, cypher, params = self._plan(question, top_k=top_k)
+
+        cached = self._cached_result(cypher, params)
+        if cached is not None:
+            for start in range(0, len(cached), chunk_size):
+                yield cached.iloc[start:start + chunk_size]
+            return
+
+        with self.driver.session(fetch_size=chunk_size) as s:
+            result = s.run(cypher, params)
+            columns = result.keys()
+            while True:
+                records = result.fetch(chunk_size)
+                if not records:
+                    break
+                yield _columnar_frame(columns, records)
+
+    def _plan(self, question: str, top_k: int, timer: StageTimer = None
+              ) -> Tuple[Dict[str, Any], List[str], str, Dict[str, Any]]:
+        timer = timer or StageTimer()
+        # Plan from the normalized question so a cached plan is exactly what a fresh run would build.
+        # This changes some results on purpose: the matcher reads "over 25,000" as 25 but "over 25k"
+        # as 25000, and normalization folds every amount spelling to the "k" form
+        q = normalize_question(question)
+        key = (q, top_k, self.native_dates)
+        if self.plan_cache is not None:
+            plan = self.plan_cache.get(key)
+            if plan is not None:
+                timer.timings["plan_cache_hit"] = True
+                return plan
+
+        # 1) Match (labels/properties/values)
+        with timer.stage("match"):
+            match = self._match_concepts(q, top_k=top_k)        # TODO: wire your matcher
+
+        with timer.stage("build"):
+            # 2) Resolve path (connect matched nodes)
+            path  = self._resolve_path(match)
+
+            # 3) Build Cypher from path + filters
+            cypher, params = self._build_cypher(q, match, path) # TODO: wire your cypher builder
+            if self.native_dates:
+                cypher = _DATE_CAST.sub(r"\1", cypher)  # index-friendly: d.created_date >= today - ...
+
+        if self.plan_cache is not None:
+            self.plan_cache.put(key, (match, path, cypher, params))
+        return match, path, cypher, params
 
     # ----------------- internals (temporary stubs) -----------------
     def _match_concepts(self, question: str, top_k: int) -> Dict[str, Any]:
@@ -36,33 +249,44 @@ class AiviaEngine:
         return match_concepts_adapter(question, top_k=top_k)
 
     def _resolve_path(self, match: Dict[str, Any]) -> List[str]:
-        # TEMP: we know the Sales CRM graph; prefer short paths.
-        return ["Account-[:HAS_DEAL]->Deal", "Deal-[:HAS_ACTIVITY]->Activity", "Deal-[:OWNED_BY]->User"]
+        # Rows are deals; templates read the account, activities and owner, and contacts
+        # only when the question asks about buying roles.
+        targets = ["Account", "Activity", "User"]
+        if match.get("wants_roles"):
+            targets.append("Contact")
+        pathfinder = self.pathfinder
+        if pathfinder is None:
+            from .pathfinder import get_pathfinder_engine
+            pathfinder = get_pathfinder_engine()
+        return pathfinder.complete_path("Deal", targets).patterns()
 
-    def _build_cypher(self, question: str, m: Dict[str, Any], path: List[str]) -> str:
+    def _build_cypher(self, question: str, m: Dict[str, Any], path: List[str]) -> Tuple[str, Dict[str, Any]]:
         # TEMP: recognize our 3 canonical prompts and emit portable Cypher.
+        # Thresholds are query parameters, so each template is one cached server plan.
         q = question.lower()
 
         if "no next meeting" in q or "no next step" in q:
-            amount = m["needs_amount_gt"] or 10000
-            window = m["window_days"] or 60
-            next_days = m["next_meeting_days"] or 14
-            return f"""
+            params = {
+                "amount": m["needs_amount_gt"] or 10000,
+                "window_days": m["window_days"] or 60,
+                "next_days": m["next_meeting_days"] or 14,
+            }
+            return """
 WITH date(localdatetime()) AS today
 MATCH (a:Account)-[:HAS_DEAL]->(d:Deal)
 WHERE d.stage <> "Closed Won" AND d.stage <> "Closed Lost"
-  AND d.amount > {amount}
-  AND date(d.created_date) >= today - duration({{days: {window}}})
-  AND NOT EXISTS {{
+  AND d.amount > $amount
+  AND date(d.created_date) >= today - duration({days: $window_days})
+  AND NOT EXISTS {
     MATCH (d)-[:HAS_ACTIVITY]->(act2:Activity)
     WHERE act2.next_step_date IS NOT NULL
-      AND date(act2.next_step_date) <= today + duration({{days: {next_days}}})
-  }}
+      AND date(act2.next_step_date) <= today + duration({days: $next_days})
+  }
 OPTIONAL MATCH (d)-[:OWNED_BY]->(u:User)
 RETURN a.name AS account, d.id AS deal_id, d.name AS deal, d.amount AS amount,
        d.stage AS stage, d.created_date AS created, u.name AS owner
 ORDER BY amount DESC
-""".strip()
+""".strip(), params
 
         if "commit" in q and ("finance" in q or "security" in q):
             return """
@@ -81,23 +305,22 @@ RETURN a.name AS account, d.id AS deal_id, d.name AS deal,
        CASE WHEN c_fin IS NULL AND c_sec IS NULL THEN " & " ELSE "" END +
        CASE WHEN c_sec IS NULL THEN "Missing Security" ELSE "" END AS gap
 ORDER BY account
-""".strip()
+""".strip(), {}
 
         if "evaluate" in q and ("no activity" in q or "stale" in q):
-            stale = m["stale_days"] or 21
-            recent = 14
-            return f"""
+            params = {"stale_days": m["stale_days"] or 21, "recent_days": 14}
+            return """
 WITH date(localdatetime()) AS today
 MATCH (a:Account)-[:HAS_DEAL]->(d:Deal)
 WHERE d.stage = "Evaluate"
-  AND date(d.created_date) <= today - duration({{days: {stale}}})
-  AND NOT EXISTS {{
+  AND date(d.created_date) <= today - duration({days: $stale_days})
+  AND NOT EXISTS {
     MATCH (d)-[:HAS_ACTIVITY]->(act:Activity)
-    WHERE date(act.date) >= today - duration({{days: {recent}}})
-  }}
+    WHERE date(act.date) >= today - duration({days: $recent_days})
+  }
 RETURN a.name AS account, d.id AS deal_id, d.name AS deal, d.created_date AS created
 ORDER BY created ASC
-""".strip()
+""".strip(), params
 
         # Fallback: conservative open-deals listing
         return """
@@ -106,14 +329,80 @@ MATCH (a:Account)-[:HAS_DEAL]->(d:Deal)
 WHERE d.stage <> "Closed Won" AND d.stage <> "Closed Lost"
 RETURN a.name AS account, d.id AS deal_id, d.name AS deal, d.amount AS amount, d.stage AS stage
 ORDER BY amount DESC
-""".strip()
+""".strip(), {}
+
+    def _exec_cypher(self, cypher: str, params: Dict[str, Any] = None, session=None,
+                     timer: StageTimer = None) -> "pd.DataFrame":
+        df = self._cached_result(cypher, params, timer)
+        if df is not None:
+            return df
+        if session is not None:
+            return self._fetch(cypher, params, session, timer)
+        with self.driver.session() as s:
+            return self._fetch(cypher, params, s, timer)
 
-    def _exec_cypher(self, cypher: str) -> pd.DataFrame:
+    def _exec_rows(self, cypher: str, params: Dict[str, Any] = None, timer: StageTimer = None
+                   ) -> Tuple[List[str], List[tuple]]:
+        df = self._cached_result(cypher, params, timer)
+        if df is not None:
+            return list(df.columns), list(df.itertuples(index=False, name=None))
         with self.driver.session() as s:
-            rows = s.run(cypher).data()
-        return pd.DataFrame(rows)
+            return self._fetch_rows(cypher, params, s, timer)
+
+    def _cached_result(self, cypher: str, params: Dict[str, Any] = None, timer: StageTimer = None):
+        df = self.result_cache.get(cypher, params) if self.result_cache is not None else None
+        if df is not None and timer is not None:
+            timer.timings["result_cache_hit"] = True
+        return df
+
+    def _fetch(self, cypher: str, params: Dict[str, Any], session, timer: StageTimer = None) -> "pd.DataFrame":
+        timer = timer or StageTimer()
+        columns, records = self._fetch_rows(cypher, params, session, timer)
+        with timer.stage("frame", rows=len(records)):
+            df = _columnar_frame(columns, records)
+        if self.result_cache is not None:
+            self.result_cache.put(cypher, df, params)
+        return df
+
+    def _fetch_rows(self, cypher: str, params: Dict[str, Any], session, timer: StageTimer = None
+                    ) -> Tuple[List[str], List[tuple]]:
+        timer = timer or StageTimer()
+        with timer.stage("execute"):
+            result = session.run(cypher, params or {})
+            columns = result.keys()
+            records = list(result)  # neo4j Records are tuples of values
+            summary = result.consume()  # records are drained, so this only reads the summary
+        for name, seconds in server_timings(summary).items():
+            timer.record(name, seconds)
+        return columns, records
+
+
+# Engines reused by run_query() per driver (and date mode), so repeated calls share one engine
+_DRIVER_ENGINES: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
 
 # Convenience function
-def run_query(driver, question: str, schema_index=None, value_index=None, top_k: int = 8):
-    eng = AiviaEngine(driver, schema_index=schema_index, value_index=value_index)
+def run_query(driver, question: str, schema_index=None, value_index=None, top_k: int = 8,
+              plan_cache=None, result_cache=None, native_dates: bool = False):
+    """
+    One-shot NL→Cypher→Results. With `driver=None` the process-wide pooled engine from
+    `aivia.connection.get_engine()` answers; otherwise an engine is kept per driver and
+    reused across calls (a fresh one is built only when custom indexes/caches are passed).
+    """
+    kwargs = dict(schema_index=schema_index, value_index=value_index, plan_cache=plan_cache,
+                  result_cache=result_cache, native_dates=native_dates)
+    custom = any(v is not None for k, v in kwargs.items() if k != "native_dates")
+    if driver is None:
+        from .connection import get_engine
+        eng = get_engine(**{k: v for k, v in kwargs.items() if v is not None})
+    elif custom:
+        eng = AiviaEngine(driver, **kwargs)
+    else:
+        try:
+            per_driver = _DRIVER_ENGINES.setdefault(driver, {})
+        except TypeError:  # driver object without weakref support
+            per_driver = {}
+        eng = per_driver.get(native_dates)
+        if eng is None:
+            eng = per_driver.setdefault(native_dates, AiviaEngine(driver, **kwargs))
     return eng.run(question, top_k=top_k)
@@ -0,0 +1,249 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Schema-driven bulk loader: compiles `<use_case>/schema.yaml` into batch-load plans.
+
+Every label becomes a NodeSpec and every `via_fk` edge an EdgeSpec (see `aivia.loader`),
+so a new use case loads at bulk speed without hand-written Cypher. Node batches for
+independent labels run in parallel on a thread pool; each edge batch is scheduled as soon
+as both of its endpoint labels are loaded.
+
+CSV files and columns are found by convention, overridable per label in an optional
+`sources` block of schema.yaml:
+
+    sources:
+      Deal: {csv: deals.csv, columns: {id: deal_id, owner_id: owner_user_id}}
+
+- file: snake_case plural of the label (`Activity` → `activities.csv`)
+- `id`: the `id` column, else `<label>_id` (`deal_id`)
+- FK `x_id` referencing label T: `x_id`, else `x_<t>_id`, else `<t>_id` (`owner_id` → `owner_user_id`)
+
+    python -m aivia.schema_loader use_cases/sales_crm --data-dir examples/sales_crm_demo [--workers 4]
+"""
+from typing import Any, Dict, List, Optional, Sequence
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+import logging
+import re
+import sys
+import pandas as pd
+import yaml
+from .cache import notify_graph_write
+from .loader import (EdgeSpec, LoadStats, NodeSpec, clear_graph, constraint_cypher, driver_from_env,
+                     edge_batch_cypher, edge_rows, node_batch_cypher, node_rows, read_csv, write_batches)
+
+_log = logging.getLogger(__name__)
+
+
+@dataclass
+class LoadPlan:
+    """Compiled load plan: node specs per label and edge specs per `via_fk` edge."""
+    nodes: List[NodeSpec]
+    edges: List[EdgeSpec]
+
+    def describe(self) -> str:
+        lines = [f"constraint  {constraint_cypher(n.label)}" for n in self.nodes]
+        lines += [f"node {n.label:<8} {n.csv}: {node_batch_cypher(n.label)}" for n in self.nodes]
+        lines += [f"edge {e.rel:<8} {e.csv}({e.src_key}→{e.dst_key}) after {e.src}+{e.dst}: "
+                  f"{edge_batch_cypher(e)}" for e in self.edges]
+        return "\n".join(lines)
+
+
+def load_schema(use_case_dir) -> Dict[str, Any]:
+    with open(Path(use_case_dir) / "schema.yaml", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def _snake(label: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", label).lower()
+
+
+def _default_csv(label: str) -> str:
+    name = _snake(label)
+    if name.endswith("y") and name[-2:-1] not in "aeiou":
+        return name[:-1] + "ies.csv"
+    return name + ("es.csv" if name.endswith("s") else "s.csv")
+
+
+def _resolve_column(label: str, prop: str, columns: Sequence[str], overrides: Dict[str, str],
+                    ref_label: Optional[str] = None) -> Optional[str]:
+    candidates = [overrides.get(prop), prop]
+    if prop == "id":
+        candidates.append(f"{_snake(label)}_id")
+    if ref_label and prop.endswith("_id"):
+        ref = _snake(ref_label)
+        candidates += [f"{prop[:-3]}_{ref}_id", f"{ref}_id"]
+    return next((c for c in candidates if c and c in columns), None)
+
+
+def _split_fk(via_fk: str):
+    label, _, prop = via_fk.partition(".")
+    if not prop:
+        raise ValueError(f"via_fk must look like Label.property, got {via_fk!r}")
+    return label, prop
+
+
+def compile_load_plan(schema: Dict[str, Any], data_dir) -> LoadPlan:
+    """
+    Turn a parsed schema.yaml into a LoadPlan against the CSVs in `data_dir`.
+
+    Only CSV headers are read here; properties without a matching column are skipped
+    with a warning, an edge whose FK column can't be found is dropped the same way.
+    """
+    labels = schema.get("labels") or {}
+    edges = schema.get("edges") or []
+    sources = schema.get("sources") or {}
+
+    # (label, fk property) → referenced label, so FK columns can be resolved by convention
+    fk_refs = {}
+    for edge in edges:
+        fk_label, fk_prop = _split_fk(edge["via_fk"])
+        if fk_label not in (edge["from"], edge["to"]):
+            raise ValueError(f"via_fk {edge['via_fk']} is on neither end of {edge['from']}-{edge['rel']}->{edge['to']}")
+        fk_refs[(fk_label, fk_prop)] = edge["to"] if fk_label == edge["from"] else edge["from"]
+
+    headers, node_specs, keys = {}, [], {}
+    for label, spec in labels.items():
+        source = sources.get(label) or {}
+        csv = source.get("csv") or _default_csv(label)
+        path = Path(data_dir) / csv
+        if not path.exists():
+            raise FileNotFoundError(f"No CSV for label {label}: expected {path} (set sources.{label}.csv)")
+        columns = list(pd.read_csv(path, nrows=0).columns.str.strip())
+        overrides = source.get("columns") or {}
+        headers[label] = (csv, columns, overrides)
+
+        key = _resolve_column(label, "id", columns, overrides)
+        if key is None:
+            raise ValueError(f"No id column for {label} in {csv} (tried id, {_snake(label)}_id)")
+        keys[label] = key
+
+        props, rename = [], {}
+        for prop in spec.get("properties") or []:
+            if prop == "id":
+                continue
+            col = _resolve_column(label, prop, columns, overrides, fk_refs.get((label, prop)))
+            if col is None:
+                _log.warning("%s.%s: no matching column in %s, skipped", label, prop, csv)
+                continue
+            props.append(col)
+            if col != prop:
+                rename[col] = prop
+        node_specs.append(NodeSpec(label, csv, key, props, rename=rename))
+
+    edge_specs = []
+    for edge in edges:
+        src, rel, dst = edge["from"], edge["rel"], edge["to"]
+        if src not in labels or dst not in labels:
+            raise ValueError(f"Edge {src}-[:{rel}]->{dst} references a label missing from `labels`")
+        fk_label, fk_prop = _split_fk(edge["via_fk"])
+        csv, columns, overrides = headers[fk_label]
+        fk_col = _resolve_column(fk_label, fk_prop, columns, overrides, fk_refs[(fk_label, fk_prop)])
+        if fk_col is None:
+            _log.warning("%s-[:%s]->%s: FK column for %s not in %s, skipped", src, rel, dst, edge["via_fk"], csv)
+            continue
+        if fk_label == src:
+            edge_specs.append(EdgeSpec(src, rel, dst, csv, keys[fk_label], fk_col))
+        else:
+            edge_specs.append(EdgeSpec(src, rel, dst, csv, fk_col, keys[fk_label]))
+
+    return LoadPlan(node_specs, edge_specs)
+
+
+def _write(driver, cypher: str, rows, batch_size: int, name: str) -> LoadStats:
+    # Sessions aren't thread-safe: every pool task gets its own
+    with driver.session() as s:
+        return write_batches(s, cypher, rows, batch_size, name)
+
+
+def run_load_plan(driver, plan: LoadPlan, data_dir, batch_size: int = 5_000, workers: int = 4,
+                  clear_first: bool = True, native_dates: bool = False) -> List[LoadStats]:
+    """
+    Execute a LoadPlan: constraints first, then node batches for all labels in parallel,
+    with each edge batch submitted once both endpoint labels have finished loading.
+    """
+    frames: Dict[str, Optional[pd.DataFrame]] = {}
+    for spec in plan.nodes:
+        if spec.csv not in frames:
+            frames[spec.csv] = read_csv(data_dir, spec.csv, optional=spec.optional, native_dates=native_dates)
+
+    with driver.session() as s:
+        if clear_first:
+            clear_graph(s)
+        for spec in plan.nodes:
+            s.run(constraint_cypher(spec.label)).consume()
+
+    stats, loaded = [], set()
+    waiting = list(plan.edges)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        for spec in plan.nodes:
+            df = frames[spec.csv]
+            if df is None or df.empty:
+                loaded.add(spec.label)
+                continue
+            task = pool.submit(_write, driver, node_batch_cypher(spec.label), node_rows(df, spec),
+                               batch_size, spec.label)
+            pending[task] = spec.label
+
+        while True:
+            for spec in [e for e in waiting if e.src in loaded and e.dst in loaded]:
+                waiting.remove(spec)
+                df = frames[spec.csv]
+                if df is None or df.empty:
+                    continue
+                task = pool.submit(_write, driver, edge_batch_cypher(spec), edge_rows(df, spec),
+                                   batch_size, f"{spec.src}-[:{spec.rel}]->{spec.dst}")
+                pending[task] = None
+            if not pending:
+                break
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for task in finished:
+                label = pending.pop(task)
+                stats.append(task.result())  # re-raises a failed batch
+                if label is not None:
+                    loaded.add(label)
+
+    notify_graph_write([spec.label for spec in plan.nodes])
+    return stats
+
+
+def load_use_case(driver, use_case_dir, data_dir=None, batch_size: int = 5_000, workers: int = 4,
+                  clear_first: bool = True, native_dates: bool = False) -> List[LoadStats]:
+    """Compile `use_case_dir/schema.yaml` and load the CSVs in `data_dir` (default: the use case dir)."""
+    data_dir = data_dir or use_case_dir
+    plan = compile_load_plan(load_schema(use_case_dir), data_dir)
+    return run_load_plan(driver, plan, data_dir, batch_size=batch_size, workers=workers,
+                         clear_first=clear_first, native_dates=native_dates)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bulk-load a use case's CSVs into Neo4j from its schema.yaml")
+    parser.add_argument("use_case_dir", help="directory containing schema.yaml")
+    parser.add_argument("--data-dir", help="directory with the CSVs (default: use_case_dir)")
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--workers", type=int, default=4, help="parallel label/edge loads")
+    parser.add_argument("--keep", action="store_true", help="don't clear the graph first")
+    parser.add_argument("--native-dates", action="store_true", help="store dates as Neo4j DATE values")
+    parser.add_argument("--dry-run", action="store_true", help="print the compiled plan and exit")
+    args = parser.parse_args(argv)
+
+    data_dir = args.data_dir or args.use_case_dir
+    plan = compile_load_plan(load_schema(args.use_case_dir), data_dir)
+    if args.dry_run:
+        print(plan.describe())
+        return
+
+    driver = driver_from_env()
+    try:
+        for stats in run_load_plan(driver, plan, data_dir, batch_size=args.batch_size, workers=args.workers,
+                                   clear_first=not args.keep, native_dates=args.native_dates):
+            print(f"[LOAD] {stats}")
+    finally:
+        driver.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,224 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Persistent query server for the CLI.
+
+`aivia serve` keeps one engine warm in a long-lived local process: the pooled driver, the
+plan cache, the pathfinder and the matcher. `aivia "<question>"` forwards to it whenever one
+is listening, so a question costs one local round trip instead of interpreter startup,
+imports and Bolt connection setup.
+
+The transport is HTTP/1.1 + JSON over a Unix socket (the default; the socket is mode 0600)
+or over localhost TCP:
+
+    aivia serve [--socket PATH | --http [HOST:]PORT [--allow-remote]] [--status]
+    AIVIA_SERVER=/path/to.sock | http://127.0.0.1:8765   where the CLI looks and `serve` binds
+    AIVIA_NO_SERVER=1                                     never forward; run in-process
+
+    POST /query   {"question": ..., "top_k": 8, "pool": false}
+                  → {"cypher", "params", "columns", "rows", "timing"[, "pool"]}
+    GET  /health  → {"status": "ok", "pid", "address", "uptime_s", "questions", "plan_cache"}
+
+There is no authentication, so `--http` only binds loopback hosts unless `--allow-remote`
+is given.
+
+The forwarding side lives in `aivia.client`, which the CLI imports instead of this module,
+so a forwarding CLI never loads neo4j, pandas or `http.server`. The server answers with
+the settings it was started with (`AIVIA_NEO4J_*`, `AIVIA_NATIVE_DATES`, ...).
+"""
+from typing import Any, Dict, Optional, Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import ipaddress
+import json
+import logging
+import os
+import socketserver
+import sys
+import threading
+import time
+from .client import connect, host_port, request, server_address
+
+_log = logging.getLogger(__name__)
+
+
+class QueryServer:
+    """The warm state behind the socket: one engine answering with `run_rows()`."""
+
+    def __init__(self, engine=None, address: Optional[str] = None):
+        if engine is None:
+            from .cache import PlanCache
+            from .connection import get_engine
+            from .pathfinder import default_schema_path
+            schema = default_schema_path()
+            engine = get_engine(native_dates=os.getenv("AIVIA_NATIVE_DATES") == "1",
+                                plan_cache=PlanCache(schema_path=str(schema) if schema else None))
+        self.engine = engine
+        self.address = server_address(address)
+        self.started = time.time()
+        self.questions = 0
+        self._lock = threading.Lock()
+
+    def warm_up(self, question: str) -> None:
+        """Plan one question so the matcher, pathfinder and plan cache are loaded before the first client."""
+        try:
+            self.engine._plan(question, top_k=8)
+        except Exception as e:
+            _log.warning("Warm-up planning failed: %s", e)
+
+    def query(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        question = str(payload.get("question") or "").strip()
+        if not question:
+            raise ValueError("missing 'question'")
+        cypher, columns, rows, debug = self.engine.run_rows(question, top_k=int(payload.get("top_k") or 8))
+        with self._lock:
+            self.questions += 1
+        reply = {"cypher": cypher, "params": debug["params"], "columns": list(columns),
+                 "rows": [list(row) for row in rows], "timing": debug["timing"]}
+        if payload.get("pool"):
+            from .connection import pool_metrics
+            reply["pool"] = pool_metrics()
+        return reply
+
+    def health(self) -> Dict[str, Any]:
+        plan_cache = getattr(self.engine, "plan_cache", None)
+        return {"status": "ok", "pid": os.getpid(), "address": self.address,
+                "uptime_s": round(time.time() - self.started, 3), "questions": self.questions,
+                "plan_cache": plan_cache.stats() if plan_cache is not None else None}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "aivia"
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, self.server.app.health())
+        else:
+            self._reply(404, {"error": f"no route {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/query":
+            return self._reply(404, {"error": f"no route {self.path}"})
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            if not isinstance(payload, dict):
+                return self._reply(400, {"error": "request body must be a JSON object"})
+            self._reply(200, self.server.app.query(payload))
+        except ValueError as e:
+            self._reply(400, {"error": str(e)})
+        except Exception as e:
+            _log.exception("Query failed")
+            self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, default=str).encode("utf-8")  # dates, Decimals, ... as text
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        _log.debug("%s - %s", self.address_string(), format % args)
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        umask = os.umask(0o177)  # socket file readable/writable by the owner only
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+
+def is_loopback(host: str) -> bool:
+    if host.strip("[]").lower() == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:  # another host name: may resolve to a public interface
+        return False
+
+
+def make_server(app: QueryServer, allow_remote: bool = False) -> socketserver.BaseServer:
+    """
+    Bind `app.address`; a stale socket file is replaced, a live server is an error. An HTTP
+    address on a non-loopback host is refused unless `allow_remote` (no authentication).
+    """
+    address = app.address
+    if address.startswith("http://"):
+        host = host_port(address)[0]
+        if not allow_remote and not is_loopback(host):
+            raise ValueError(f"refusing to listen on non-loopback host {host!r} without allow_remote")
+        server = ThreadingHTTPServer(host_port(address), _Handler)
+    else:
+        if os.path.exists(address):
+            if connect(address) is not None:
+                raise RuntimeError(f"an aivia server is already listening on {address}")
+            os.unlink(address)
+        server = _UnixHTTPServer(address, _Handler)
+    server.app = app
+    return server
+
+
+def serve(address: Optional[str] = None, engine=None, warm_question: Optional[str] = None,
+          allow_remote: bool = False) -> None:
+    """Run the server in the foreground until interrupted (Ctrl-C / SIGTERM)."""
+    import signal
+
+    app = QueryServer(engine, address)
+    if warm_question:
+        app.warm_up(warm_question)
+    server = make_server(app, allow_remote=allow_remote)
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"[SERVE] listening on {app.address} (pid {os.getpid()})")
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+        if not app.address.startswith("http://") and os.path.exists(app.address):
+            os.unlink(app.address)
+        print(f"[SERVE] stopped after {app.questions} question(s)")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="aivia serve",
+                                     description="Keep the engine warm and answer CLI questions over a local socket")
+    where = parser.add_mutually_exclusive_group()
+    where.add_argument("--socket", help=f"Unix socket path (default: $AIVIA_SERVER or {server_address()})")
+    where.add_argument("--http", metavar="[HOST:]PORT", help="listen on localhost TCP instead")
+    parser.add_argument("--allow-remote", action="store_true",
+                        help="let --http bind a non-loopback HOST (anyone who can reach it can query the graph)")
+    parser.add_argument("--status", action="store_true", help="print the running server's health and exit")
+    args = parser.parse_args(argv)
+
+    address = args.socket
+    if args.http:
+        address = f"http://{args.http if ':' in args.http else '127.0.0.1:' + args.http}"
+        host = host_port(address)[0]
+        if not args.allow_remote and not is_loopback(host):
+            parser.error(f"--http {args.http}: {host} is not a loopback address (add --allow-remote to listen on it)")
+    health = request(server_address(address), "GET", "/health")
+    if args.status:
+        print(json.dumps(health, indent=2) if health else f"[SERVE] no server on {server_address(address)}")
+        sys.exit(0 if health else 1)
+    if health:  # before connecting to Neo4j for nothing
+        print(f"[SERVE] already running on {health['address']} (pid {health['pid']})")
+        sys.exit(1)
+
+    logging.basicConfig(level=os.getenv("AIVIA_LOG_LEVEL", "WARNING").upper(), format="%(message)s")
+    from .__main__ import DEFAULT_QUESTION
+    serve(address, warm_question=DEFAULT_QUESTION, allow_remote=args.allow_remote)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,162 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Stage timing for the NL→Cypher pipeline: match, build, execute, frame.
+
+Every stage is timed into `debug["timing"]`, observed by an optional metrics sink and
+wrapped in a tracing span:
+
+- sinks: `HistogramRegistry` (Prometheus-style cumulative buckets, `render()` gives the
+  text exposition format) or any callable `fn(stage, seconds)` via `CallbackSink`
+- tracer: OpenTelemetry's `trace.get_tracer("aivia")` when `opentelemetry-api` is
+  installed, otherwise a no-op tracer with the same `start_as_current_span` interface
+
+    registry = HistogramRegistry()
+    engine = AiviaEngine(driver, metrics=registry)
+    ...
+    print(registry.render())
+"""
+from typing import Any, Callable, Dict, Optional, Sequence
+from contextlib import contextmanager
+import bisect
+import threading
+import time
+
+STAGES = ("match", "build", "execute", "frame")
+# Seconds; covers sub-millisecond matching up to multi-second graph scans
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class HistogramRegistry:
+    """Thread-safe per-stage histograms in the Prometheus data model (cumulative buckets, sum, count)."""
+
+    def __init__(self, name: str = "aivia_stage_seconds", buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.buckets = tuple(sorted(buckets))
+        self._data: Dict[str, list] = {}  # stage -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        i = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            row = self._data.get(stage)
+            if row is None:
+                row = self._data[stage] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[i] += 1
+            row[-1] += seconds
+
+    def __call__(self, stage: str, seconds: float) -> None:
+        self.observe(stage, seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """stage → {"count", "sum", "buckets": {le: cumulative count}}."""
+        out = {}
+        with self._lock:
+            for stage, row in self._data.items():
+                cumulative, running = {}, 0
+                for le, n in zip(list(self.buckets) + [float("inf")], row[:-1]):
+                    running += n
+                    cumulative[le] = running
+                out[stage] = {"count": running, "sum": row[-1], "buckets": cumulative}
+        return out
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines = [f"# TYPE {self.name} histogram"]
+        for stage, h in sorted(self.snapshot().items()):
+            for le, n in h["buckets"].items():
+                le_s = "+Inf" if le == float("inf") else repr(le)
+                lines.append(f'{self.name}_bucket{{stage="{stage}",le="{le_s}"}} {n}')
+            lines.append(f'{self.name}_sum{{stage="{stage}"}} {h["sum"]}')
+            lines.append(f'{self.name}_count{{stage="{stage}"}} {h["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+class CallbackSink:
+    """Adapts `fn(stage, seconds)` (e.g. a statsd timer or prometheus_client Histogram.labels) to a sink."""
+
+    def __init__(self, fn: Callable[[str, float], Any]):
+        self.fn = fn
+
+    def observe(self, stage: str, seconds: float) -> None:
+        self.fn(stage, seconds)
+
+
+class _NoopSpan:
+    def set_attribute(self, key, value):
+        pass
+
+    def record_exception(self, exc):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NoopTracer:
+    """Stand-in for an OpenTelemetry tracer when opentelemetry-api isn't installed."""
+
+    @contextmanager
+    def start_as_current_span(self, name: str, **kwargs):
+        yield _NoopSpan()
+
+
+def get_tracer(name: str = "aivia"):
+    """OpenTelemetry tracer if available (exports wherever the app configured OTel), else no-op."""
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        return NoopTracer()
+    return trace.get_tracer(name)
+
+
+def _observer(metrics) -> Optional[Callable[[str, float], Any]]:
+    if metrics is None:
+        return None
+    if hasattr(metrics, "observe"):
+        return metrics.observe
+    if callable(metrics):
+        return metrics
+    raise TypeError("metrics must have observe(stage, seconds) or be callable")
+
+
+class StageTimer:
+    """
+    Times pipeline stages for one question into `timings` (`<stage>_s` keys), reporting
+    each to the metrics sink and as a child span `aivia.<stage>`.
+    """
+
+    def __init__(self, metrics=None, tracer=None, timings: Optional[Dict[str, float]] = None):
+        self.observe = _observer(metrics)
+        self.tracer = tracer or NoopTracer()
+        self.timings = timings if timings is not None else {}
+
+    @contextmanager
+    def stage(self, name: str, **attributes):
+        with self.tracer.start_as_current_span(f"aivia.{name}") as span:
+            for key, value in attributes.items():
+                span.set_attribute(f"aivia.{key}", value)
+            t0 = time.perf_counter()
+            try:
+                yield span
+            finally:
+                self.record(name, time.perf_counter() - t0)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add an externally measured duration (e.g. server-side times from the result summary)."""
+        key = f"{name}_s"
+        self.timings[key] = self.timings.get(key, 0.0) + seconds
+        if self.observe is not None:
+            self.observe(name, seconds)
+
+
+def server_timings(summary) -> Dict[str, float]:
+    """`result_available_after` / `result_consumed_after` (ms in the summary) as seconds; {} if absent."""
+    out = {}
+    for attr, name in (("result_available_after", "server_available"), ("result_consumed_after", "server_consumed")):
+        value = getattr(summary, attr, None)
+        if value is not None:
+            out[name] = value / 1000.0
+    return out
@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: Apache-2.0
+"""
+Leveled, lazy debug tracing for the matcher hot path.
+
+Replaces unconditional `print()` calls: events go to the calling module's `logging`
+logger at DEBUG level and, while a request trace is being collected, into a `Trace`
+object. Messages use %-style arguments and are only formatted when something consumes
+them, and hot paths check `tracing(log)` once so per-item loops are skipped entirely
+when nobody is listening.
+
+    log = logging.getLogger(__name__)
+
+    if tracing(log):
+        for e in entities:
+            trace(log, "entity %r type=%s", e.mention, e.type)
+
+    with collect_trace() as t:
+        engine.run(question)
+    print(t.messages())
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from contextlib import contextmanager
+import contextvars
+import logging
+import time
+
+_CURRENT: "contextvars.ContextVar[Optional[Trace]]" = contextvars.ContextVar("aivia_trace", default=None)
+
+
+class Trace:
+    """Events recorded for one request: (seconds since start, logger name, message, args)."""
+
+    def __init__(self, request_id: Optional[str] = None):
+        self.request_id = request_id
+        self.started = time.perf_counter()
+        self.events: List[Tuple[float, str, str, Tuple[Any, ...]]] = []
+
+    def add(self, logger_name: str, msg: str, args: Tuple[Any, ...]) -> None:
+        self.events.append((time.perf_counter() - self.started, logger_name, msg, args))
+
+    def messages(self) -> List[str]:
+        """Formatted messages, in order (formatting happens here, not when recorded)."""
+        return [msg % args if args else msg for _, _, msg, args in self.events]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"request_id": self.request_id,
+                "events": [{"t": round(t, 6), "logger": name, "message": msg % args if args else msg}
+                           for t, name, msg, args in self.events]}
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+
+@contextmanager
+def collect_trace(request_id: Optional[str] = None):
+    """Collect every trace event emitted in this context (thread / asyncio task) into a Trace."""
+    t = Trace(request_id)
+    token = _CURRENT.set(t)
+    try:
+        yield t
+    finally:
+        _CURRENT.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    return _CURRENT.get()
+
+
+def tracing(log: logging.Logger) -> bool:
+    """True when a trace event would go anywhere (DEBUG enabled or a trace is being collected)."""
+    return _CURRENT.get() is not None or log.isEnabledFor(logging.DEBUG)
+
+
+def trace(log: logging.Logger, msg: str, *args: Any) -> None:
+    """Record a debug event; `msg % args` is only built if it is logged or rendered."""
+    t = _CURRENT.get()
+    if t is not None:
+        t.add(log.name, msg, args)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(msg, *args)
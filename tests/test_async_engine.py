@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+import threading
+
+from aivia.async_engine import AsyncAiviaEngine
+from aivia.indexes import TEMPLATE_QUESTIONS
+from aivia.tracing import collect_trace
+
+
+class _Result:
+    def keys(self):
+        return ["deal_id"]
+
+    async def values(self):
+        await asyncio.sleep(0.01)  # long enough for the other queries to queue on the semaphore
+        return [["D1"], ["D2"]]
+
+    async def consume(self):
+        return None
+
+
+class _Session:
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def __aenter__(self):
+        self.driver.active += 1
+        self.driver.peak = max(self.driver.peak, self.driver.active)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.driver.active -= 1
+
+    async def run(self, cypher, params):
+        return _Result()
+
+
+class _AsyncDriver:
+    def __init__(self):
+        self.active = self.peak = 0
+
+    def session(self):
+        return _Session(self)
+
+
+QUESTIONS = list(TEMPLATE_QUESTIONS.values())[:3]
+
+
+def test_planning_runs_off_the_event_loop(monkeypatch):
+    engine = AsyncAiviaEngine(_AsyncDriver())
+    plan, threads = engine._planner._plan, []
+
+    def recording_plan(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return plan(*args, **kwargs)
+
+    monkeypatch.setattr(engine._planner, "_plan", recording_plan)
+    cypher, df, debug = asyncio.run(engine.run(QUESTIONS[0]))
+    asyncio.run(engine.run_many(QUESTIONS))
+    assert list(df["deal_id"]) == ["D1", "D2"]
+    assert debug["params"]["amount"] == 10000
+    assert len(threads) == 4 and threading.main_thread() not in threads
+
+
+def test_engine_is_usable_from_several_event_loops():
+    driver = _AsyncDriver()
+    engine = AsyncAiviaEngine(driver, max_concurrency=1)
+    for _ in range(2):  # a semaphore bound to the first loop would fail on the second
+        results = asyncio.run(engine.run_many(QUESTIONS, concurrency=len(QUESTIONS)))
+        assert [len(df) for _, df, _ in results] == [2] * len(QUESTIONS)
+    assert driver.peak == 1
+
+
+def test_traces_follow_planning_into_the_worker_thread():
+    engine = AsyncAiviaEngine(_AsyncDriver())
+
+    async def traced():
+        with collect_trace("q") as t:
+            await engine.run(QUESTIONS[0])
+        return t
+
+    assert any("REAL MATCHER" in m for m in asyncio.run(traced()).messages())
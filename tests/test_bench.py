@@ -0,0 +1,150 @@
+# SPDX-License-Identifier: Apache-2.0
+import datetime as dt
+
+import numpy as np
+import pytest
+
+from aivia.bench.datagen import CrmDataset, OPEN_STAGES, generate_crm, parse_scale
+from aivia.bench.executors import CrmStandIn, template_name
+from aivia.bench.micro import check_reachable, crm_clarity_schema, question_corpus, question_entities
+from aivia.bench.report import compare
+from aivia.indexes import template_cyphers
+
+TODAY = dt.date(2025, 5, 15)  # quarter starts 2025-04-01
+NAT = np.datetime64("NaT")
+
+
+def _dates(*values):
+    return np.array([v or NAT for v in values], dtype="datetime64[D]")
+
+
+def _tiny():
+    """
+    Accounts 0-2 ("Blue Analytics 0", "Nimbus Analytics 1", "Quasar Analytics 2"): account 0
+    has a Finance and two Security contacts, account 1 two Finance contacts, account 2 none.
+    """
+    int8 = lambda *v: np.array(v, dtype=np.int8)  # noqa: E731
+    int32 = lambda *v: np.array(v, dtype=np.int32)  # noqa: E731
+    deals = {  # stages: 1 Evaluate, 2 Proposal, 3 Legal, 4 Closed Won
+        "account": int32(1, 2, 0, 2, 0, 1, 2),
+        "owner": int32(0, 0, 0, 0, 0, 0, 0),
+        "name": int8(0, 1, 2, 6, 4, 5, 3),
+        "amount": np.array([20000, 50000, 30000, 80000, 5000, 15000, 1000], dtype=float),
+        "stage": int8(1, 2, 3, 4, 1, 1, 1),
+        "created_date": _dates("2025-04-10", "2025-05-01", "2025-04-20", "2025-05-01", "2025-01-01",
+                               "2025-03-01", "2024-12-01"),
+        "close_date": _dates(None, None, None, "2025-05-10", None, None, None),
+        "source": int8(0, 0, 0, 0, 0, 0, 0),
+        "is_commit": np.array([True, True, True, True, False, False, False]),
+    }
+    activities = {
+        "deal": int32(0, 1, 4, 5, 2),
+        "type": int8(0, 0, 0, 0, 0),
+        "date": _dates("2025-05-10", "2025-05-02", "2025-03-01", "2025-05-10", "2025-05-01"),
+        "next_step_date": _dates("2025-05-20", None, None, None, "2025-06-30"),
+    }
+    return CrmDataset(7, TODAY, 0,
+                      accounts={"industry": int8(0, 0, 0), "region": int8(0, 0, 0)},
+                      users={"team": int8(0), "region": int8(0)},
+                      contacts={"account": int32(0, 0, 0, 1, 1), "role": int8(2, 4, 4, 2, 2)},
+                      deals=deals, activities=activities)
+
+
+@pytest.fixture(scope="module")
+def standin():
+    return CrmStandIn(_tiny())
+
+
+def test_no_next_meeting_orders_by_amount_and_skips_upcoming_next_steps(standin):
+    columns, rows = standin.no_next_meeting({"amount": 10000, "window_days": 60, "next_days": 14})
+    assert columns == ["account", "deal_id", "deal", "amount", "stage", "created", "owner"]
+    # DL-0 has a next step on 05-20, DL-5 is older than 60 days, DL-3 is closed
+    assert rows == [
+        ("Quasar Analytics 2", "DL-1", "Enterprise Suite", 50000.0, "Proposal", "2025-05-01", "Avery Shaw 0"),
+        ("Blue Analytics 0", "DL-2", "Data Integration", 30000.0, "Legal", "2025-04-20", "Avery Shaw 0"),
+    ]
+
+
+def test_commit_missing_roles_repeats_rows_per_optional_match(standin):
+    columns, rows = standin.commit_missing_roles({})
+    assert columns == ["account", "deal_id", "deal", "gap"]
+    # Account 1's two Finance contacts give DL-0 twice; DL-2's account has both roles
+    assert rows == [("Nimbus Analytics 1", "DL-0", "Platform Subscription", "Missing Security"),
+                    ("Nimbus Analytics 1", "DL-0", "Platform Subscription", "Missing Security"),
+                    ("Quasar Analytics 2", "DL-1", "Enterprise Suite", "Missing Finance & Missing Security")]
+
+
+def test_stale_evaluate_orders_by_created_and_skips_recent_activity(standin):
+    columns, rows = standin.stale_evaluate({"stale_days": 21, "recent_days": 14})
+    assert columns == ["account", "deal_id", "deal", "created"]
+    assert rows == [("Quasar Analytics 2", "DL-6", "Team Plan", "2024-12-01"),
+                    ("Blue Analytics 0", "DL-4", "Analytics Add-on", "2025-01-01")]
+
+
+def test_open_deals_orders_by_amount(standin):
+    columns, rows = standin.open_deals({})
+    assert columns == ["account", "deal_id", "deal", "amount", "stage"]
+    assert [r[1] for r in rows] == ["DL-1", "DL-2", "DL-0", "DL-5", "DL-4", "DL-6"]
+    assert rows[0] == ("Quasar Analytics 2", "DL-1", "Enterprise Suite", 50000.0, "Proposal")
+
+
+def test_planned_templates_dispatch_to_their_evaluator(standin):
+    for name, (cypher, params) in template_cyphers().items():
+        assert template_name(cypher) == name
+        assert standin.run(cypher, params) == standin.evaluators[name](params)
+    with pytest.raises(NotImplementedError):
+        standin.run("MATCH (n) RETURN n", {})
+
+
+def test_parse_scale():
+    assert parse_scale("10k") == 10_000
+    assert parse_scale("2.5M") == 2_500_000
+    assert parse_scale("250_000") == 250_000
+    assert parse_scale(7) == 7
+    with pytest.raises(ValueError):
+        parse_scale("ten")
+
+
+def test_generate_crm_is_deterministic_and_consistent():
+    ds = generate_crm(2000, seed=1, today=TODAY)
+    again = generate_crm(2000, seed=1, today=TODAY)
+    for table in ("accounts", "users", "contacts", "deals", "activities"):
+        for column, values in getattr(ds, table).items():
+            np.testing.assert_array_equal(values, getattr(again, table)[column])
+    assert ds.counts == {"accounts": 250, "users": 6, "contacts": 750, "deals": 2000,
+                         "activities": len(ds.activities["deal"])}
+
+    d, a = ds.deals, ds.activities
+    assert d["account"].max() < 250 and d["owner"].max() < 6 and a["deal"].max() < 2000
+    np.testing.assert_array_equal(np.isnat(d["close_date"]), OPEN_STAGES[d["stage"]])
+    today = np.datetime64(TODAY, "D")
+    assert (d["created_date"] <= today).all()
+    assert ((a["date"] >= d["created_date"][a["deal"]]) & (a["date"] <= today)).all()
+
+
+def test_bench_schema_reaches_every_corpus_label():
+    schema = crm_clarity_schema()
+    inputs = [(q, question_entities(q)) for q in question_corpus(50)]
+    check_reachable(schema, inputs)
+    with pytest.raises(ValueError, match="No join path"):
+        check_reachable(dict(schema, edges=[]), inputs)
+
+
+def _report(plan_us, total_ms):
+    return {"micro": {"plan": {"n": 10, "p50": plan_us}, "skipped": {"n": 0}},
+            "e2e": [{"executor": "inprocess", "scale": "10k",
+                     "questions": {"open deals": {"stages": {"total": {"n": 5, "p50": total_ms}}}}}]}
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    rows, regressions = compare(_report(100.0, 20.0), _report(130.0, 21.0), tolerance=0.25)
+    assert [r[0] for r in rows] == ["e2e/inprocess/10k/open deals", "micro/plan"]
+    assert rows[1] == ("micro/plan", 100.0, 130.0, 1.3)
+    assert regressions == ["micro/plan"]
+
+
+def test_compare_tolerance():
+    baseline, current = _report(100.0, 20.0), _report(125.0, 40.0)
+    assert compare(baseline, current, tolerance=0.25)[1] == ["e2e/inprocess/10k/open deals"]
+    assert compare(baseline, current, tolerance=1.0)[1] == []
+    assert compare(current, baseline, tolerance=0.0)[1] == []
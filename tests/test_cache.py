@@ -0,0 +1,109 @@
+# SPDX-License-Identifier: Apache-2.0
+import pandas as pd
+import pytest
+
+from aivia import cache as cache_module
+from aivia.adapters.matcher_adapter import match_concepts_adapter
+from aivia.cache import PlanCache, ResultCache, normalize_question, notify_graph_write
+
+
+@pytest.mark.parametrize("question", ["Deals over 10k", "deals over 10,000", "DEALS   over 10 thousand",
+                                      "deals over 10000", "deals over 10K"])
+def test_amount_spellings_share_a_key(question):
+    assert normalize_question(question) == "deals over 10k"
+    assert match_concepts_adapter(normalize_question(question))["needs_amount_gt"] == 10000
+
+
+@pytest.mark.parametrize("question", ["deals with no activity in 2000 days", "stale for 1,000 days",
+                                      "closing 2024-07-05", "deals 1000 and 2000"])
+def test_durations_and_bare_numbers_are_kept(question):
+    normalized = normalize_question(question)
+    assert normalized == question.lower()
+    assert match_concepts_adapter(normalized) == match_concepts_adapter(question)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_plan_cache_lru_eviction():
+    plans = PlanCache(maxsize=2)
+    plans.put("a", 1)
+    plans.put("b", 2)
+    assert plans.get("a") == 1  # "b" is now least recently used
+    plans.put("c", 3)
+    assert plans.get("b") is None
+    assert (plans.get("a"), plans.get("c")) == (1, 3)
+    assert plans.stats() == {"hits": 3, "misses": 1, "size": 2, "maxsize": 2}
+
+
+def test_plan_cache_returns_copies():
+    plans = PlanCache()
+    plans.put("q", {"params": {"amount": 10000}})
+    plans.get("q")["params"]["amount"] = 1
+    assert plans.get("q") == {"params": {"amount": 10000}}
+
+
+def test_plan_cache_ttl(clock):
+    plans = PlanCache(ttl=60)
+    plans.put("q", "plan")
+    clock[0] += 59
+    assert plans.get("q") == "plan"
+    clock[0] += 2
+    assert plans.get("q") is None
+    assert plans.stats()["size"] == 0
+
+
+def test_plan_cache_schema_change_clears(tmp_path):
+    schema = tmp_path / "schema.yaml"
+    schema.write_text("labels: {}\n")
+    plans = PlanCache(schema_path=str(schema))
+    plans.put("q", "plan")
+    assert plans.get("q") == "plan"
+    schema.write_text("labels: {Deal: {}}\n")
+    assert plans.get("q") is None
+    plans.put("q", "plan")
+    plans.invalidate()
+    assert plans.get("q") is None
+
+
+def _frame(n):
+    return pd.DataFrame({"id": [f"D{i:06d}" for i in range(n)]})
+
+
+def test_result_cache_byte_budget_evicts_lru():
+    one = cache_module._frame_nbytes(_frame(100))
+    results = ResultCache(max_bytes=2 * one)
+    results.put("MATCH (d:Deal) RETURN d.id", _frame(100), {"n": 1})
+    results.put("MATCH (d:Deal) RETURN d.id", _frame(100), {"n": 2})
+    assert results.get("MATCH (d:Deal) RETURN d.id", {"n": 1}) is not None
+    results.put("MATCH (d:Deal) RETURN d.id", _frame(100), {"n": 3})
+    assert results.get("MATCH (d:Deal) RETURN d.id", {"n": 2}) is None
+    assert results.stats()["nbytes"] == 2 * one
+    results.put("MATCH (d:Deal) RETURN d.id", _frame(10_000), {"n": 4})  # over budget: not cached
+    assert results.stats()["size"] == 2
+
+
+def test_result_cache_ttl_and_date_bucket(clock):
+    day = ["2026-10-18"]
+    results = ResultCache(ttl=30, bucket=lambda: day[0])
+    results.put("MATCH (d:Deal) RETURN d", _frame(3))
+    clock[0] += 31
+    assert results.get("MATCH (d:Deal) RETURN d") is None
+    results.put("MATCH (d:Deal) RETURN d", _frame(3))
+    day[0] = "2026-10-19"
+    assert results.get("MATCH (d:Deal) RETURN d") is None
+
+
+def test_graph_writes_invalidate_by_label():
+    results = ResultCache()
+    results.put("MATCH (d:Deal) RETURN d", _frame(3))
+    results.put("MATCH (c:Contact) RETURN c", _frame(3))
+    notify_graph_write(["Contact"])
+    assert results.get("MATCH (d:Deal) RETURN d") is not None
+    assert results.get("MATCH (c:Contact) RETURN c") is None
+    notify_graph_write()
+    assert results.get("MATCH (d:Deal) RETURN d") is None
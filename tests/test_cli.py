@@ -0,0 +1,117 @@
+# SPDX-License-Identifier: Apache-2.0
+import datetime as dt
+import threading
+
+import pytest
+
+from aivia import __main__ as cli
+from aivia import client, connection, index_builder, server
+from aivia.server import QueryServer, make_server
+
+
+class _Engine:
+    plan_cache = None
+
+    def __init__(self):
+        self.questions = []
+
+    def run_rows(self, question, top_k=8):
+        self.questions.append(question)
+        rows = [("Acme", "D1", 12500.0, dt.date(2026, 10, 1)), ("Globex", "D2", float("nan"), None)]
+        params = {"amount": 10000, "stages": ("evaluate", "legal"), "since": dt.date(2026, 8, 19)}
+        return "MATCH (d:Deal) RETURN d", ["account", "deal_id", "amount", "close_date"], rows, \
+            {"params": params, "timing": {"total_s": 0.001}}
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = _Engine()
+    monkeypatch.setattr(connection, "get_engine", lambda **kwargs: engine)
+    monkeypatch.setattr(connection, "pool_metrics", lambda: {"default": {"in_use": 0}})
+    monkeypatch.setenv("AIVIA_NO_SERVER", "1")
+    return engine
+
+
+@pytest.fixture
+def running_server(tmp_path, monkeypatch):
+    engine = _Engine()
+    httpd = make_server(QueryServer(engine, address=str(tmp_path / "aivia.sock")))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("AIVIA_SERVER", str(tmp_path / "aivia.sock"))
+    monkeypatch.setattr(connection, "pool_metrics", lambda: {"default": {"in_use": 0}})
+    yield engine
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.mark.parametrize("argv, question", [
+    (["index deals over 10k"], "index deals over 10k"),
+    (["ask", "index", "deals", "over", "10k"], "index deals over 10k"),
+    (["--", "serve", "deals", "in", "legal"], "serve deals in legal"),
+    (["ask", "--", "ask", "about", "deals"], "ask about deals"),
+    (["open", "deals", ">10k"], "open deals >10k"),
+    ([], cli.DEFAULT_QUESTION),
+])
+def test_questions_are_not_taken_for_subcommands(engine, argv, question):
+    cli.main(argv)
+    assert engine.questions == [question]
+
+
+def test_subcommands_dispatch(monkeypatch):
+    calls = []
+    monkeypatch.setattr(index_builder, "main", lambda argv: calls.append(("index", argv)))
+    monkeypatch.setattr(server, "main", lambda argv: calls.append(("serve", argv)))
+    cli.main(["index", "build", "use_cases/sales_crm"])
+    cli.main(["serve", "--status"])
+    assert calls == [("index", ["build", "use_cases/sales_crm"]), ("serve", ["--status"])]
+
+
+def test_forwarded_and_in_process_output_match(running_server, capsys, monkeypatch):
+    monkeypatch.setenv("AIVIA_POOL_METRICS", "1")
+    cli.main(["deals", "over", "10k"])
+    forwarded = capsys.readouterr().out
+    assert running_server.questions == ["deals over 10k"]
+
+    engine = _Engine()
+    monkeypatch.setenv("AIVIA_NO_SERVER", "1")
+    monkeypatch.setattr(connection, "get_engine", lambda **kwargs: engine)
+    cli.main(["deals", "over", "10k"])
+    assert engine.questions == ["deals over 10k"]
+    assert capsys.readouterr().out == forwarded
+    assert "2026-10-01" in forwarded and "['evaluate', 'legal']" in forwarded
+
+
+def test_forward_without_a_server(tmp_path, monkeypatch):
+    monkeypatch.delenv("AIVIA_NO_SERVER", raising=False)
+    assert client.forward("deals", address=str(tmp_path / "missing.sock")) is None
+    assert client.forward("deals", address="http://127.0.0.1:9") is None
+
+
+def test_server_rejects_empty_questions(running_server):
+    with pytest.raises(client.ServerError, match="missing 'question'"):
+        client.request(client.server_address(), "POST", "/query", {"question": " "})
+    health = client.request(client.server_address(), "GET", "/health")
+    assert (health["status"], health["questions"]) == ("ok", 0)
+
+
+@pytest.mark.parametrize("body", [[], "deals", 3])
+def test_server_rejects_non_object_bodies(running_server, body):
+    with pytest.raises(client.ServerError, match="must be a JSON object"):
+        client.request(client.server_address(), "POST", "/query", body)
+    assert running_server.questions == []
+
+
+@pytest.mark.parametrize("host", ["0.0.0.0", "192.168.1.20", "example.com"])
+def test_http_refuses_non_loopback_hosts(host, monkeypatch, capsys):
+    monkeypatch.setattr(server, "request", lambda *args: pytest.fail("checked before contacting a server"))
+    with pytest.raises(SystemExit) as exc:
+        server.main(["--http", f"{host}:8765"])
+    assert exc.value.code == 2 and "--allow-remote" in capsys.readouterr().err
+    with pytest.raises(ValueError, match="non-loopback"):
+        make_server(QueryServer(_Engine(), address=f"http://{host}:8765"))
+
+
+@pytest.mark.parametrize("host", ["127.0.0.1", "localhost", "127.0.0.2", "::1"])
+def test_loopback_hosts_are_allowed(host):
+    assert server.is_loopback(host)
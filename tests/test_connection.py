@@ -0,0 +1,94 @@
+# SPDX-License-Identifier: Apache-2.0
+import logging
+
+import pytest
+from neo4j.exceptions import ClientError, ConnectionAcquisitionTimeoutError, ServiceUnavailable
+
+from aivia import connection
+from aivia.connection import DriverConfig, ManagedDriver, get_driver
+
+
+class _Session:
+    def __init__(self, error=None):
+        self.error = error
+
+    def run(self, *args, **kwargs):
+        if self.error:
+            raise self.error
+        return self
+
+    execute_read = execute_write = begin_transaction = run
+
+    def consume(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _Driver:
+    def __init__(self, error=None, unavailable=False):
+        self.error = error
+        self.unavailable = unavailable
+        self.closed = False
+
+    def session(self, **kwargs):
+        return _Session(self.error)
+
+    def verify_connectivity(self):
+        if self.unavailable:
+            raise ServiceUnavailable("no server")
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize("error, counted", [
+    (ConnectionAcquisitionTimeoutError("timed out"), 1),
+    (ClientError("failed to obtain a connection from the pool, just kidding"), 0),
+])
+def test_acquisition_timeouts_are_counted_by_type(error, counted):
+    managed = ManagedDriver(_Driver(error), DriverConfig(max_pool_size=2))
+    with pytest.raises(type(error)):
+        with managed.session() as s:
+            s.run("RETURN 1")
+    metrics = managed.metrics()
+    assert (metrics["acquisition_timeouts"], metrics["in_use"]) == (counted, 0)
+
+
+@pytest.mark.parametrize("method", ["execute_read", "execute_write", "begin_transaction"])
+def test_acquisition_timeouts_are_counted_for_transactions(method):
+    managed = ManagedDriver(_Driver(ConnectionAcquisitionTimeoutError("timed out")), DriverConfig(max_pool_size=2))
+    with pytest.raises(ConnectionAcquisitionTimeoutError):
+        with managed.session() as s:
+            getattr(s, method)(lambda tx: None)
+    assert managed.metrics()["acquisition_timeouts"] == 1
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    created = []
+
+    def create(config):
+        created.append(_Driver(unavailable=config.uri.endswith("down")))
+        return created[-1]
+
+    monkeypatch.setattr(connection, "create_driver", create)
+    monkeypatch.setattr(connection, "_DRIVERS", {})
+    return created
+
+
+def test_failed_warm_up_closes_the_driver(drivers):
+    with pytest.raises(ServiceUnavailable):
+        get_driver("test", DriverConfig(uri="bolt://down"))
+    assert drivers[0].closed
+    assert "test" not in connection._DRIVERS
+
+
+def test_warm_up_logs_instead_of_printing(drivers, capsys, caplog):
+    with caplog.at_level(logging.INFO, logger="aivia.connection"):
+        managed = get_driver("test", DriverConfig())
+    assert get_driver("test") is managed
+    assert len(drivers) == 1
+    assert capsys.readouterr().out == ""
+    assert "Warmed 1 pooled connection(s)" in caplog.text
@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: Apache-2.0
+import json
+import logging
+
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from aivia.index_builder import build_indexes
+from aivia.matching.faiss_search import (FaissHandles, VectorIndex, load_faiss_handles, make_index, normalize,
+                                         save_vector_index, search_options, vector_matches)
+
+STAGES = ["Evaluate", "Prospecting", "Legal", "Closed Won", "Closed Lost"]
+
+
+def _encoder(texts):
+    """Deterministic stand-in for a sentence model: one basis vector per known stage."""
+    vectors = np.full((len(texts), 8), 0.01, dtype=np.float32)
+    for row, text in enumerate(texts):
+        for i, stage in enumerate(STAGES):
+            if stage.lower() in text.lower():
+                vectors[row, i] = 1.0
+    return normalize(vectors)
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    vindex = VectorIndex(make_index(_encoder(STAGES)),
+                         [{"table": "Deal", "column": "stage", "value": v} for v in STAGES])
+    save_vector_index(tmp_path / "value", vindex)
+    (tmp_path / "manifest.json").write_text(json.dumps({"model": "stub", "dim": 8, "kinds": ["value"]}))
+    return tmp_path
+
+
+def test_search_settings_are_per_call(index_dir):
+    config = {"index_dir": str(index_dir), "encoder": _encoder}
+    handles = load_faiss_handles(config)
+    _, narrow = vector_matches(handles, [], ["evaluate"], **search_options({**config, "threshold": 0.9}))
+    _, wide = vector_matches(handles, [], ["evaluate"], **search_options({**config, "threshold": 0.0, "top_k": 3}))
+    assert [m["value"] for m in narrow] == ["Evaluate"]
+    assert len(wide) == 3
+    shared = load_faiss_handles({"index_dir": str(index_dir)})
+    assert (shared.top_k, shared.threshold) == (FaissHandles.top_k, FaissHandles.threshold)
+
+
+def test_custom_encoders_do_not_share_handles(index_dir):
+    other = lambda texts: _encoder(["legal"] * len(texts))
+    first = load_faiss_handles({"index_dir": str(index_dir), "encoder": _encoder})
+    second = load_faiss_handles({"index_dir": str(index_dir), "encoder": other})
+    assert (first.encoder, second.encoder) == (_encoder, other)
+    assert first.indexes is second.indexes
+    _, values = vector_matches(second, [], ["evaluate"], threshold=0.9)
+    assert [m["value"] for m in values] == ["Legal"]
+
+
+def test_nprobe_and_ef_search_leave_the_index_untouched():
+    rng = np.random.default_rng(0)
+    vectors = normalize(rng.standard_normal((2_000, 16)))
+    payloads = [{"i": i} for i in range(len(vectors))]
+    ivf = VectorIndex(make_index(vectors, "ivf", nlist=32), payloads)
+    hnsw = VectorIndex(make_index(vectors, "hnsw"), payloads)
+    queries = vectors[:50]
+
+    exact = [hits[0][1]["i"] for hits in ivf.search(queries, 1, -1.0, nprobe=32)]
+    assert exact == list(range(50))
+    assert faiss.downcast_index(ivf.index).nprobe == 1
+    hnsw.search(queries, 1, -1.0, ef_search=128)
+    assert faiss.downcast_index(hnsw.index).hnsw.efSearch == 16
+
+
+def test_build_indexes_logs_progress(tmp_path, capsys, caplog):
+    with caplog.at_level(logging.INFO, logger="aivia.index_builder"):
+        first = build_indexes("use_cases/sales_crm", tmp_path, encoder=_encoder)
+        caplog.clear()
+        second = build_indexes("use_cases/sales_crm", tmp_path, encoder=_encoder)
+    assert capsys.readouterr().out == ""
+    assert all(s.rebuilt for s in first) and not any(s.rebuilt for s in second)
+    assert "Embedded 0 new text(s)" in caplog.text
+    assert f"Index {second[0]}" in caplog.text and "unchanged" in str(second[0])
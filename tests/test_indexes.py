@@ -0,0 +1,76 @@
+# SPDX-License-Identifier: Apache-2.0
+import logging
+
+from aivia.indexes import advise, apply, predicate_properties, template_cyphers
+from aivia.schema_loader import load_schema
+
+CONSTRAINTS = [
+    ("account_id_unique", "UNIQUENESS", ["Account"], ["id"]),
+    ("user_id_unique", "NODE_PROPERTY_UNIQUENESS", ["User"], ["id"]),
+    ("deal_key", "NODE_KEY", ["Deal"], ["id"]),
+    ("activity_id_exists", "NODE_PROPERTY_EXISTENCE", ["Activity"], ["id"]),
+]
+INDEXES = [
+    ("LOOKUP", "NODE", None, None, None),
+    ("RANGE", "NODE", ["Account"], ["id"], "account_id_unique"),
+    ("RANGE", "NODE", ["User"], ["id"], "user_id_unique"),
+    ("RANGE", "NODE", ["Deal"], ["id"], "deal_key"),
+    ("RANGE", "NODE", ["Contact"], ["id"], None),       # a plain index is not a constraint
+    ("TEXT", "NODE", ["Deal"], ["stage"], None),        # can't serve range predicates
+    ("RANGE", "NODE", ["Deal"], ["amount"], None),
+]
+
+
+class _Session:
+    def __init__(self):
+        self.created = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, cypher, *args):
+        if cypher.startswith("SHOW CONSTRAINTS"):
+            return iter(CONSTRAINTS)
+        if cypher.startswith("SHOW INDEXES"):
+            return iter(INDEXES)
+        self.created.append(cypher)
+        return self
+
+    def consume(self):
+        pass
+
+
+class _Driver:
+    def __init__(self):
+        self.session_ = _Session()
+
+    def session(self):
+        return self.session_
+
+
+def test_only_uniqueness_constraints_count_as_present():
+    recs = advise(load_schema("use_cases/sales_crm"), template_cyphers())
+    created, present = apply(_Driver(), recs)
+    assert sorted(present) == ["account_id_unique", "deal_amount_range", "node_label_lookup_index",
+                               "user_id_unique"]
+    assert {"deal_id_unique", "contact_id_unique", "activity_id_unique", "deal_stage_range",
+            "rel_type_lookup_index"} <= set(created)
+
+
+def test_apply_logs_instead_of_printing(capsys, caplog):
+    recs = advise(load_schema("use_cases/sales_crm"), template_cyphers())
+    with caplog.at_level(logging.INFO, logger="aivia.indexes"):
+        created, present = apply(_Driver(), recs)
+    assert capsys.readouterr().out == ""
+    assert f"Created {len(created)} index(es)/constraint(s), {len(present)} already present" in caplog.text
+
+
+def test_predicate_properties_flags():
+    found = predicate_properties(
+        "MATCH (a:Account)-[:HAS_DEAL]->(d:Deal {stage: $stage}) WHERE date(d.created_date) >= $since "
+        "AND d.amount > $amount\nRETURN a.name")
+    assert found == {("Deal", "stage"): {"inline"}, ("Deal", "created_date"): {"where", "wrapped"},
+                     ("Deal", "amount"): {"where"}}
@@ -0,0 +1,20 @@
+# SPDX-License-Identifier: Apache-2.0
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+HEAVY = ("pandas", "neo4j", "numpy", "faiss")
+
+
+@pytest.mark.parametrize("module", ["aivia", "aivia.client", "aivia.matching._real_label_and_filter_matcher",
+                                    "aivia.adapters.matcher_adapter", "aivia.__main__"])
+def test_import_leaves_heavy_dependencies_unloaded(module):
+    code = (f"import importlib, sys; importlib.import_module({module!r}); "
+            f"print(' '.join(name for name in {HEAVY!r} if name in sys.modules))")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(SRC), os.environ.get("PYTHONPATH", "")]))
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
@@ -0,0 +1,31 @@
+# SPDX-License-Identifier: Apache-2.0
+import pytest
+
+from aivia.matching.lexicon import ConceptLexicon, get_concept_lexicon
+from bench_lexicon import Concept, Registry, generate_concepts, generate_tokens, reference_find
+
+
+@pytest.mark.parametrize("n_synonyms, seed", [(200, 1), (2_000, 2), (10_000, 3)])
+def test_lexicon_finds_what_the_linear_scan_finds(n_synonyms, seed):
+    concepts = generate_concepts(n_synonyms, seed=seed)
+    registry, lexicon = Registry(concepts), ConceptLexicon(concepts.values())
+    tokens = generate_tokens(concepts, 100, seed=seed)
+    assert [lexicon.find(t) for t in tokens] == [reference_find(registry, t) for t in tokens]
+
+
+def test_ties_go_to_the_first_concept_and_strategy():
+    concepts = {"A": Concept("Hypertension", ["High blood pressure"]),
+                "B": Concept("Hypertensive crisis", ["Tension"]),
+                "C": Concept("Anemia", ["Low hemoglobin"])}
+    registry, lexicon = Registry(concepts), ConceptLexicon(concepts.values())
+    for token in ["tension", "HYPERTENSIVE", "anemic", "anem", "hemoglobinuria", "blood", "x", ""]:
+        assert lexicon.find(token) is reference_find(registry, token), token
+
+
+def test_lexicon_is_rebuilt_when_the_registry_changes():
+    registry = Registry(generate_concepts(100))
+    lexicon = get_concept_lexicon(registry)
+    assert get_concept_lexicon(registry) is lexicon
+    registry._medical_concepts = dict(registry._medical_concepts, extra=Concept("Gastritis", []))
+    assert get_concept_lexicon(registry) is not lexicon
+    assert get_concept_lexicon(registry).find("gastrit").preferred_term == "Gastritis"
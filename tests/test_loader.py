@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: Apache-2.0
+import datetime as dt
+import logging
+
+import pandas as pd
+
+from aivia.loader import (EdgeSpec, LoadStats, NodeSpec, edge_batch_cypher, edge_rows, node_batch_cypher,
+                          node_rows, sanitize_df, write_batches)
+
+
+class _Tx:
+    def __init__(self, writes):
+        self.writes = writes
+
+    def run(self, cypher, **params):
+        self.writes.append((cypher, params["rows"]))
+        return self
+
+    def consume(self):
+        pass
+
+
+class _Session:
+    def __init__(self):
+        self.writes = []
+        self.transactions = 0
+
+    def execute_write(self, work):
+        self.transactions += 1
+        return work(_Tx(self.writes))
+
+
+def _deals():
+    return pd.DataFrame({"deal_id": ["D1", "D2"], "amount": ["1200", None], "is_commit": ["TRUE", "no"],
+                         "created_date": ["2025-05-01", " "], "owner_user_id": ["U1", None]})
+
+
+def test_sanitize_df_keeps_string_dates_by_default():
+    rows = sanitize_df(_deals()).to_dict(orient="records")
+    assert rows[0] == {"deal_id": "D1", "amount": 1200.0, "is_commit": True, "created_date": "2025-05-01",
+                       "owner_user_id": "U1"}
+    assert rows[1]["amount"] == 0.0 and rows[1]["is_commit"] is False
+    assert rows[1]["created_date"] is None and rows[1]["owner_user_id"] is None
+
+
+def test_sanitize_df_native_dates():
+    df = sanitize_df(pd.DataFrame({"created_date": ["2025-05-01", "", "not a date"]}), native_dates=True)
+    assert df["created_date"].tolist() == [dt.date(2025, 5, 1), None, None]
+
+
+def test_batch_cypher():
+    assert node_batch_cypher("Deal") == "UNWIND $rows AS row MERGE (n:Deal {id: row.id}) SET n += row"
+    owned = EdgeSpec("Deal", "OWNED_BY", "User", "deals.csv", "deal_id", "owner_user_id")
+    assert edge_batch_cypher(owned) == ("UNWIND $rows AS row MATCH (a:Deal {id: row.src}) MATCH (b:User {id: row.dst}) "
+                                        "MERGE (a)-[r:OWNED_BY]->(b) SET r += row.props")
+    touched = EdgeSpec("Campaign", "TOUCHED", "Contact", "touches.csv", "campaign_id", "contact_id",
+                       ["date"], merge_keys=["date"])
+    assert "MERGE (a)-[r:TOUCHED {date: row.props.date}]->(b)" in edge_batch_cypher(touched)
+
+
+def test_node_and_edge_rows():
+    df = sanitize_df(_deals())
+    rows = node_rows(df, NodeSpec("Deal", "deals.csv", "deal_id", ["amount", "missing"], rename={"amount": "value"}))
+    assert rows == [{"id": "D1", "value": 1200.0}, {"id": "D2", "value": 0.0}]
+    owned = EdgeSpec("Deal", "OWNED_BY", "User", "deals.csv", "deal_id", "owner_user_id")
+    assert edge_rows(df, owned) == [{"src": "D1", "dst": "U1", "props": {}}]  # no owner, no edge
+
+
+def test_write_batches_splits_rows_into_transactions(caplog):
+    session = _Session()
+    rows = [{"id": i} for i in range(5)]
+    with caplog.at_level(logging.INFO, logger="aivia.loader"):
+        stats = write_batches(session, "UNWIND $rows AS row", rows, 2, "Deal")
+    assert session.transactions == 3
+    assert [batch for _, batch in session.writes] == [rows[0:2], rows[2:4], rows[4:5]]
+    assert isinstance(stats, LoadStats) and (stats.name, stats.rows) == ("Deal", 5)
+    assert "Loaded Deal: 5 rows" in caplog.text
@@ -0,0 +1,33 @@
+# SPDX-License-Identifier: Apache-2.0
+import random
+
+import pytest
+
+from aivia.adapters.matcher_adapter import _KeywordAutomaton, match_concepts_adapter
+from bench_matcher import generate_corpus, reference_match
+
+
+def test_adapter_matches_the_reference_extractor(capsys):
+    corpus = generate_corpus(3000, seed=1) + ["", "10,000", "OPEN DEALS > 10K", "committed deal cfo signed"]
+    mismatches = [q for q in corpus if list(match_concepts_adapter(q).items()) != list(reference_match(q).items())]
+    assert mismatches == []
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_keyword_automaton_finds_every_keyword_a_substring_check_would(seed):
+    # A two-letter alphabet forces nested, overlapping and spilling keywords
+    rng = random.Random(seed)
+    word = lambda lo, hi: "".join(rng.choice("ab") for _ in range(rng.randint(lo, hi)))
+    tagged = [(f"t{i}", word(1, 5)) for i in range(rng.randint(1, 12))]
+    automaton = _KeywordAutomaton(tagged)
+    for _ in range(200):
+        text = word(0, 20)
+        assert automaton.scan(text) == {tag for tag, keyword in tagged if keyword in text}, (tagged, text)
+
+
+def test_keyword_automaton_on_the_adapter_keywords():
+    automaton = _KeywordAutomaton([("stage", "won"), ("stage", "closed won"), ("commit", "commit"),
+                                   ("commit", "committed deal"), ("role", "security officer"),
+                                   ("role", "officer")])
+    assert automaton.scan("closed won committed deal security officer") == {"stage", "commit", "role"}
+    assert automaton.scan("no match here") == set()
@@ -0,0 +1,58 @@
+# SPDX-License-Identifier: Apache-2.0
+from types import SimpleNamespace
+
+import pytest
+
+from aivia.matching import _real_label_and_filter_matcher as matcher
+
+CLARITY_SCHEMA = {
+    "tables": {
+        "PATIENT": {"aliases": ["patient"], "primary_key": "PAT_ID", "columns": [{"name": "PAT_ID"}]},
+        "PAT_ENC": {"aliases": ["encounter", "visit"], "primary_key": "PAT_ENC_CSN_ID",
+                    "columns": [{"name": "PAT_ENC_CSN_ID"}, {"name": "PAT_ID"}]},
+        "REFERRAL": {"aliases": ["referral"], "primary_key": "REFERRAL_ID",
+                     "columns": [{"name": "REFERRAL_ID"}, {"name": "PAT_ID"}]},
+    },
+    "joins": [
+        {"left_table": "PAT_ENC", "right_table": "PATIENT", "left_column": "PAT_ID", "right_column": "PAT_ID"},
+        {"left_table": "REFERRAL", "right_table": "PATIENT", "left_column": "PAT_ID", "right_column": "PAT_ID"},
+    ],
+}
+
+
+class _Registry:
+    """Just enough of the pattern registry for entity and negation matching."""
+
+    def get_entity_types(self):
+        return {}
+
+    def discover_entities_from_schema(self, schema):
+        pass
+
+    def find_entity_type_from_schema(self, table_name, column_names):
+        return None
+
+    def find_medical_concept(self, token):
+        return None
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    monkeypatch.setattr(matcher, "_pattern_registry", _Registry)
+
+
+def _entity(mention, type_):
+    return SimpleNamespace(mention=mention, type=type_)
+
+
+def test_positive_and_negated_clarity_tables_are_joined():
+    result = matcher.match_labels_and_filters(
+        question="patients with an encounter and no referral", target_row_grain="patient",
+        entities=[_entity("patients", "entity"), _entity("encounters", "entity"), _entity("no referral", "negation")],
+        filters=[], faiss_config={}, clarity_schema=CLARITY_SCHEMA)
+
+    assert result["from"] == "PATIENT"
+    joins = {(j["source_table"], j["target_table"]): j["join_type"] for j in result["joins"]}
+    assert joins == {("PATIENT", "PAT_ENC"): "INNER", ("PATIENT", "REFERRAL"): "LEFT"}
+    assert {"kind": "negation_filter", "applies_to": ["REFERRAL.REFERRAL_ID"], "operator": "IS NULL",
+            "source": "negation_pattern", "pattern": "no referral"} in result["filters"]
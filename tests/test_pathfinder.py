@@ -0,0 +1,85 @@
+# SPDX-License-Identifier: Apache-2.0
+from pathlib import Path
+
+import pytest
+import yaml
+
+from aivia.pathfinder import PathfinderEngine, clear_pathfinder_engines, get_pathfinder_engine
+
+SALES_CRM_SCHEMA = Path(__file__).resolve().parents[1] / "use_cases" / "sales_crm" / "schema.yaml"
+
+CLARITY_SCHEMA = {
+    "tables": {"PATIENT": {}, "PAT_ENC": {}, "REFERRAL": {}, "CLARITY_SER": {}, "ZC_REFERRAL_STATUS": {}},
+    "joins": [
+        {"left_table": "PAT_ENC", "right_table": "PATIENT", "left_column": "PAT_ID", "right_column": "PAT_ID"},
+        {"left_table": "REFERRAL", "right_table": "PATIENT", "on": "REFERRAL.PAT_ID = PATIENT.PAT_ID"},
+        {"left_table": "PAT_ENC", "right_table": "CLARITY_SER", "left_column": "VISIT_PROV_ID",
+         "right_column": "PROV_ID"},
+        {"left_table": "REFERRAL", "right_table": "ZC_REFERRAL_STATUS", "left_column": "RFL_STATUS_C",
+         "right_column": "RFL_STATUS_C"},
+    ],
+}
+
+
+@pytest.fixture
+def crm():
+    with open(SALES_CRM_SCHEMA, encoding="utf-8") as f:
+        return PathfinderEngine.from_schema(yaml.safe_load(f))
+
+
+def test_sales_crm_tree_and_conditions(crm):
+    plan = crm.complete_path("Deal", ["Contact", "Activity"])
+    assert set(plan.edges) == {("Deal", "Account"), ("Account", "Contact"), ("Deal", "Activity")}
+    assert plan.edges.index(("Deal", "Account")) < plan.edges.index(("Account", "Contact"))
+    assert plan.edges_on["Deal->Account"] == "Deal.account_id = Account.id"
+    assert "Account-[:HAS_DEAL]->Deal" in plan.patterns()
+    assert plan.unreachable == []
+
+
+def test_sales_crm_optional_targets_are_left_joined(crm):
+    plan = crm.complete_path("Deal", ["User"], optional=["Contact"])
+    joins = {(j["source_table"], j["target_table"]): j["join_type"] for j in plan.joins()}
+    assert joins == {("Deal", "User"): "INNER", ("Deal", "Account"): "LEFT", ("Account", "Contact"): "LEFT"}
+    assert [j["join_type"] for j in plan.joins()] == ["INNER", "LEFT", "LEFT"]
+
+
+def test_shared_prefix_is_joined_once_as_inner(crm):
+    plan = crm.complete_path("Activity", ["Account"], optional=["Contact", "User"])
+    assert len(plan.edges) == len(set(plan.edges)) == 4
+    assert plan.join_types["Activity->Deal"] == "INNER"
+    assert plan.join_types["Account->Contact"] == "LEFT"
+
+
+def test_unknown_targets_are_reported_not_raised(crm):
+    plan = crm.complete_path("Deal", ["Account", "Invoice"])
+    assert plan.unreachable == ["Invoice"]
+    assert plan.edges == [("Deal", "Account")]
+    with pytest.raises(KeyError):
+        crm.complete_path("Invoice", ["Deal"])
+
+
+def test_clarity_joins_become_edges():
+    engine = PathfinderEngine.from_schema(CLARITY_SCHEMA)
+    plan = engine.complete_path("PAT_ENC", ["REFERRAL"], optional=["ZC_REFERRAL_STATUS"])
+    assert plan.edges == [("PAT_ENC", "PATIENT"), ("PATIENT", "REFERRAL"), ("REFERRAL", "ZC_REFERRAL_STATUS")]
+    assert plan.edges_on["PAT_ENC->PATIENT"] == "PAT_ENC.PAT_ID = PATIENT.PAT_ID"
+    assert plan.edges_on["PATIENT->REFERRAL"] == "REFERRAL.PAT_ID = PATIENT.PAT_ID"
+    assert plan.join_types["REFERRAL->ZC_REFERRAL_STATUS"] == "LEFT"
+
+
+def test_shared_engines_are_cached_per_schema_object():
+    clear_pathfinder_engines()
+    engine = get_pathfinder_engine(schema=CLARITY_SCHEMA)
+    assert get_pathfinder_engine(schema=CLARITY_SCHEMA) is engine
+    assert get_pathfinder_engine(schema=dict(CLARITY_SCHEMA)) is not engine
+    edges = [{"from": "A", "rel": "R", "to": "B"}]
+    assert get_pathfinder_engine(edges=edges).shortest_path("A", "B") == ["A", "B"]
+    assert get_pathfinder_engine(SALES_CRM_SCHEMA) is get_pathfinder_engine(SALES_CRM_SCHEMA)
+    assert "Deal" in get_pathfinder_engine(SALES_CRM_SCHEMA).labels
+
+
+def test_memoized_plans_match_fresh_ones(crm):
+    first = crm.complete_path("Deal", ["Contact", "User"], optional=["Activity"])
+    again = crm.complete_path("deal", [{"table": "user"}, "Contact"], optional=["Activity"])
+    assert again is first
+    assert crm.cache_info()["hits"] == 1
@@ -0,0 +1,188 @@
+# SPDX-License-Identifier: Apache-2.0
+import datetime as dt
+import threading
+from types import SimpleNamespace
+
+import neo4j.time
+import numpy as np
+
+from aivia.cache import ResultCache
+from aivia.run_query import AiviaEngine, _columnar_frame
+
+
+class _Result:
+    def __init__(self, columns, rows):
+        self._columns = columns
+        self._rows = list(rows)
+        self.fetches = []
+
+    def keys(self):
+        return self._columns
+
+    def __iter__(self):
+        rows, self._rows = self._rows, []
+        return iter(rows)
+
+    def fetch(self, n):
+        self.fetches.append(n)
+        batch, self._rows = self._rows[:n], self._rows[n:]
+        return batch
+
+    def consume(self):
+        return SimpleNamespace(result_available_after=3, result_consumed_after=1)
+
+
+class _Session:
+    def __init__(self, driver, kwargs):
+        self.driver = driver
+        self.kwargs = kwargs
+        self.thread = threading.current_thread()
+        self.runs = []
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def run(self, cypher, params):
+        self.runs.append((cypher, params))
+        self.driver.result = _Result(*self.driver.answer(cypher, params))
+        return self.driver.result
+
+    def close(self):
+        self.closed = True
+
+
+class _Driver:
+    """Answers every query with one (deal_id, amount) row carrying the `$amount` parameter."""
+
+    def __init__(self, answer=None):
+        self.answer = answer or (lambda cypher, params: (["deal_id", "amount"], [("D1", params.get("amount"))]))
+        self.sessions = []
+        self.result = None
+
+    def session(self, **kwargs):
+        session = _Session(self, kwargs)
+        self.sessions.append(session)
+        return session
+
+    @property
+    def runs(self):
+        return [run for s in self.sessions for run in s.runs]
+
+
+NO_MEETING = "open deals > {}k last 60 days no next meeting 14 days"
+BATCH = [NO_MEETING.format(10), "open deals", NO_MEETING.format(10), NO_MEETING.format(25)]
+
+
+def test_run_many_executes_each_unique_query_once_in_input_order():
+    driver = _Driver()
+    results = AiviaEngine(driver).run_many(BATCH, concurrency=1)
+
+    assert [debug["question"] for _, _, debug in results] == BATCH
+    assert [df["amount"].fillna(0).tolist() for _, df, _ in results] == [[10000.0], [0.0], [10000.0], [25000.0]]
+    assert [debug["deduped"] for _, _, debug in results] == [False, False, True, False]
+    assert results[2][1] is not results[0][1] and results[2][1].equals(results[0][1])
+
+    assert len(driver.runs) == 3
+    assert sorted(params.get("amount", 0) for _, params in driver.runs) == [0, 10000, 25000]
+    assert len(driver.sessions) == 1 and driver.sessions[0].closed
+
+
+def test_run_many_opens_one_session_per_worker():
+    driver = _Driver()
+    AiviaEngine(driver).run_many(BATCH, concurrency=3)
+    assert 1 <= len(driver.sessions) <= 3 and len(driver.runs) == 3
+    assert len({s.thread for s in driver.sessions}) == len(driver.sessions)
+    assert all(s.closed for s in driver.sessions)
+
+
+def test_run_many_opens_no_session_on_result_cache_hits():
+    driver = _Driver()
+    engine = AiviaEngine(driver, result_cache=ResultCache())
+    engine.run_many(BATCH, concurrency=2)
+    sessions, runs = len(driver.sessions), len(driver.runs)
+
+    results = engine.run_many(BATCH, concurrency=2)
+    assert (len(driver.sessions), len(driver.runs)) == (sessions, runs)
+    assert all(debug["timing"].get("result_cache_hit") for _, _, debug in results)
+    assert [df["amount"].fillna(0).tolist() for _, df, _ in results] == [[10000.0], [0.0], [10000.0], [25000.0]]
+
+
+def _deals(n):
+    return lambda cypher, params: (["deal_id", "amount"], [(f"D{i}", float(i)) for i in range(n)])
+
+
+def test_stream_yields_chunks_with_a_short_last_one():
+    driver = _Driver(_deals(7))
+    chunks = list(AiviaEngine(driver).stream("open deals", chunk_size=3))
+    assert [len(c) for c in chunks] == [3, 3, 1]
+    assert [d for c in chunks for d in c["deal_id"]] == [f"D{i}" for i in range(7)]
+    assert driver.sessions[0].kwargs == {"fetch_size": 3}
+    assert driver.result.fetches == [3, 3, 3, 3]
+
+
+def test_stream_slices_a_cached_result():
+    driver = _Driver(_deals(5))
+    engine = AiviaEngine(driver, result_cache=ResultCache())
+    engine.run("open deals")
+    sessions = len(driver.sessions)
+    chunks = list(engine.stream("open deals", chunk_size=2))
+    assert len(driver.sessions) == sessions
+    assert [c["deal_id"].tolist() for c in chunks] == [["D0", "D1"], ["D2", "D3"], ["D4"]]
+
+
+def test_stream_of_an_empty_result_yields_nothing():
+    driver = _Driver(_deals(0))
+    assert list(AiviaEngine(driver).stream("open deals", chunk_size=3)) == []
+    assert driver.sessions[0].closed
+
+
+def test_columnar_frame_amount_none_is_nan():
+    df = _columnar_frame(["deal_id", "amount"], [("D1", 12000), ("D2", None)])
+    assert df["amount"].dtype == np.float64
+    assert df["amount"].iloc[0] == 12000.0 and np.isnan(df["amount"].iloc[1])
+    assert df["deal_id"].tolist() == ["D1", "D2"]
+
+
+def test_columnar_frame_amount_falls_back_to_to_numeric():
+    df = _columnar_frame(["amount"], [("12.5",), (None,), ("n/a",)])
+    assert df["amount"].dtype == np.float64
+    assert df["amount"].iloc[0] == 12.5 and df["amount"].iloc[1:].isna().all()
+
+
+def test_columnar_frame_dates_and_stage():
+    records = [(neo4j.time.Date(2025, 5, 1), "Evaluate"), (None, "Legal"), (neo4j.time.Date(2025, 4, 2), "Evaluate")]
+    df = _columnar_frame(["created", "stage"], records)
+    assert str(df["created"].dtype).startswith("datetime64")
+    assert df["created"].iloc[0] == dt.datetime(2025, 5, 1) and df["created"].isna().tolist() == [False, True, False]
+    assert df["stage"].dtype == "category"
+    assert sorted(df["stage"].cat.categories) == ["Evaluate", "Legal"]
+
+    strings = _columnar_frame(["created"], [("2025-05-01",), ("",)])
+    assert strings["created"].iloc[0] == dt.datetime(2025, 5, 1) and strings["created"].isna().iloc[1]
+
+
+def test_columnar_frame_of_no_records_keeps_columns():
+    df = _columnar_frame(["deal_id", "amount", "stage", "created"], [])
+    assert list(df.columns) == ["deal_id", "amount", "stage", "created"] and len(df) == 0
+    assert df["amount"].dtype == np.float64 and df["stage"].dtype == "category"
+
+
+def test_thresholds_are_parameters_not_cypher_text():
+    engine = AiviaEngine(None)
+    plan = lambda q: engine._plan(q, top_k=8)[2:]  # noqa: E731
+
+    cypher, params = plan("open deals > 10k last 60 days no next meeting 14 days")
+    other_cypher, other_params = plan("open deals > 25k last 30 days no next meeting 7 days")
+    assert other_cypher == cypher and "25" not in cypher
+    assert all(f"${name}" in cypher for name in ("amount", "window_days", "next_days"))
+    assert params == {"amount": 10000, "window_days": 60, "next_days": 14}
+    assert other_params == {"amount": 25000, "window_days": 30, "next_days": 7}
+
+    cypher, params = plan("evaluate stage > 21 days with no activity in 14 days")
+    other_cypher, other_params = plan("evaluate stage > 45 days with no activity in 14 days")
+    assert other_cypher == cypher and "$stale_days" in cypher
+    assert (params["stale_days"], other_params["stale_days"]) == (21, 45)
@@ -0,0 +1,36 @@
+# SPDX-License-Identifier: Apache-2.0
+import pytest
+
+from aivia.matching.schema_index import SchemaIndex, get_schema_index
+from bench_schema_index import (FakeRegistry, generate_schema, generate_tokens, reference_diagnosis,
+                                reference_match_table, reference_table_for_concept)
+
+
+@pytest.fixture(scope="module")
+def schema():
+    return generate_schema(400)
+
+
+def test_match_table_matches_the_linear_scan(schema):
+    index = SchemaIndex(schema)
+    tokens = generate_tokens(1500) + ["", "s", "PATIENT_HX", "zzz"]
+    assert [index.match_table(t) for t in tokens] == [reference_match_table(t, schema) for t in tokens]
+
+
+def test_table_for_concept_matches_the_linear_scan(schema):
+    index, registry = SchemaIndex(schema), FakeRegistry()
+    tokens = generate_tokens(300, seed=8)
+    assert [index.table_for_concept(t, registry) for t in tokens] == \
+        [reference_table_for_concept(t, schema, registry) for t in tokens]
+
+
+@pytest.mark.parametrize("n_tables", [1, 40, 400])
+def test_diagnosis_column_matches_the_scan(n_tables):
+    schema = generate_schema(n_tables, seed=n_tables)
+    best = SchemaIndex(schema).diagnosis
+    assert (best["table"], best["column"]) == reference_diagnosis(schema)
+
+
+def test_indexes_are_cached_per_schema_object(schema):
+    assert get_schema_index(schema) is get_schema_index(schema)
+    assert get_schema_index(dict(schema)) is not get_schema_index(schema)
@@ -0,0 +1,96 @@
+# SPDX-License-Identifier: Apache-2.0
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from aivia.schema_loader import compile_load_plan, load_schema, run_load_plan
+
+ROOT = Path(__file__).resolve().parents[1]
+USE_CASE = ROOT / "use_cases" / "sales_crm"
+DEMO = ROOT / "examples" / "sales_crm_demo"
+
+
+class _Session:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, cypher, **params):
+        written = re.search(r"MERGE \(n:(\w+)|\[r:(\w+)", cypher)
+        if written:
+            if written.group(1) == "User":
+                time.sleep(0.05)  # the last label to finish, so OWNED_BY has to wait for it
+            with self.driver.lock:
+                self.driver.writes.append(written.group(1) or written.group(2))
+        return self
+
+    def consume(self):
+        pass
+
+    def execute_write(self, work):
+        return work(self)
+
+
+class _Driver:
+    def __init__(self):
+        self.writes = []
+        self.lock = threading.Lock()
+
+    def session(self):
+        return _Session(self)
+
+
+def test_compile_load_plan_for_sales_crm(caplog):
+    with caplog.at_level(logging.WARNING, logger="aivia.schema_loader"):
+        plan = compile_load_plan(load_schema(USE_CASE), DEMO)
+    assert caplog.records == []
+
+    nodes = {n.label: n for n in plan.nodes}
+    assert {label: (n.csv, n.key) for label, n in nodes.items()} == {
+        "Account": ("accounts.csv", "account_id"), "Deal": ("deals.csv", "deal_id"),
+        "Activity": ("activities.csv", "activity_id"), "User": ("users.csv", "user_id"),
+        "Contact": ("contacts.csv", "contact_id")}
+    assert nodes["Deal"].rename == {"owner_user_id": "owner_id"}  # FK column found by convention
+    assert [(e.src, e.rel, e.dst, e.csv, e.src_key, e.dst_key) for e in plan.edges] == [
+        ("Account", "HAS_DEAL", "Deal", "deals.csv", "account_id", "deal_id"),
+        ("Deal", "HAS_ACTIVITY", "Activity", "activities.csv", "deal_id", "activity_id"),
+        ("Deal", "OWNED_BY", "User", "deals.csv", "deal_id", "owner_user_id"),
+        ("Contact", "BELONGS_TO", "Account", "contacts.csv", "contact_id", "account_id")]
+
+
+def test_compile_load_plan_warns_about_missing_columns(tmp_path, caplog):
+    pd.DataFrame(columns=["account_id", "name"]).to_csv(tmp_path / "accounts.csv", index=False)
+    pd.DataFrame(columns=["deal_id"]).to_csv(tmp_path / "deals.csv", index=False)
+    schema = {"labels": {"Account": {"properties": ["id", "name", "region"]}, "Deal": {"properties": ["id"]}},
+              "edges": [{"from": "Account", "rel": "HAS_DEAL", "to": "Deal", "via_fk": "Deal.account_id"}]}
+    with caplog.at_level(logging.WARNING, logger="aivia.schema_loader"):
+        plan = compile_load_plan(schema, tmp_path)
+    assert plan.nodes[0].properties == ["name"] and plan.edges == []
+    assert [r.getMessage() for r in caplog.records] == [
+        "Account.region: no matching column in accounts.csv, skipped",
+        "Account-[:HAS_DEAL]->Deal: FK column for Deal.account_id not in deals.csv, skipped"]
+
+
+def test_edge_batches_wait_for_both_endpoint_labels():
+    driver = _Driver()
+    plan = compile_load_plan(load_schema(USE_CASE), DEMO)
+    stats = run_load_plan(driver, plan, DEMO, batch_size=3, workers=4)
+
+    writes = driver.writes
+    last = {label: max(i for i, w in enumerate(writes) if w == label) for label in set(writes)}
+    first = {label: min(i for i, w in enumerate(writes) if w == label) for label in set(writes)}
+    for edge in plan.edges:
+        assert first[edge.rel] > last[edge.src] and first[edge.rel] > last[edge.dst], (edge.rel, writes)
+    assert first["HAS_DEAL"] < last["User"]  # edges don't wait for unrelated labels
+    assert {s.name for s in stats} == {"Account", "Deal", "Activity", "User", "Contact", "Account-[:HAS_DEAL]->Deal",
+                                       "Deal-[:HAS_ACTIVITY]->Activity", "Deal-[:OWNED_BY]->User",
+                                       "Contact-[:BELONGS_TO]->Account"}
@@ -0,0 +1,114 @@
+# SPDX-License-Identifier: Apache-2.0
+import datetime as dt
+import json
+import logging
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from aivia.loader import SALES_CRM_EDGES, SALES_CRM_NODES, EdgeSpec, NodeSpec
+from aivia.sync import STATE_FILE, diff_hashes, main, sync_snapshot
+
+NODES = [
+    NodeSpec("Contact", "contacts.csv", "contact_id", ["name"]),
+    NodeSpec("Campaign", "campaigns.csv", "campaign_id", ["name"]),
+]
+EDGES = [
+    EdgeSpec("Campaign", "TOUCHED", "Contact", "touches.csv", "campaign_id", "contact_id",
+             ["date"], merge_keys=["date"]),
+]
+TOUCHED = "Campaign-[:TOUCHED]->Contact"
+
+
+class _Session:
+    def __init__(self, writes):
+        self.writes = writes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, cypher, **params):
+        self.writes.append((cypher, params.get("rows")))
+        return self
+
+    def consume(self):
+        pass
+
+    def execute_write(self, work):
+        return work(self)
+
+
+class _Driver:
+    def __init__(self):
+        self.writes = []
+
+    def session(self):
+        return _Session(self.writes)
+
+
+def _snapshot(path, contacts, touches):
+    path.mkdir(exist_ok=True)
+    pd.DataFrame(contacts, columns=["contact_id", "name"]).to_csv(path / "contacts.csv", index=False)
+    pd.DataFrame([("m1", "Mailing")], columns=["campaign_id", "name"]).to_csv(path / "campaigns.csv", index=False)
+    pd.DataFrame(touches, columns=["campaign_id", "contact_id", "date"]).to_csv(path / "touches.csv", index=False)
+    return path
+
+
+def _sync(driver, data_dir, state, native_dates):
+    stats = sync_snapshot(driver, data_dir, state, nodes=NODES, edges=EDGES, native_dates=native_dates)
+    return {s.name: (s.inserted, s.updated, s.deleted) for s in stats}
+
+
+def test_diff_hashes():
+    old = pd.Series([1, 2, 3], index=["a", "b", "c"], dtype="uint64")
+    new = pd.Series([1, 5, 4], index=["a", "b", "d"], dtype="uint64")
+    inserted, updated, deleted = diff_hashes(old, new)
+    assert (list(inserted), list(updated), list(deleted)) == (["d"], ["b"], ["c"])
+
+
+@pytest.mark.parametrize("native_dates", [False, True])
+def test_second_sync_writes_only_the_changes(tmp_path, native_dates):
+    state = tmp_path / STATE_FILE
+    first = _snapshot(tmp_path / "v1", [("c1", "Ann"), ("c2", "Bob")],
+                      [("m1", "c1", "2024-01-05"), ("m1", "c2", "2024-01-06")])
+    assert _sync(_Driver(), first, state, native_dates) == {
+        "Contact": (2, 0, 0), "Campaign": (1, 0, 0), TOUCHED: (2, 0, 0)}
+    assert json.loads(state.read_text())["edges"][TOUCHED]["keys"] == [
+        ["m1", "c1", "2024-01-05"], ["m1", "c2", "2024-01-06"]]
+
+    second = _snapshot(tmp_path / "v2", [("c1", "Ann"), ("c2", "Bobby"), ("c3", "Cy")],
+                       [("m1", "c1", "2024-01-05"), ("m1", "c3", "2024-01-07")])
+    driver = _Driver()
+    assert _sync(driver, second, state, native_dates) == {
+        "Contact": (1, 1, 0), "Campaign": (0, 0, 0), TOUCHED: (1, 0, 1)}
+
+    rows = {cypher: batch for cypher, batch in driver.writes if batch}
+    deleted_edge = next(batch for cypher, batch in rows.items() if cypher.endswith("DELETE r"))
+    date = dt.date(2024, 1, 6) if native_dates else "2024-01-06"
+    assert deleted_edge == [{"src": "m1", "dst": "c2", "props": {"date": date}}]
+    upserted_edge = next(batch for cypher, batch in rows.items() if "TOUCHED" in cypher and "MERGE" in cypher)
+    assert [(r["dst"], r["props"]["date"]) for r in upserted_edge] == [
+        ("c3", dt.date(2024, 1, 7) if native_dates else "2024-01-07")]
+
+    # Unchanged snapshot: nothing to write
+    assert _sync(_Driver(), second, state, native_dates) == {
+        "Contact": (0, 0, 0), "Campaign": (0, 0, 0), TOUCHED: (0, 0, 0)}
+
+
+def test_stats_are_logged_and_printed_only_by_the_cli(tmp_path, capsys, caplog):
+    data_dir = _snapshot(tmp_path / "v1", [("c1", "Ann")], [("m1", "c1", "2024-01-05")])
+    with caplog.at_level(logging.INFO, logger="aivia.sync"):
+        stats = sync_snapshot(None, data_dir, tmp_path / STATE_FILE, nodes=NODES, edges=EDGES, dry_run=True)
+    assert [str(s) for s in stats] == ["Contact: +1 ~0 -0", "Campaign: +1 ~0 -0", f"{TOUCHED}: +1 ~0 -0"]
+    assert "Sync Contact: +1 ~0 -0" in caplog.text
+    assert capsys.readouterr().out == ""
+
+    demo = Path(__file__).resolve().parents[1] / "examples" / "sales_crm_demo"
+    main([str(demo), "--dry-run", "--state", str(tmp_path / "demo_state.json")])
+    out = capsys.readouterr().out.splitlines()
+    assert out[0] == "[SYNC] Account: +12 ~0 -0" and len(out) == 1 + len(SALES_CRM_NODES) + len(SALES_CRM_EDGES)
+    assert out[-1].startswith("[SYNC] done in ")
@@ -0,0 +1,85 @@
+# SPDX-License-Identifier: Apache-2.0
+from types import SimpleNamespace
+
+from aivia.run_query import AiviaEngine
+from aivia.telemetry import CallbackSink, HistogramRegistry, StageTimer, server_timings
+
+
+def test_histogram_bucket_placement_and_render():
+    registry = HistogramRegistry(buckets=(1.0, 0.1))
+    for seconds in (0.05, 0.1, 0.5, 5.0):
+        registry.observe("execute", seconds)
+    registry("match", 0.01)
+
+    execute = registry.snapshot()["execute"]
+    assert execute["buckets"] == {0.1: 2, 1.0: 3, float("inf"): 4}  # le is inclusive
+    assert execute["count"] == 4 and execute["sum"] == 5.65
+    assert registry.render() == (
+        "# TYPE aivia_stage_seconds histogram\n"
+        'aivia_stage_seconds_bucket{stage="execute",le="0.1"} 2\n'
+        'aivia_stage_seconds_bucket{stage="execute",le="1.0"} 3\n'
+        'aivia_stage_seconds_bucket{stage="execute",le="+Inf"} 4\n'
+        'aivia_stage_seconds_sum{stage="execute"} 5.65\n'
+        'aivia_stage_seconds_count{stage="execute"} 4\n'
+        'aivia_stage_seconds_bucket{stage="match",le="0.1"} 1\n'
+        'aivia_stage_seconds_bucket{stage="match",le="1.0"} 1\n'
+        'aivia_stage_seconds_bucket{stage="match",le="+Inf"} 1\n'
+        'aivia_stage_seconds_sum{stage="match"} 0.01\n'
+        'aivia_stage_seconds_count{stage="match"} 1\n')
+
+
+def test_stage_timer_record_accumulates_and_reports_each_sample():
+    observed = []
+    timer = StageTimer(CallbackSink(lambda stage, seconds: observed.append((stage, seconds))))
+    timer.record("execute", 0.25)
+    timer.record("execute", 0.5)
+    with timer.stage("frame"):
+        pass
+    assert timer.timings["execute_s"] == 0.75 and timer.timings["frame_s"] >= 0
+    assert observed[:2] == [("execute", 0.25), ("execute", 0.5)] and observed[2][0] == "frame"
+
+
+def test_server_timings_converts_ms_to_seconds():
+    summary = SimpleNamespace(result_available_after=12, result_consumed_after=250)
+    assert server_timings(summary) == {"server_available": 0.012, "server_consumed": 0.25}
+    assert server_timings(SimpleNamespace(result_available_after=None)) == {}
+    assert server_timings(None) == {}
+
+
+class _Result:
+    def keys(self):
+        return ["deal_id", "amount"]
+
+    def __iter__(self):
+        return iter([("D1", 12000.0)])
+
+    def consume(self):
+        return SimpleNamespace(result_available_after=3, result_consumed_after=1)
+
+
+class _Session:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, cypher, params):
+        return _Result()
+
+
+class _Driver:
+    def session(self, **kwargs):
+        return _Session()
+
+
+def test_engine_run_reports_every_stage():
+    registry = HistogramRegistry()
+    _, df, debug = AiviaEngine(_Driver(), metrics=registry).run("open deals")
+    timing = debug["timing"]
+    assert {"match_s", "build_s", "execute_s", "frame_s", "total_s"} <= set(timing)
+    assert (timing["server_available_s"], timing["server_consumed_s"]) == (0.003, 0.001)
+    assert timing["total_s"] >= timing["match_s"] + timing["build_s"] + timing["execute_s"]
+    assert set(registry.snapshot()) == {"match", "build", "execute", "frame", "total",
+                                        "server_available", "server_consumed"}
+    assert df["deal_id"].tolist() == ["D1"]
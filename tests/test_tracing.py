@@ -0,0 +1,50 @@
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+import contextlib
+import io
+import logging
+
+from aivia.adapters.matcher_adapter import match_concepts_adapter
+from aivia.tracing import collect_trace, trace, tracing
+from bench_matcher import generate_corpus, reference_match
+
+
+def test_trace_events_match_the_old_print_tracing():
+    for q in generate_corpus(300, seed=3):
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            reference_match(q)
+        with collect_trace(q) as t:
+            match_concepts_adapter(q)
+        assert t.messages() == printed.getvalue().splitlines(), q
+
+
+def test_nothing_is_printed_or_formatted_when_nobody_listens(capsys):
+    class Loud:
+        def __repr__(self):
+            raise AssertionError("formatted")
+
+    log = logging.getLogger("aivia.test_tracing")
+    log.setLevel(logging.WARNING)
+    assert not tracing(log)
+    trace(log, "value %r", Loud())
+    match_concepts_adapter("open deals > 10k last 60 days")
+    assert capsys.readouterr().out == ""
+
+
+def test_traces_are_per_task():
+    log = logging.getLogger("aivia.test_tracing")
+
+    async def request(name):
+        with collect_trace(name) as t:
+            trace(log, "start %s", name)
+            await asyncio.sleep(0)
+            trace(log, "end %s", name)
+        return t.to_dict()
+
+    async def both():
+        return await asyncio.gather(request("a"), request("b"))
+
+    a, b = asyncio.run(both())
+    assert [e["message"] for e in a["events"]] == ["start a", "end a"]
+    assert [e["message"] for e in b["events"]] == ["start b", "end b"]